@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""Benchmark del recálculo de TOTAL IMPACTOS / TOTAL INVERSION por rerun"""
+
+import argparse
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from pautas.calculos import calcular_resumen, recalcular_totales
+from pautas.calendario import COLUMNAS_INICIALES
+
+
+def generar_pauta(filas: int, dias: int) -> tuple:
+    """Grid con la forma del que regresa st.data_editor (días como object, igual que en la app)."""
+    inicio = date(2025, 1, 1)
+    columnas_dias = [f"{(inicio + timedelta(days=i)).isoformat()}" for i in range(dias)]
+    rng = np.random.default_rng(0)
+    spots = rng.integers(0, 4, size=(filas, dias)).astype(object)
+    df = pd.DataFrame(spots, columns=columnas_dias)
+    df.insert(0, "PLAZA TRANS", "MONTERREY")
+    df.insert(1, "TARIFA", rng.integers(50, 500, size=filas).astype(float))
+    for col in COLUMNAS_INICIALES:
+        if col not in df.columns:
+            df[col] = 0 if col.startswith("TOTAL") else "."
+    return df, columnas_dias
+
+
+def recalculo_por_celda(df: pd.DataFrame, columnas_dias: list) -> pd.DataFrame:
+    """Implementación anterior (doble ciclo con .at), para comparar."""
+    for idx in df.index:
+        impactos = 0
+        for col in columnas_dias:
+            try:
+                impactos += int(df.at[idx, col])
+            except:
+                pass
+        try:
+            tarifa = float(df.at[idx, "TARIFA"])
+        except:
+            tarifa = 0
+        df.at[idx, "TOTAL IMPACTOS"] = impactos
+        df.at[idx, "TOTAL INVERSION"] = round(impactos * tarifa, 2)
+    return df
+
+
+def medir(funcion, repeticiones: int) -> float:
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return min(tiempos)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--filas", type=int, default=10_000)
+    parser.add_argument("--dias", type=int, default=365)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--por-celda", action="store_true",
+                        help="También mide la implementación celda por celda (lenta a este tamaño)")
+    args = parser.parse_args()
+
+    df, columnas_dias = generar_pauta(args.filas, args.dias)
+    print(f"Pauta de {args.filas:,} filas x {args.dias} días ({args.filas * args.dias:,} celdas)")
+
+    def vectorizado():
+        recalculado = recalcular_totales(df, columnas_dias).transmisiones
+        calcular_resumen(recalculado, "16%")
+
+    t = medir(vectorizado, args.repeticiones)
+    print(f"  recalcular_totales + calcular_resumen: {t * 1000:,.1f} ms")
+
+    if args.por_celda:
+        t_celda = medir(lambda: recalculo_por_celda(df.copy(), columnas_dias), 1)
+        print(f"  doble ciclo por celda:                  {t_celda * 1000:,.1f} ms ({t_celda / t:,.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
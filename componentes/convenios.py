@@ -0,0 +1,33 @@
+"""Saldos de convenios para las páginas y aviso de sobregiro al enviar o editar una pauta."""
+
+import pandas as pd
+import streamlit as st
+
+from pautas.conexion import conexion_configurada, ejecutar
+from pautas.convenios import consultar_convenios, convenios_ejemplo, saldos_convenios, sobregiro
+
+
+def _consultar() -> pd.DataFrame:
+    if not conexion_configurada():
+        return convenios_ejemplo()
+    return ejecutar(consultar_convenios)
+
+
+def saldos_vigentes() -> pd.DataFrame:
+    """Saldos de CONVENIOS (una fila por convenio), reutilizados durante TTL_CONVENIOS."""
+    return saldos_convenios.obtener(_consultar)
+
+
+def aviso_sobregiro(encabezado: dict, anterior: dict = None):
+    """Advierte (sin bloquear) si enviar la pauta deja su convenio con saldo negativo."""
+    try:
+        resultado = sobregiro(saldos_vigentes(), encabezado, anterior)
+    except Exception as e:
+        st.warning(f"No se pudo revisar el saldo del convenio: {e}")
+        return
+    if resultado is not None:
+        nombre, restante, monto = resultado
+        st.warning(
+            f"⚠️ Esta pauta (${monto:,.2f}) sobregira el convenio {nombre}: le quedan ${restante:,.2f} "
+            f"y lo excede por ${monto - restante:,.2f}."
+        )
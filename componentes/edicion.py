@@ -0,0 +1,166 @@
+import streamlit as st
+
+from componentes.convenios import aviso_sobregiro
+from componentes.encabezado import datos_desde_encabezado, formulario_encabezado
+from componentes.guardado import guardar_cambios
+from componentes.materiales import seccion_materiales
+from componentes.transmisiones import calendario_base, editor_transmisiones, puede_enviar
+from pautas.calculos import IVA_TASAS
+from pautas.calendario import construir_calendario
+from pautas.cambios import ConflictoVersion, calcular_cambios
+from pautas.edicion import PautaGuardada, cache_pautas
+from pautas.inventario import ocupa_inventario
+from pautas.metricas import cache_metricas
+
+
+def _texto(valor) -> str:
+    return "" if valor is None else str(valor)
+
+
+def editar_pauta(pauta: PautaGuardada, usuario: str) -> bool:
+    """
+    Edición de una pauta guardada en pestañas (cliente y campaña, transmisiones, materiales e
+    indicaciones). Las keys de los widgets llevan folio y versión, así que al abrir otro folio
+    (u otra versión del mismo) el formulario parte de los valores cargados.
+    Al guardar sólo se envía lo que cambió respecto a la versión cargada. Devuelve True si se
+    guardó (para refrescar el listado).
+    La página del listado importa este módulo sólo cuando hay un folio en edición.
+    """
+    folio, encabezado = pauta.folio, pauta.encabezado
+    prefijo = f"edit_{folio}_v{pauta.version}_"
+    origen = (folio, pauta.version)
+    if st.session_state.get("edicion_cargada") != origen:
+        st.session_state["edicion_cargada"] = origen
+        st.session_state["materiales_edit"] = [dict(m) for m in pauta.materiales]
+        # IVA y moneda del resumen parten de los guardados
+        if encabezado.get("TIPO_IVA") in IVA_TASAS:
+            st.session_state[f"{prefijo}iva"] = encabezado["TIPO_IVA"]
+        if encabezado.get("MONEDA") in ("MN", "USD", "EUR"):
+            st.session_state[f"{prefijo}divisa"] = encabezado["MONEDA"]
+
+    st.markdown(f"<h1 style='font-size:26px; font-weight:700;'>✏️ EDITANDO ORDEN/PAUTA DE TRANSMISION RADIO : {folio}</h1>", unsafe_allow_html=True)
+
+    tabs = st.tabs(["🙍 CLIENTE Y CAMPAÑA", "📡 TRANSMISIONES", "📦 MATERIALES", "📝 INDICACIONES", "➡️ VISTA PREVIA Y ENVIO"])
+
+    with tabs[0]:
+        with st.expander("🙍  Información del Cliente y Campaña", expanded=True):
+            editado = formulario_encabezado(datos_desde_encabezado(encabezado), prefijo)
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                editado["PLAZA_VENTA"] = st.text_input("PLAZA DE VENTA", _texto(encabezado.get("PLAZA_VENTA")),
+                                                       key=f"{prefijo}plaza_venta")
+            with col2:
+                captura = encabezado.get("FECHA_CAPTURA")
+                st.caption(f"FECHA CAPTURA: {captura.strftime('%d/%m/%Y') if captura is not None else '—'}")
+                st.caption(f"ESTATUS OTC: {_texto(encabezado.get('ESTATUS_OTC')) or '—'}")
+            with col3:
+                st.caption(f"TOTAL PAUTA: ${float(encabezado.get('TOTAL') or 0):,.2f} {_texto(encabezado.get('MONEDA'))}")
+                st.caption(f"VERSIÓN: {pauta.version}")
+
+    # Calendario del rango capturado; si cambian las fechas los spots conservan su día
+    inicio_camp, fin_camp = editado["INICIO_CAMPANA"], editado["FIN_CAMPANA"]
+    rango = construir_calendario(inicio_camp, fin_camp)
+    calendario, version_base = calendario_base(
+        "calendario_edicion", origen, rango, pauta.calendario.reindexar(rango.fechas)
+    )
+
+    with tabs[1]:
+        # === BLOQUE DE TRANSMISIONES POR DÍA ===
+        st.markdown(
+            f"""
+            <div style='display: flex; align-items: center; gap: 20px; margin-top: 0em;'>
+                <h2 style='font-size: 20px; font-weight: 600; margin: 0;'>📡 Transmisiones por Día</h2>
+                <span style='font-weight: bold;'>📅 Inicio: {inicio_camp.strftime('%d/%m/%Y')}</span>
+                <span style='font-weight: bold;'>🗓️ Fin: {fin_camp.strftime('%d/%m/%Y')}</span>
+            </div>
+            """, unsafe_allow_html=True
+        )
+
+        editor_transmisiones(
+            "calendario_edicion", calendario, version_base, rango, "data_editor_impacts_edit",
+            clave_iva=f"{prefijo}iva", clave_divisa=f"{prefijo}divisa"
+        )
+
+    with tabs[2]:
+        seccion_materiales("materiales_edit", "edit_", "📦 Información de Materiales", expandido=True)
+
+    with tabs[3]:
+        st.markdown("""
+            <h2 style='font-size: 20px; font-weight: 600; margin-top: 0em;'>📦 ¿Materiales, indicaciones especiales?</h2>
+        """, unsafe_allow_html=True)
+        editado["OBSERVACIONES_MATERIALES"] = st.text_area(
+            "Indica materiales u observaciones especiales", _texto(encabezado.get("OBSERVACIONES_MATERIALES")),
+            key=f"{prefijo}observaciones"
+        )
+
+        st.markdown("""
+            <h2 style='font-size: 20px; font-weight: 600; margin-top: 1em;'>🎙️ ¿Indicaciones Operativas / Conducción / Talentos?</h2>
+        """, unsafe_allow_html=True)
+        editado["INDICACIONES_TALENTOS"] = st.text_area(
+            "Honorarios / Talentos", _texto(encabezado.get("INDICACIONES_TALENTOS")),
+            placeholder="Ejemplo : Detallar el monto de honorarios y talentos.", key=f"{prefijo}talentos"
+        )
+
+        st.markdown("""
+            <h2 style='font-size: 20px; font-weight: 600; margin-top: 1em;'>💳 ¿Indicaciones Facturación y Cobranza?</h2>
+        """, unsafe_allow_html=True)
+        editado["INDICACIONES_COBRANZA"] = st.text_area(
+            "Cobranza", _texto(encabezado.get("INDICACIONES_COBRANZA")),
+            placeholder="Ejemplo : Facturación al término de la campaña. El cliente no es moroso; y no está bloqueado.",
+            key=f"{prefijo}cobranza"
+        )
+
+        st.markdown("📎 **Cargar pagaré (PDF)**")
+        st.file_uploader(" ", type=["pdf"], key="edit_pagare")
+
+    enviar = False
+    with tabs[4]:
+        # La versión guardada ya ocupa inventario (salvo borradores): no se cuenta dos veces
+        guardada = pauta.calendario if ocupa_inventario(encabezado.get("ESTATUS_OTC")) else None
+        if st.button("📤 Enviar Campaña OTC") and puede_enviar("calendario_edicion", excluir=guardada):
+            # El envío es un guardado de cambios; un borrador además pasa a VENTAS (las ya enviadas conservan su estatus)
+            if guardada is None:
+                editado["ESTATUS_OTC"] = "VENTAS"
+            enviar = True
+
+    resumen, tipo_iva, divisa = st.session_state["calendario_edicion_resumen"]
+    editado.update({
+        "TOTAL_IMPACTOS": resumen.impactos,
+        "SUBTOTAL": resumen.subtotal,
+        "TIPO_IVA": tipo_iva,
+        "IVA": resumen.iva,
+        "TOTAL": resumen.total,
+        "MONEDA": divisa,
+    })
+    aviso_sobregiro({**encabezado, **editado}, encabezado)
+
+    guardado = False
+    col1, col2, col3 = st.columns(3)
+    if col1.button("💾 Guardar Cambios") or enviar:
+        cambios = calcular_cambios(pauta, editado, st.session_state["calendario_edicion"],
+                                   st.session_state["materiales_edit"])
+        if cambios.vacio:
+            st.info("La campaña ya estaba enviada y no tiene cambios." if enviar else "No hay cambios que guardar.")
+        else:
+            try:
+                with st.spinner("Enviando campaña OTC..." if enviar else "Guardando cambios..."):
+                    version = guardar_cambios(pauta, cambios, st.session_state["calendario_edicion"])
+            except ConflictoVersion as e:
+                cache_pautas.invalidar(folio)
+                st.error(str(e))
+            except Exception as e:
+                st.error(f"No se pudo {'enviar la campaña' if enviar else 'guardar los cambios'}: {e}")
+            else:
+                cache_pautas.invalidar(folio)
+                cache_metricas.invalidar(usuario)
+                accion = "Campaña enviada a OTC" if enviar else "Cambios guardados correctamente"
+                st.success(f"{accion} ({cambios.resumen()}). {folio} quedó en la versión {version}.")
+                st.session_state["folio_edicion"] = None
+                guardado = True
+    if col2.button("❌ Descartar Cambios"):
+        st.warning("Edición cancelada.")
+        st.session_state["folio_edicion"] = None
+    if col3.button("⬅️ Regresar Rechazar"):
+        st.warning("Edición cancelada.")
+        st.session_state["folio_edicion"] = None
+    return guardado
@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+
+import streamlit as st
+
+from componentes.sugerencias import texto_con_sugerencias
+from pautas.encabezado import CAMPOS_PAUTA
+
+OPCIONES_CONVENIO = [
+    "EFECTIVO",
+    "EFECTIVO NO REVOLVENTE",
+    "FACTURACION ANTICIPADA",
+    "FA DIRECTA",
+    "FA INTERCAMBIO",
+    "PROMOCIÓN INDUSTRIAL",
+    "INTERCAMBIO",
+    "INTERCAMBIO DE MEDIOS",
+    "PINTERCAMBIO",
+    "MOVIMIENTO ADMINISTRATIVO"
+]
+VALORES_SN = ["NO", "SI"]
+
+
+def datos_generales_iniciales() -> dict:
+    """Valores por defecto del formulario de datos generales (campaña de 4 semanas desde hoy)."""
+    return {
+        "CLIENTE": "",
+        "AGENCIA": "",
+        "MARCA": "",
+        "TIPO CONVENIO": "",
+        "NOMBRE DEL CONVENIO": "",
+        "ANUNCIA": "",
+        "CAMPAÑA": "",
+        "INICIO CAMPAÑA": datetime.today(),
+        "FIN CAMPAÑA": datetime.today() + timedelta(days=28),
+        "NUMERO DE ORDEN": "",
+        "EJECUTIVO / VENDEDOR": "",
+        "NOMBRE EVENTO": "",
+        "FACTURAR A": "",
+        "FIRMA PAGARE (SI / NO)": "NO",
+        "ES AGREGADO (SI / NO)": "NO"
+    }
+
+
+def datos_desde_encabezado(encabezado: dict) -> dict:
+    """Datos generales del formulario a partir del encabezado guardado en PAUTAS."""
+    datos = datos_generales_iniciales()
+    for columna, etiqueta in CAMPOS_PAUTA.items():
+        valor = encabezado.get(columna)
+        if valor is not None:
+            datos[etiqueta] = valor
+    return datos
+
+
+def _si_no(valor) -> str:
+    valor = str(valor).strip().upper()
+    return valor if valor in VALORES_SN else "NO"
+
+
+def formulario_encabezado(datos_generales: dict, prefijo: str = None) -> dict:
+    """
+    Formulario de cliente y campaña con los valores de datos_generales. Devuelve el encabezado
+    con los nombres de columna de PAUTAS. Sin prefijo los widgets no llevan key y toman los
+    valores nuevos (p. ej. al cargar un archivo); con prefijo ("edit_FOLIO-003_") conservan
+    lo que el usuario escribió.
+    """
+    def clave(nombre):
+        return f"{prefijo}{nombre}" if prefijo else None
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        cliente = texto_con_sugerencias("CLIENTE / RAZON SOCIAL*", "CLIENTE", datos_generales["CLIENTE"],
+        help="Ingresa la razón social del cliente.", key=clave("cliente"))
+        agencia = texto_con_sugerencias("AGENCIA", "AGENCIA", datos_generales["AGENCIA"], key=clave("agencia"))
+        marca = st.text_input("MARCA", datos_generales["MARCA"], key=clave("marca"))
+        tipo_actual = str(datos_generales["TIPO CONVENIO"]).upper()
+        tipo_convenio = st.selectbox(
+            "TIPO CONVENIO*",
+            OPCIONES_CONVENIO,
+            index=OPCIONES_CONVENIO.index(tipo_actual) if tipo_actual in OPCIONES_CONVENIO else 0,
+            help="Selecciona el Tipo de Convenio según el acuerdo comercial: Efectivo, Intercambio, FA, etc.",
+            key=clave("tipo_convenio")
+        )
+
+        inicio_camp = st.date_input("INICIO CAMPAÑA*", value=datos_generales["INICIO CAMPAÑA"], format="DD/MM/YYYY",
+                                    key=clave("inicio_campana"))
+    with col2:
+        ejecutivo = st.text_input("EJECUTIVO / VENDEDOR*", datos_generales["EJECUTIVO / VENDEDOR"], key=clave("ejecutivo"))
+        anuncia = st.text_input("ANUNCIA", datos_generales["ANUNCIA"], key=clave("anuncia"))
+        campana = texto_con_sugerencias("CAMPAÑA", "CAMPANA", datos_generales["CAMPAÑA"], key=clave("campana"))
+        nombre_convenio = st.text_input("NOMBRE DEL CONVENIO", datos_generales["NOMBRE DEL CONVENIO"], key=clave("nombre_convenio"))
+        fin_camp = st.date_input("FIN CAMPAÑA*", value=datos_generales["FIN CAMPAÑA"], format="DD/MM/YYYY",
+                                 key=clave("fin_campana"))
+    with col3:
+        numero_orden = st.text_input("NUMERO DE ORDEN", datos_generales["NUMERO DE ORDEN"], key=clave("numero_orden"))
+        evento = st.text_input("NOMBRE EVENTO", datos_generales["NOMBRE EVENTO"], key=clave("nombre_evento"))
+        factura_a = st.text_input("FACTURAR A", datos_generales["FACTURAR A"], key=clave("facturar_a"))
+        valor_cliente_nuevo = _si_no(datos_generales.get("ES CLIENTE NUEVO (SI/NO)", "NO"))
+        cliente_nuevo = st.selectbox("ES CLIENTE NUEVO (SI/NO)", VALORES_SN, index=VALORES_SN.index(valor_cliente_nuevo),
+                                     key=clave("cliente_nuevo"))
+        es_agregado = st.selectbox("ES AGREGADO (SI / NO)", VALORES_SN,
+                                   index=VALORES_SN.index(_si_no(datos_generales["ES AGREGADO (SI / NO)"])),
+                                   key=clave("es_agregado"))
+
+    # Encabezado de la pauta con los nombres de columna de PAUTAS
+    return {
+        "CLIENTE": cliente,
+        "AGENCIA": agencia,
+        "MARCA": marca,
+        "TIPO_CONVENIO": tipo_convenio,
+        "NOMBRE_CONVENIO": nombre_convenio,
+        "ANUNCIA": anuncia,
+        "CAMPANA": campana,
+        "INICIO_CAMPANA": inicio_camp,
+        "FIN_CAMPANA": fin_camp,
+        "NUMERO_ORDEN": numero_orden,
+        "EJECUTIVO": ejecutivo,
+        "NOMBRE_EVENTO": evento,
+        "FACTURAR_A": factura_a,
+        "ES_CLIENTE_NUEVO": cliente_nuevo,
+        "ES_AGREGADO": es_agregado,
+        "FIRMA_PAGARE": datos_generales["FIRMA PAGARE (SI / NO)"],
+    }
@@ -0,0 +1,59 @@
+from pautas.calendario import CalendarioSpots
+from pautas.cambios import CambiosPauta, aplicar_cambios
+from pautas.conexion import conexion_configurada, ejecutar
+from pautas.convenios import movimientos_convenio, saldos_convenios
+from pautas.edicion import PautaGuardada
+from pautas.exportacion import ArchivosPauta, exportar_pauta
+from pautas.importacion import cargar_lote
+from pautas.inventario import inventario, ocupa_inventario
+from pautas.persistencia import guardar_pauta
+from pautas.sugerencias import catalogo_nombres
+
+
+def guardar_en_snowflake(encabezado: dict, calendario: CalendarioSpots, materiales: list, usuario: str, trabajo=None) -> str:
+    """Guarda la pauta completa en una sola transacción y devuelve el folio generado."""
+    if not conexion_configurada():
+        raise RuntimeError("Snowflake no está configurado (.env); la pauta no se guardó.")
+    if trabajo is not None:
+        trabajo.reportar(0.1, "Guardando en Snowflake")
+    folio = ejecutar(lambda sesion: guardar_pauta(sesion, encabezado, calendario, materiales, usuario))
+    if ocupa_inventario(encabezado.get("ESTATUS_OTC")):
+        inventario.agregar(calendario)
+    saldos_convenios.aplicar(movimientos_convenio([], [encabezado]))
+    catalogo_nombres.agregar([encabezado])
+    return folio
+
+
+def exportar_archivos(folio: str, encabezado: dict, calendario: CalendarioSpots, trabajo) -> ArchivosPauta:
+    return exportar_pauta(folio, encabezado, calendario, trabajo.reportar)
+
+
+def guardar_cambios(pauta: PautaGuardada, cambios: CambiosPauta, calendario: CalendarioSpots) -> int:
+    """
+    Aplica sólo lo que cambió respecto a la versión cargada; devuelve la versión nueva.
+    calendario es el editado: reemplaza en el inventario los spots de la versión anterior.
+    """
+    if not conexion_configurada():
+        raise RuntimeError("Snowflake no está configurado (.env); los cambios no se guardaron.")
+    version = ejecutar(lambda sesion: aplicar_cambios(sesion, pauta.folio, pauta.version, cambios))
+    # El estatus puede cambiar al guardar (enviar un borrador): sale lo que ocupaba y entra lo que ocupa ahora
+    if ocupa_inventario(pauta.encabezado.get("ESTATUS_OTC")):
+        inventario.quitar(pauta.calendario)
+    if ocupa_inventario(cambios.encabezado.get("ESTATUS_OTC", pauta.encabezado.get("ESTATUS_OTC"))):
+        inventario.agregar(calendario)
+    saldos_convenios.aplicar(cambios.convenios)
+    catalogo_nombres.agregar([cambios.encabezado])
+    return version
+
+
+def importar_en_snowflake(resultados: list, usuario: str, trabajo=None) -> dict:
+    """Carga en bloque las pautas válidas de un lote importado; devuelve archivo -> folio."""
+    if not conexion_configurada():
+        raise RuntimeError("Snowflake no está configurado (.env); el lote no se cargó.")
+    if trabajo is not None:
+        trabajo.reportar(0.1, "Cargando pautas en Snowflake")
+    folios = ejecutar(lambda sesion: cargar_lote(sesion, resultados, usuario))
+    cargados = [r.encabezado for r in resultados if r.archivo in folios]
+    saldos_convenios.aplicar(movimientos_convenio([], cargados))
+    catalogo_nombres.agregar(cargados)
+    return folios
@@ -0,0 +1,113 @@
+from functools import partial
+
+import pandas as pd
+import streamlit as st
+
+from componentes.trabajos import avance_trabajos, lanzar_trabajo
+from pautas.conexion import conexion_configurada, ejecutar
+from pautas.duracion import duracion_segundos
+from pautas.materiales import hash_archivo, subir_material
+
+TIPOS_MATERIAL = ["Spot", "Jingle", "Cortinilla", "Otro"]
+
+
+def formatear_duracion(segundos: float) -> str:
+    """Recibe segundos (float) y devuelve cadena en formato mm:ss"""
+    minutos = int(segundos // 60)
+    segundos_restantes = int(segundos % 60)
+    return f"{minutos:02d}:{segundos_restantes:02d}"
+
+
+def obtener_duracion_archivo(archivo, digest: str = None):
+    """
+    Duración real del material leyendo sólo los encabezados del archivo (RIFF, Xing/VBRI
+    o trama MP3, átomo mvhd de MP4). "N/A" para PDFs o si el encabezado no se reconoce.
+    """
+    if archivo is None:
+        return "00:00"
+    segundos = duracion_segundos(archivo, digest=digest)
+    if segundos is None:
+        return "N/A"
+    return formatear_duracion(round(segundos))
+
+
+def registrar_material(nombre: str, archivo, version: str, tipo: str, trabajo=None) -> dict:
+    """
+    Sube el archivo al stage de materiales (una sola vez por contenido) y devuelve
+    la fila del material; en session_state sólo queda la referencia, no los bytes.
+    """
+    if trabajo is not None:
+        trabajo.reportar(0.1, "Subiendo archivo")
+    if conexion_configurada():
+        referencia = ejecutar(lambda sesion: subir_material(sesion, archivo))
+        digest, ruta = referencia.hash, referencia.ruta
+    else:
+        digest, ruta = hash_archivo(archivo), None
+    return {
+        "Nombre": nombre,
+        "Archivo": archivo.name,
+        "Versión": version,
+        "Tipo": tipo,
+        "Duración": obtener_duracion_archivo(archivo, digest),
+        "Hash": digest,
+        "Ruta": ruta
+    }
+
+
+def recoger_subidas(clave: str, clave_materiales: str):
+    """Pasa a la tabla de materiales las subidas que ya terminaron y muestra el avance de las demás."""
+    pendientes = []
+    for trabajo in st.session_state.get(clave, []):
+        if not trabajo.done():
+            pendientes.append(trabajo)
+        elif trabajo.exception() is not None:
+            st.error(f"No se pudo subir el material: {trabajo.exception()}")
+        elif not trabajo.cancelado:
+            material = trabajo.result()
+            st.session_state[clave_materiales].append(material)
+            st.success(f"Material '{material['Nombre']}' añadido correctamente!")
+    st.session_state[clave] = pendientes
+    if pendientes:
+        avance_trabajos(pendientes)
+
+
+def seccion_materiales(clave: str, prefijo: str = "", titulo: str = "Información de Materiales",
+                       expandido: bool = False) -> list:
+    """
+    Captura de materiales (nombre, archivo, versión, tipo) y tabla de los ya añadidos en
+    st.session_state[clave]. Las keys de los widgets llevan el prefijo ("edit_" en edición).
+    """
+    if clave not in st.session_state:
+        st.session_state[clave] = []
+
+    with st.expander(titulo, expanded=expandido):
+        nombre = st.text_input("Nombre de Material", key=f"{prefijo}input_nombre")
+        # El uploader cambia de key al añadir el material para liberar el archivo en memoria
+        clave_version = f"{prefijo}input_archivo_version"
+        version_uploader = st.session_state.setdefault(clave_version, 0)
+        archivo_material = st.file_uploader(
+            "Subir Archivo (mp3, wav, mp4, pdf)", type=["mp3", "wav", "mp4", "pdf"],
+            key=f"{prefijo}input_archivo_{version_uploader}"
+        )
+        version = st.text_input("Versión", key=f"{prefijo}input_version")
+        tipo = st.selectbox("Tipo de Material", TIPOS_MATERIAL, key=f"{prefijo}input_tipo")
+
+        # Botón para añadir el material a la lista
+        if st.button("Añadir", key=f"{prefijo}btn_add_material"):
+            if not nombre:
+                st.warning("Debes indicar un nombre para el material.")
+            elif archivo_material is None:
+                st.warning("Debes subir un archivo antes de añadir.")
+            else:
+                subida = lanzar_trabajo(
+                    f"Subiendo {archivo_material.name}", partial(registrar_material, nombre, archivo_material, version, tipo)
+                )
+                if subida is not None:
+                    st.session_state.setdefault(f"subidas_{clave}", []).append(subida)
+                    st.session_state[clave_version] += 1
+        recoger_subidas(f"subidas_{clave}", clave)
+
+    # Mostrar la tabla sólo si hay al menos un material
+    if st.session_state[clave]:
+        st.table(pd.DataFrame(st.session_state[clave]).drop(columns=["Hash", "Ruta"], errors="ignore"))
+    return st.session_state[clave]
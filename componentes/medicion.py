@@ -0,0 +1,86 @@
+import uuid
+from functools import wraps
+
+import pandas as pd
+import streamlit as st
+
+from pautas.medicion import (
+    MEDICION_GLOBAL, iniciar_rerun, iniciar_servidor, medir, midiendo, registro_mediciones, terminar_rerun
+)
+
+
+def panel_solicitado() -> bool:
+    """La sesión pidió la medición con ?medicion=1 (se recuerda al cambiar de página; ?medicion=0 la apaga)."""
+    pedido = st.query_params.get("medicion")
+    if pedido is not None:
+        st.session_state["medicion_panel"] = pedido == "1"
+    return st.session_state.get("medicion_panel", False)
+
+
+def _id_sesion() -> str:
+    if "medicion_sesion" not in st.session_state:
+        st.session_state["medicion_sesion"] = uuid.uuid4().hex[:8]
+    return st.session_state["medicion_sesion"]
+
+
+def iniciar_medicion(pagina: str = ""):
+    """Abre el rerun medido si la sesión o el proceso (MEDICION=1) lo piden; None si no se mide."""
+    iniciar_servidor()
+    if not (MEDICION_GLOBAL or panel_solicitado()):
+        return None
+    st.session_state["medicion_reruns"] = numero = st.session_state.get("medicion_reruns", 0) + 1
+    return iniciar_rerun(_id_sesion(), numero, pagina)
+
+
+def terminar_medicion(rerun) -> dict:
+    return terminar_rerun(rerun) if rerun is not None else None
+
+
+def medido(seccion: str):
+    """
+    Mide la función como sección. Pensado para fragmentos: cuando sólo corre el fragmento
+    no hay rerun de la página abierto, así que el fragmento abre y cierra el suyo.
+    """
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            if midiendo():
+                with medir(seccion):
+                    return funcion(*args, **kwargs)
+            rerun = iniciar_medicion(f"fragmento {seccion}")
+            try:
+                with medir(seccion):
+                    return funcion(*args, **kwargs)
+            finally:
+                terminar_medicion(rerun)
+        return envoltura
+    return decorador
+
+
+def panel_medicion(resultado: dict):
+    """Panel de la barra lateral (sólo con ?medicion=1): último rerun, acumulados del proceso y exportación."""
+    if resultado is None or not panel_solicitado():
+        return
+    with st.sidebar.expander("⏱️ MEDICIÓN", expanded=True):
+        st.caption(f"Rerun {resultado['rerun']} de esta sesión · {resultado['segundos'] * 1000:,.1f} ms · "
+                   f"memoria {resultado['memoria_bytes'] / 2 ** 20:+,.1f} MB")
+        tramos = pd.DataFrame([
+            {"SECCION": "· " * t["nivel"] + t["seccion"], "MS": t["segundos"] * 1000, "FILAS": t["filas"],
+             "COLUMNAS": t["columnas"], "MEMORIA KB": t["memoria_bytes"] / 1024}
+            for t in sorted(resultado["tramos"], key=lambda t: t["desde"])
+        ])
+        formato = {"MS": st.column_config.NumberColumn(format="%.1f"),
+                   "MEMORIA KB": st.column_config.NumberColumn(format="%+.0f")}
+        if not tramos.empty:
+            st.dataframe(tramos, hide_index=True, column_config=formato)
+        st.caption(f"Acumulado del proceso ({registro_mediciones.reruns} reruns)")
+        st.dataframe(pd.DataFrame(registro_mediciones.secciones()), hide_index=True, column_config={
+            "PROMEDIO MS": st.column_config.NumberColumn(format="%.1f"),
+            "MAXIMO MS": st.column_config.NumberColumn(format="%.1f"),
+            "MEMORIA MB": st.column_config.NumberColumn(format="%+.1f"),
+        })
+        col1, col2 = st.columns(2)
+        col1.download_button("JSON", registro_mediciones.json(resultado["sesion"]), "medicion.jsonl",
+                             mime="application/json", key="medicion_json")
+        col2.download_button("Prometheus", registro_mediciones.prometheus(), "metrics.txt",
+                             mime="text/plain", key="medicion_prometheus")
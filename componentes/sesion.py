@@ -0,0 +1,9 @@
+import os
+
+import streamlit as st
+
+
+def usuario_actual() -> str:
+    """Usuario que entra por el ingress de Snowpark Container Services; en local, SNOWFLAKE_USER."""
+    usuario = st.context.headers.get("Sf-Context-Current-User")
+    return usuario or os.getenv("SNOWFLAKE_USER") or "LOCAL"
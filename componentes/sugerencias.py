@@ -0,0 +1,40 @@
+import streamlit as st
+
+from pautas.conexion import conexion_configurada, ejecutar
+from pautas.sugerencias import catalogo_nombres, consultar_nombres, nombres_ejemplo
+
+
+def _consultar() -> dict:
+    if not conexion_configurada():
+        return nombres_ejemplo()
+    return ejecutar(consultar_nombres)
+
+
+def _elegir(clave: str):
+    # Corre antes del script: el texto toma la sugerencia y las pastillas se limpian
+    eleccion = st.session_state.get(f"{clave}_sugerencias")
+    if eleccion:
+        st.session_state[clave] = eleccion
+    st.session_state[f"{clave}_sugerencias"] = None
+
+
+def texto_con_sugerencias(etiqueta: str, campo: str, valor: str = "", key: str = None, **kwargs) -> str:
+    """
+    text_input con sugerencias de nombres ya capturados en el campo de PAUTAS (CLIENTE,
+    AGENCIA o CAMPANA). Si el texto no es un nombre conocido se ofrecen los que empiezan
+    igual o se le parecen; elegir uno lo escribe en el campo.
+    Sin key el widget se identifica por su valor inicial, como un text_input sin key.
+    """
+    clave = key or f"sugerencias_{campo}_{valor}"
+    texto = st.text_input(etiqueta, valor, key=clave, **kwargs)
+    if not texto.strip():
+        return texto
+    try:
+        opciones = catalogo_nombres.buscar(campo, texto, _consultar)
+    except Exception:
+        # Las sugerencias son una ayuda: sin catálogo el campo sigue siendo texto libre
+        opciones = []
+    if opciones:
+        st.pills("¿Quisiste decir?", opciones, key=f"{clave}_sugerencias",
+                 on_change=_elegir, args=(clave,), label_visibility="collapsed")
+    return texto
@@ -0,0 +1,47 @@
+import streamlit as st
+
+from componentes.sesion import usuario_actual
+from pautas.trabajos import LimiteTrabajos, ejecutor_trabajos
+
+
+def lanzar_trabajo(descripcion: str, funcion, llave=None):
+    """Encola funcion(trabajo) en el ejecutor compartido; None si el usuario llegó a su límite."""
+    try:
+        return ejecutor_trabajos.enviar(usuario_actual(), descripcion, funcion, llave)
+    except LimiteTrabajos as e:
+        st.warning(str(e))
+        return None
+
+
+def trabajo_sesion(clave: str, llave, descripcion: str, funcion):
+    """
+    Trabajo de fondo guardado en st.session_state[clave] para la llave dada (p. ej. el hash
+    del archivo). Si la llave cambió se cancela el anterior y se lanza funcion(trabajo).
+    Un trabajo cancelado o con error se devuelve una sola vez (para informarlo) y se
+    descarta: el siguiente rerun con la misma llave lo vuelve a lanzar.
+    """
+    trabajo = st.session_state.get(clave)
+    if trabajo is not None and trabajo.llave == llave:
+        if trabajo.done() and (trabajo.cancelado or trabajo.exception() is not None):
+            del st.session_state[clave]
+        return trabajo
+    if trabajo is not None:
+        trabajo.cancelar()
+    trabajo = lanzar_trabajo(descripcion, funcion, llave)
+    st.session_state[clave] = trabajo
+    return trabajo
+
+
+@st.fragment(run_every=1)
+def avance_trabajos(trabajos: list):
+    """
+    Avance de los trabajos de fondo; se refresca cada segundo sin correr toda la página.
+    En cuanto alguno termina se corre la página completa para usar su resultado.
+    """
+    if any(trabajo.done() for trabajo in trabajos):
+        st.rerun()
+    for trabajo in trabajos:
+        col_avance, col_cancelar = st.columns([6, 1])
+        col_avance.progress(trabajo.progreso, text=f"⏳ {trabajo.descripcion} · {trabajo.mensaje or trabajo.estado}")
+        if col_cancelar.button("✖️ Cancelar", key=f"cancelar_trabajo_{trabajo.id}"):
+            trabajo.cancelar()
@@ -0,0 +1,174 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from componentes.medicion import medido
+from pautas.calculos import IVA_TASAS, calcular_resumen, recalcular_totales, tabla_resumen
+from pautas.calendario import COLUMNAS_INICIALES, CalendarioSpots
+from pautas.conexion import conexion_configurada, ejecutar
+from pautas.inventario import COLUMNAS_INVENTARIO, consultar_inventario, inventario
+from pautas.medicion import medir
+from pautas.validacion import ValidacionGrid, validar_transmisiones
+
+# Filas con errores que se muestran resaltadas debajo del editor
+MAX_FILAS_ERROR = 200
+
+
+def calendario_base(clave: str, origen, rango, calendario_nuevo: CalendarioSpots, dias_fuera: dict = None):
+    """
+    Calendario base estable para el editor de transmisiones guardado en st.session_state[clave].
+    Mientras no cambien el origen (archivo/folio) ni el rango, se reutiliza la misma base.
+    Si sólo cambia el rango, parte de lo ya editado y mueve los spots a sus mismas fechas.
+    dias_fuera son los días del origen con spots fuera del rango actual: como esos spots no
+    llegaron al calendario editado, al cambiar el rango se vuelve a partir de calendario_nuevo.
+    Devuelve el calendario y un número de versión para la key del editor.
+    """
+    estado = st.session_state.get(f"{clave}_base")
+    if estado and estado["origen"] == origen and estado["rango"] == (rango.inicio, rango.fin):
+        return estado["calendario"], estado["version"]
+
+    editado = st.session_state.get(clave)
+    if estado and estado["origen"] == origen and estado["dias_fuera"]:
+        calendario = calendario_nuevo
+        st.info("Se volvieron a cargar las transmisiones del archivo para el nuevo rango de la campaña "
+                "(traía spots fuera del rango anterior); los cambios hechos en el grid se descartaron.")
+    elif estado and estado["origen"] == origen and editado is not None:
+        calendario = editado.reindexar(rango.fechas)
+        descartados = int(editado.spots.sum()) - int(calendario.spots.sum())
+        if descartados:
+            st.warning(f"{descartados} spots quedaron fuera del nuevo rango de la campaña y se descartaron.")
+    else:
+        calendario = calendario_nuevo
+
+    version = estado["version"] + 1 if estado else 0
+    st.session_state[f"{clave}_base"] = {
+        "origen": origen,
+        "rango": (rango.inicio, rango.fin),
+        "calendario": calendario,
+        "version": version,
+        "dias_fuera": bool(dias_fuera),
+    }
+    return calendario, version
+
+
+def errores_resaltados(df, validacion: ValidacionGrid, columnas_dias: list):
+    """Filas con errores (número de renglón del editor) con las celdas inválidas en rojo."""
+    filas = validacion.filas_con_error()
+    errores = validacion.errores[filas]
+    columnas = [c for c in COLUMNAS_INICIALES if c in df.columns]
+    columnas += [c for c in columnas_dias if c in errores.columns and errores[c].any()]
+    tabla = df.loc[filas, columnas].head(MAX_FILAS_ERROR)
+    mascara = errores.reindex(index=tabla.index, columns=columnas, fill_value=False).to_numpy()
+    tabla.index = tabla.index + 1
+    return tabla.style.apply(
+        lambda _: np.where(mascara, "background-color: #ffd6d6; color: #9b0000", ""), axis=None
+    )
+
+
+def mostrar_validacion(validacion: ValidacionGrid, df, columnas_dias: list):
+    if validacion.valido:
+        return
+    st.error("Hay errores en las transmisiones (no se puede enviar la campaña):\n\n" +
+             "\n".join(f"- {mensaje}" for mensaje in validacion.mensajes()))
+    if validacion.filas_con_error().any():
+        with st.expander("Ver filas con errores"):
+            st.dataframe(errores_resaltados(df, validacion, columnas_dias), use_container_width=True)
+
+
+def _consultar_inventario() -> tuple:
+    if conexion_configurada():
+        return ejecutar(consultar_inventario)
+    # Sin Snowflake sólo cuenta lo enviado desde este proceso
+    return pd.DataFrame(columns=COLUMNAS_INVENTARIO), {}
+
+
+def revisar_inventario(calendario: CalendarioSpots, excluir: CalendarioSpots = None) -> pd.DataFrame:
+    """Bloques y días que la pauta sobrevende (vacío si no se pudo leer el inventario, con aviso)."""
+    try:
+        inventario.asegurar(_consultar_inventario)
+    except Exception as e:
+        st.warning(f"No se pudo revisar el inventario de spots: {e}")
+        return pd.DataFrame()
+    return inventario.revisar(calendario, excluir)
+
+
+def puede_enviar(clave: str, dias_fuera: dict = None, excluir: CalendarioSpots = None) -> bool:
+    """
+    False (y el aviso) si el grid del editor o el archivo cargado todavía tienen errores,
+    o si la pauta sobrevende el inventario de algún medio. excluir es la versión guardada
+    de la pauta que se edita, cuyos spots ya están en el inventario.
+    """
+    validacion = st.session_state.get(f"{clave}_validacion")
+    errores = (validacion.total if validacion is not None else 0) + len(dias_fuera or {})
+    if errores:
+        st.error(f"Corrige los {errores} errores de las transmisiones antes de enviar la campaña.")
+        return False
+
+    conflictos = revisar_inventario(st.session_state[clave], excluir)
+    if len(conflictos):
+        st.error(f"La pauta sobrevende el inventario en {len(conflictos)} bloques horarios/días. "
+                 "Ajusta los spots de las filas indicadas antes de enviar la campaña.")
+        st.dataframe(
+            conflictos.head(MAX_FILAS_ERROR), hide_index=True, use_container_width=True,
+            column_config={"FECHA": st.column_config.DateColumn("FECHA", format="DD/MM/YYYY")}
+        )
+        return False
+    return True
+
+
+@st.fragment
+@medido("editor_transmisiones")
+def editor_transmisiones(clave: str, calendario: CalendarioSpots, version: int, rango, clave_editor: str,
+                         clave_iva: str = None, clave_divisa: str = None):
+    """
+    Editor de transmisiones, recálculo y resumen financiero como fragmento: editar una celda
+    o cambiar IVA/moneda sólo vuelve a correr este bloque, no toda la página.
+    Deja el calendario editado en st.session_state[clave], (resumen, tipo_iva, divisa)
+    en st.session_state[f"{clave}_resumen"] y la validación del grid en
+    st.session_state[f"{clave}_validacion"] para el resto de la página.
+    """
+    columnas = list(rango.etiquetas)
+    # Descriptores extra (el FILA guardado, en edición) viajan ocultos en el editor
+    ocultas = [c for c in calendario.descriptores.columns if c not in COLUMNAS_INICIALES]
+    descriptores = COLUMNAS_INICIALES + ocultas
+
+    # Vista ancha (una columna por día) sólo para el editor
+    with medir("data_editor") as tramo:
+        grid = calendario.a_grid_ancho(columnas, descriptores + columnas)
+        tramo.dimensiones(grid)
+        df_editado = st.data_editor(
+            grid,
+            num_rows="dynamic",
+            use_container_width=True,
+            column_config={columna: None for columna in ocultas},
+            key=f"{clave_editor}_{version}"
+        )
+
+    # Recalcular impactos e inversión y validar el grid (por columna, sin recorrer celda por celda)
+    with medir("recalculo", *df_editado.shape):
+        recalculo = recalcular_totales(df_editado, columnas)
+        df_editado = recalculo.transmisiones
+        validacion = validar_transmisiones(df_editado, columnas, recalculo=recalculo)
+    st.session_state[f"{clave}_validacion"] = validacion
+    mostrar_validacion(validacion, df_editado, columnas)
+
+    # Spots de la pauta en forma compacta (descriptores + matriz por fecha)
+    with medir("calendario", *df_editado.shape):
+        st.session_state[clave] = CalendarioSpots.desde_grid_ancho(df_editado, rango.fechas, columnas, descriptores)
+
+    # Resumen financiero
+    st.markdown("""
+        <h2 style='font-size: 20px; font-weight: 600; margin-top: 0em;'>
+            📊 Resumen Transmisiones
+        </h2>
+    """, unsafe_allow_html=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        tipo_iva = st.selectbox("Selecciona IVA", list(IVA_TASAS), index=0, key=clave_iva)
+    with col2:
+        divisa = st.selectbox("Selecciona Moneda", ["MN", "USD", "EUR"], index=0, key=clave_divisa)
+
+    resumen = calcular_resumen(df_editado, tipo_iva)
+    st.dataframe(tabla_resumen(resumen, tipo_iva, divisa), hide_index=True, use_container_width=True)
+    st.session_state[f"{clave}_resumen"] = (resumen, tipo_iva, divisa)
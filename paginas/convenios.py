@@ -0,0 +1,84 @@
+import streamlit as st
+
+from componentes.convenios import saldos_vigentes
+from componentes.encabezado import OPCIONES_CONVENIO
+from pautas.conexion import conexion_configurada, ejecutar
+from pautas.convenios import registrar_convenio, saldos_convenios, tabla_convenios
+
+st.markdown("""
+<div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0rem;">
+    <h2 style="font-size: 28px; font-weight: 700; margin: 0;">
+        LISTADO DE CONVENIOS
+    </h2>
+    <div style="display: flex; align-items: center;">
+        <div style="text-align: right; margin-right: 10px;">
+            <p style="margin: 0; font-size: 14px; font-weight: bold;">BIENVENIDO<br>VENTAS</p>
+        </div>
+        <div style="background-color: #000000; color: white; border-radius: 50%; width: 44px; height: 44px; display: flex; align-items: center; justify-content: center; font-size: 16px; font-weight: bold;">
+            VE
+        </div>
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+# Los saldos vienen acumulados en CONVENIOS: la página lee una fila por convenio, no las pautas
+try:
+    tabla = tabla_convenios(saldos_vigentes())
+except Exception as e:
+    st.error(f"No se pudieron consultar los convenios: {e}")
+    st.stop()
+
+buscar = st.text_input("CONVENIO / CLIENTE", help="Filtra por nombre del convenio o cliente.")
+if buscar.strip():
+    texto = buscar.strip().upper()
+    tabla = tabla[
+        tabla["CONVENIO"].str.contains(texto, regex=False)
+        | tabla["CLIENTE"].fillna("").str.upper().str.contains(texto, regex=False)
+    ]
+
+col1, col2, col3, col4 = st.columns(4)
+col1.metric("CONVENIOS", len(tabla))
+col2.metric("CONTRATADO", f"${tabla['CONTRATADO'].sum():,.2f}")
+col3.metric("CONSUMIDO", f"${tabla['CONSUMIDO'].sum():,.2f}")
+col4.metric("RESTANTE", f"${tabla['RESTANTE'].sum():,.2f}")
+
+sobregirados = int((tabla["RESTANTE"] < 0).sum())
+if sobregirados:
+    st.warning(f"⚠️ {sobregirados} convenios están sobregirados.")
+sin_monto = int(tabla["CONTRATADO"].isna().sum())
+if sin_monto:
+    st.info(f"{sin_monto} convenios usados en pautas no tienen monto contratado registrado.")
+
+st.dataframe(
+    tabla, hide_index=True, use_container_width=True,
+    column_config={
+        "CONTRATADO": st.column_config.NumberColumn("CONTRATADO", format="dollar"),
+        "CONSUMIDO": st.column_config.NumberColumn("CONSUMIDO", format="dollar"),
+        "RESTANTE": st.column_config.NumberColumn("RESTANTE", format="dollar"),
+        "% CONSUMIDO": st.column_config.ProgressColumn("% CONSUMIDO", format="percent", min_value=0, max_value=1),
+        "ACTUALIZADO": st.column_config.DatetimeColumn("ACTUALIZADO", format="DD/MM/YYYY HH:mm"),
+    }
+)
+
+with st.expander("➕ Registrar o actualizar convenio"):
+    with st.form("registro_convenio"):
+        col1, col2 = st.columns(2)
+        nombre = col1.text_input("NOMBRE DEL CONVENIO*")
+        tipo = col2.selectbox("TIPO CONVENIO*", OPCIONES_CONVENIO)
+        cliente = col1.text_input("CLIENTE")
+        moneda = col2.selectbox("MONEDA", ["MN", "USD", "EUR"])
+        contratado = st.number_input("MONTO CONTRATADO*", min_value=0.0, step=1000.0, format="%.2f")
+        if st.form_submit_button("💾 Guardar convenio"):
+            if not nombre.strip():
+                st.error("Captura el nombre del convenio.")
+            elif not conexion_configurada():
+                st.error("Snowflake no está configurado (.env); el convenio no se guardó.")
+            else:
+                try:
+                    ejecutar(lambda sesion: registrar_convenio(sesion, nombre, tipo, cliente, moneda, contratado))
+                except Exception as e:
+                    st.error(f"No se pudo guardar el convenio: {e}")
+                else:
+                    # La tabla de arriba ya se dibujó: se vuelve a correr la página con los saldos nuevos
+                    saldos_convenios.invalidar()
+                    st.rerun()
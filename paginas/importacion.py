@@ -0,0 +1,115 @@
+from functools import partial
+
+import streamlit as st
+
+from componentes.guardado import importar_en_snowflake
+from componentes.sesion import usuario_actual
+from componentes.trabajos import avance_trabajos, lanzar_trabajo, trabajo_sesion
+from pautas.importacion import LibroLote, es_libro, leer_lote, libros_zip, reporte_lote
+from pautas.ingesta import hash_contenido
+from pautas.metricas import cache_metricas
+
+def leer_libros(libros: list, trabajo) -> list:
+    trabajo.reportar(0.0, f"Leyendo {len(libros)} libros")
+    return leer_lote(libros, avance=trabajo.reportar)
+
+def mostrar_reporte(reporte):
+    col1, col2, col3 = st.columns(3)
+    estados = reporte["ESTADO"].value_counts()
+    col1.metric("LIBROS", len(reporte))
+    col2.metric("IMPORTADAS" if "IMPORTADA" in estados else "VÁLIDAS",
+                int(estados.get("IMPORTADA", estados.get("VALIDA", 0))))
+    col3.metric("CON ERROR", int(estados.get("ERROR", 0) + estados.get("NO CARGADA", 0)))
+    st.dataframe(
+        reporte, hide_index=True, use_container_width=True,
+        column_config={
+            "TOTAL": st.column_config.NumberColumn("TOTAL", format="dollar"),
+            "DETALLE": st.column_config.TextColumn("DETALLE", width="large"),
+        }
+    )
+    st.download_button(
+        "⬇️ Descargar reporte (CSV)", reporte.to_csv(index=False).encode("utf-8-sig"),
+        file_name="reporte_importacion.csv", mime="text/csv"
+    )
+
+usuario = usuario_actual()
+
+st.markdown("""
+    <h1 style='font-size: 28px; font-weight: 700; margin: 0.6em 0;'>
+        IMPORTACIÓN EN LOTE DE PAUTAS
+    </h1>
+""", unsafe_allow_html=True)
+st.caption("Los libros deben tener el mismo formato que en Nueva Pauta (títulos de columnas en la fila 15); "
+           "las órdenes en PDF, una tabla con los mismos títulos de columna. "
+           "Las pautas válidas se guardan como borrador; las que tengan errores aparecen en el reporte.")
+
+origen = st.radio("Origen", ["Archivo ZIP", "Carpeta"], horizontal=True)
+if origen == "Archivo ZIP":
+    archivo = st.file_uploader("Selecciona un .zip con los libros de pauta (.xlsx o .pdf).", type=["zip"])
+    subidos = [archivo] if archivo else []
+else:
+    subidos = st.file_uploader("Selecciona la carpeta con los libros de pauta (.xlsx o .pdf).", type=["xlsx", "pdf"],
+                               accept_multiple_files="directory")
+
+libros, llave = [], None
+try:
+    if origen == "Archivo ZIP" and subidos:
+        contenido = subidos[0].getvalue()
+        libros, llave = libros_zip(contenido), hash_contenido(contenido)
+    elif subidos:
+        libros = [LibroLote(f.name, f.getvalue()) for f in subidos if es_libro(f.name)]
+        llave = hash_contenido("".join(hash_contenido(l.contenido) for l in libros).encode())
+except Exception as e:
+    st.error(f"No se pudo abrir el lote: {e}")
+    libros = []
+
+if subidos and not libros:
+    st.warning("El lote no contiene libros .xlsx ni .pdf.")
+
+# La lectura corre en segundo plano (en un pool de procesos) y se cachea por contenido del lote
+resultados = None
+if libros:
+    lectura = trabajo_sesion("lectura_lote", llave, f"Leyendo {len(libros)} libros", partial(leer_libros, libros))
+    if lectura is None:
+        # lanzar_trabajo ya avisó que se llegó al límite de trabajos del usuario
+        st.stop()
+    if not lectura.done():
+        avance_trabajos([lectura])
+    elif lectura.cancelado:
+        st.warning("Se canceló la lectura del lote.")
+        st.button("🔄 Reintentar lectura", key="reintentar_lote")
+    elif lectura.exception() is not None:
+        st.error(f"No se pudo leer el lote: {lectura.exception()}")
+        st.button("🔄 Reintentar lectura", key="reintentar_lote")
+    else:
+        resultados = lectura.result()
+
+if resultados is not None:
+    validos = sum(r.valido for r in resultados)
+    carga = st.session_state.get("carga_lote")
+    if carga is not None and carga[0] != llave:
+        carga = None
+        del st.session_state["carga_lote"]
+
+    if carga is None:
+        mostrar_reporte(reporte_lote(resultados))
+        if validos and st.button(f"⬆️ Cargar {validos} pautas válidas", type="primary"):
+            trabajo = lanzar_trabajo(f"Cargando {validos} pautas", partial(importar_en_snowflake, resultados, usuario))
+            if trabajo is not None:
+                st.session_state["carga_lote"] = (llave, trabajo)
+                st.rerun()
+    else:
+        trabajo = carga[1]
+        if not trabajo.done():
+            avance_trabajos([trabajo])
+        elif trabajo.cancelado:
+            del st.session_state["carga_lote"]
+            st.warning("Carga cancelada.")
+            mostrar_reporte(reporte_lote(resultados))
+        elif trabajo.exception() is not None:
+            mostrar_reporte(reporte_lote(resultados, error_carga=f"No se pudo cargar el lote: {trabajo.exception()}"))
+        else:
+            folios = trabajo.result()
+            cache_metricas.invalidar(usuario)
+            st.success(f"✅ Se importaron {len(folios)} pautas como borrador.")
+            mostrar_reporte(reporte_lote(resultados, folios))
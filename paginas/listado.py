@@ -0,0 +1,235 @@
+from functools import partial
+
+import streamlit as st
+import pandas as pd
+
+from componentes.sesion import usuario_actual
+from componentes.sugerencias import texto_con_sugerencias
+from componentes.trabajos import trabajo_sesion
+from pautas.conexion import conexion_configurada, ejecutar
+from pautas.edicion import PautaGuardada, cache_pautas, cargar_pauta, pauta_ejemplo
+from pautas.listado import (
+    COLUMNAS_LISTADO, ESTATUS_OTC, FiltrosListado, PaginaListado, listar_pautas, listar_pautas_ejemplo, tipar_listado
+)
+from pautas.medicion import medir
+
+@st.cache_data(ttl=60, show_spinner=False)
+def pagina_listado(filtros: FiltrosListado, cursor):
+    """Una página del listado de pautas; sin Snowflake configurado usa los datos de ejemplo."""
+    if not conexion_configurada():
+        return listar_pautas_ejemplo(filtros, cursor)
+    return ejecutar(lambda sesion: listar_pautas(sesion, filtros, cursor))
+
+def obtener_pauta(folio: str, version: int, trabajo=None) -> PautaGuardada:
+    """Pauta del folio para edición, cacheada por (folio, versión) en el proceso."""
+    if trabajo is not None:
+        trabajo.reportar(0.1, "Cargando pauta")
+    if not conexion_configurada():
+        return cache_pautas.obtener(folio, version, pauta_ejemplo)
+    return cache_pautas.obtener(folio, version, lambda f: ejecutar(lambda sesion: cargar_pauta(sesion, f)))
+
+st.markdown("""
+<div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0rem;">
+    <h2 style="font-size: 28px; font-weight: 700; margin: 0;">
+        LISTADO DE ORDENES/PAUTAS DE TRANSMISION RADIO
+    </h2>
+    <div style="display: flex; align-items: center;">
+        <div style="text-align: right; margin-right: 10px;">
+            <p style="margin: 0; font-size: 14px; font-weight: bold;">BIENVENIDO<br>VENTAS</p>
+        </div>
+        <div style="background-color: #000000; color: white; border-radius: 50%; width: 44px; height: 44px; display: flex; align-items: center; justify-content: center; font-size: 16px; font-weight: bold;">
+            VE
+        </div>
+    </div>
+</div>
+""", unsafe_allow_html=True)
+
+# Estilos para armonizar botones con los campos ---
+st.markdown("""
+    <style>
+    .filtro-btn button {
+        background-color: white;
+        color: #31333F;
+        border: 1px solid #D0D1D5;
+        border-radius: 6px;
+        height: 35px !important;
+        padding: 0px 14px;
+        font-size: 14px;
+        font-weight: 500;
+        margin-right: 6px;
+    }
+    .filtro-btn button:hover {
+        background-color: #f0f0f5;
+        border-color: #c0c0c5;
+    }
+    .stDateInput>div>input {
+        height: 35px !important;
+        font-size: 14px;
+    }
+    </style>
+""", unsafe_allow_html=True)
+
+#===== OPCION PAUTAS TRANSMISION : FILTROS PAUTAS DE TRANSMISION
+with st.expander("🔍 Filtros de búsqueda", expanded=True):
+
+    # Fila 1: CLIENTE | AGENCIA | CAMPAÑA
+    col1, col2, col3 = st.columns([1, 1, 1])
+    with col1:
+        cliente = texto_con_sugerencias("CLIENTE / RAZON SOCIAL", "CLIENTE", key="filtro_cliente",
+        help="Ingresa la razón social del cliente.")
+    with col2:
+        agencia = texto_con_sugerencias("AGENCIA", "AGENCIA", key="filtro_agencia")
+    with col3:
+        campana = texto_con_sugerencias("CAMPAÑA", "CAMPANA", key="filtro_campana")
+
+    # Fila 2: FECHA1 | FECHA2 | FILTROS AVANZADOS | BOTONES
+    col4, col5, col6, col7 = st.columns([1, 1, 1, 1.5])
+    with col4:
+        # Sin fechas por defecto: el listado parte de todas las capturas (incluido el de ejemplo)
+        fecha1 = st.date_input("FECHA INICIO LLENADO", value=None, format="DD/MM/YYYY")
+    with col5:
+        fecha2 = st.date_input("FECHA FIN LLENADO", value=None, format="DD/MM/YYYY")
+    with col6:
+        filtro_estatus_otc = st.multiselect(
+            "ESTATUS OTC",
+            options=ESTATUS_OTC,
+            default=[],
+            placeholder="Selecciona una opción"
+        )
+    
+    with col7:
+        st.markdown("<div style='margin-top: 28px;' class='filtro-btn'>", unsafe_allow_html=True)
+        col_btn1, col_btn2, col_btn3 = st.columns([1, 1, 1])
+        with col_btn1:
+            filtrar = st.button("🔄 Filtrar")
+        with col_btn2:
+            if st.button("➕ Nueva Pauta"):
+                st.switch_page("paginas/nueva_pauta.py")
+        with col_btn3:
+            if st.button("⚙️ Avanzados"):
+                st.session_state["filtros_avanzados"] = True
+
+st.markdown("---")               
+# Los filtros se aplican al presionar "Filtrar"; la consulta trae sólo la página actual
+filtros = FiltrosListado(cliente, agencia, campana, fecha1, fecha2, tuple(filtro_estatus_otc))
+if filtrar or "filtros_listado" not in st.session_state:
+    st.session_state["filtros_listado"] = filtros
+    st.session_state["cursores_listado"] = [None]
+cursores = st.session_state["cursores_listado"]
+
+try:
+    with medir("consulta_listado"):
+        pagina = pagina_listado(st.session_state["filtros_listado"], cursores[-1])
+except Exception as e:
+    st.error(f"No se pudo consultar el listado de pautas: {e}")
+    pagina = PaginaListado(tipar_listado(pd.DataFrame(columns=list(COLUMNAS_LISTADO))), None)
+
+df = pagina.pautas.copy()
+df.insert(0, "ARCHIVO", "📄")
+
+# Copiar el DataFrame original
+df_con_checkbox = df.copy()
+
+# Insertar la columna de selección al principio
+df_con_checkbox.insert(0, "✅ SELECCIONAR", pd.Series(False, index=df_con_checkbox.index, dtype=bool))
+
+#===== OPCION PAUTAS TRANSMISION : BOTONES DE ACCION DEL GRID
+# Usa proporciones más estrechas para reducir espacio entre los botones
+col1, col2, col3, col4, col5 = st.columns([0.8, 0.8, 0.8, 0.8, 0.8])  
+with col1:
+    if st.button("👁️ Ver", key="btn_ver"):
+        st.session_state["accion"] = "ver"
+
+with col2:
+    if st.button("✏️ Editar", key="btn_editar"):
+        st.session_state["accion"] = "editar"
+
+with col3:
+    if st.button("📋 Duplicar", key="btn_duplicar"):
+        st.session_state["accion"] = "duplicar"
+
+with col4:
+    if st.button("🗑️ Eliminar", key="btn_eliminar"):
+        st.session_state["accion"] = "eliminar"
+
+with col5:
+    if st.button("📥 Descargar", key="btn_descargar"):
+        st.session_state["accion"] = "eliminar"
+
+# Mostrar el grid con checkbox por fila; los datos viajan tipados y sólo aquí se les da formato
+with medir("grid_listado", *df_con_checkbox.shape):
+    selected_df = st.data_editor(
+        df_con_checkbox,
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "✅ SELECCIONAR": st.column_config.CheckboxColumn(
+                label="✅", help="Seleccionar"
+            ),
+            "INICIO CAMPAÑA": st.column_config.DateColumn("INICIO CAMPAÑA", format="DD-MM-YYYY"),
+            "FIN CAMPAÑA": st.column_config.DateColumn("FIN CAMPAÑA", format="DD-MM-YYYY"),
+            "TOTAL": st.column_config.NumberColumn("TOTAL", format="dollar"),
+            "FECHA CAPTURA": st.column_config.DateColumn("FECHA CAPTURA", format="DD-MM-YYYY"),
+            "VERSION": None
+        },
+        # Sólo la selección se edita: las categóricas no deben abrirse como listas desplegables
+        disabled=list(df.columns),
+        key="grid_pautas_con_checkbox"
+    )
+
+# Paginación por llave: la pila de cursores permite regresar a la página anterior
+col_pag1, col_pag2, col_pag3 = st.columns([1, 1, 6])
+with col_pag1:
+    if st.button("⬅️ Anterior", disabled=len(cursores) == 1, key="btn_pagina_anterior"):
+        cursores.pop()
+        st.rerun()
+with col_pag2:
+    if st.button("Siguiente ➡️", disabled=pagina.siguiente is None, key="btn_pagina_siguiente"):
+        cursores.append(pagina.siguiente)
+        st.rerun()
+with col_pag3:
+    if df.empty:
+        st.caption("Sin pautas para los filtros seleccionados.")
+    else:
+        st.caption(f"Página {len(cursores)} · {len(df)} pautas")
+
+st.markdown("---")  
+
+#===== OPCION PAUTAS TRANSMISION : TABS EDICIONES DE LA PAUTA
+if "folio_edicion" not in st.session_state:
+    st.session_state["folio_edicion"] = None
+
+# (folio, versión) de las filas marcadas en el grid
+seleccionadas = [
+    (fila["FOLIO INTERNO"], int(fila["VERSION"]))
+    for _, fila in selected_df[selected_df["✅ SELECCIONAR"]].iterrows()
+]
+
+# Al marcar una fila su pauta se empieza a cargar en segundo plano, para que la edición abra sin esperar
+if seleccionadas and not cache_pautas.contiene(*seleccionadas[0]):
+    folio_sel, version_sel = seleccionadas[0]
+    trabajo_sesion("precarga_edicion", seleccionadas[0], f"Cargando {folio_sel}",
+                   partial(obtener_pauta, folio_sel, version_sel))
+
+if st.session_state.get("accion") == "editar":
+    del st.session_state["accion"]
+    if not seleccionadas:
+        st.warning("Marca en el grid la pauta que quieres editar.")
+    else:
+        st.session_state["folio_edicion"] = seleccionadas[0]
+
+if st.session_state["folio_edicion"]:
+    # La edición (pestañas, materiales, editor) se carga sólo cuando se abre un folio
+    from componentes.edicion import editar_pauta
+
+    folio_edicion, version_edicion = st.session_state["folio_edicion"]
+    try:
+        # Si la precarga sigue en curso se espera a esa misma carga
+        with st.spinner(f"Cargando {folio_edicion}..."):
+            pauta_edicion = obtener_pauta(folio_edicion, version_edicion)
+    except Exception as e:
+        st.error(f"No se pudo cargar la pauta {folio_edicion}: {e}")
+        st.session_state["folio_edicion"] = None
+    else:
+        if editar_pauta(pauta_edicion, usuario_actual()):
+            pagina_listado.clear()
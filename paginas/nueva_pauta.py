@@ -0,0 +1,336 @@
+from functools import partial
+
+import streamlit as st
+
+from componentes.convenios import aviso_sobregiro
+from componentes.encabezado import datos_generales_iniciales, formulario_encabezado
+from componentes.guardado import exportar_archivos, guardar_en_snowflake
+from componentes.materiales import seccion_materiales
+from componentes.sesion import usuario_actual
+from componentes.trabajos import avance_trabajos, lanzar_trabajo, trabajo_sesion
+from componentes.transmisiones import calendario_base, editor_transmisiones, puede_enviar
+from pautas.calendario import COLUMNAS_INICIALES, CalendarioSpots, construir_calendario
+from pautas.encabezado import extraer_datos_generales
+from pautas.ingesta import PautaLeida, cache_lecturas, es_pdf, hash_contenido, leer_archivo_pauta
+from pautas.medicion import medir
+from pautas.metricas import cache_metricas
+from pautas.validacion import validar_transmisiones
+
+def leer_pauta(digest: str, contenido: bytes, trabajo) -> PautaLeida:
+    """Lee la pauta (Excel o PDF) en segundo plano y la deja en cache_lecturas por su hash."""
+    trabajo.reportar(0.1, "Leyendo PDF" if es_pdf(contenido) else "Leyendo libro")
+    with medir("lectura_archivo") as tramo:
+        leida = cache_lecturas.obtener(digest, partial(leer_archivo_pauta, contenido, avance=trabajo.reportar))
+        tramo.dimensiones(leida.transmisiones)
+    return leida
+
+usuario = usuario_actual()
+
+# Estilos personalizados para diseño compacto y títulos uniformes
+st.markdown("""
+    <style>
+    .block-container {
+        padding-top: 1rem !important;
+    }
+
+    input, select, textarea {
+        padding-top: 3px !important;
+        padding-bottom: 3px !important;
+        height: 32px !important;
+        font-size: 13px !important;
+    }
+
+    .stDateInput input {
+        font-size: 13px !important;
+        height: 32px !important;
+    }
+
+    label {
+        font-size: 13px !important;
+        margin-bottom: 1px !important;
+        margin-top: -3px !important;
+    }
+
+    .stColumns {
+        gap: 0.75rem !important;
+    }
+
+    .stTextInput > div, .stSelectbox > div {
+        padding-bottom: 0px !important;
+    }
+    </style>
+""", unsafe_allow_html=True)
+
+# Título con bloque de usuario alineado al nivel
+st.markdown("""
+    <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 0rem;">
+        <h1 style="font-size: 28px; font-weight: 700; margin: 0.6em;">
+            PRELLENADO ORDEN/PAUTA DE TRANSMISION RADIO
+        </h1>
+        <div style="display: flex; align-items: center;">
+            <div style="text-align: right; margin-right: 10px;">
+                <p style="margin: 0.3em; font-size: 14px; font-weight: bold;">BIENVENIDO<br>VENTAS</p>
+            </div>
+            <div style="background-color: #000000; color: white; border-radius: 50%; width: 44px; height: 44px; display: flex; align-items: center; justify-content: center; font-size: 16px; font-weight: bold;">
+                VE
+            </div>
+        </div>
+    </div>
+""", unsafe_allow_html=True)
+
+# Subida de archivo
+st.markdown("""
+    <h2 style='font-size: 20px; font-weight: 600; margin-top: 0em;'>
+        📥 Subir archivo de Pauta Excel/Pdf (opcional)
+    </h2>
+""", unsafe_allow_html=True)
+
+archivo = st.file_uploader("Selecciona un archivo Excel o PDF con estructura compatible.", type=["xlsx", "pdf"])
+
+# Variables con valores por defecto
+datos_generales = datos_generales_iniciales()
+
+# Lectura única del libro (encabezado + transmisiones), cacheada por hash del contenido
+# y hecha en segundo plano para no bloquear la página
+pauta_leida = None
+digest_archivo = None
+if archivo:
+    contenido = archivo.getvalue()
+    digest = hash_contenido(contenido)
+    # Un contenido ya leído (en esta u otra sesión) se usa sin lanzar otra lectura
+    pauta_leida = cache_lecturas.consultar(digest)
+    if pauta_leida is None:
+        lectura = trabajo_sesion("lectura_pauta", digest, f"Leyendo {archivo.name}", partial(leer_pauta, digest, contenido))
+        if lectura is None:
+            # lanzar_trabajo ya avisó que se llegó al límite de trabajos del usuario
+            st.stop()
+        if not lectura.done():
+            avance_trabajos([lectura])
+        elif lectura.cancelado:
+            st.warning(f"Se canceló la lectura de {archivo.name}.")
+            st.button("🔄 Reintentar lectura", key="reintentar_lectura")
+        elif lectura.exception() is not None:
+            st.error(f"Error al leer el archivo: {lectura.exception()}")
+            st.button("🔄 Reintentar lectura", key="reintentar_lectura")
+        else:
+            pauta_leida = lectura.result()
+    if pauta_leida is not None:
+        digest_archivo = digest
+
+if pauta_leida is not None:
+    try:
+        # Encabezados de las filas 0 a 13, indexados en una sola pasada
+        datos_generales.update(extraer_datos_generales(pauta_leida.encabezado))
+    except Exception as e:
+        st.warning(f"No se pudieron extraer datos generales: {e}")
+
+# === Captura de Fechas y Datos Generales ===
+with st.expander("🙍 Información del Cliente y Campaña", expanded=True):
+    encabezado = formulario_encabezado(datos_generales)
+inicio_camp, fin_camp = encabezado["INICIO_CAMPANA"], encabezado["FIN_CAMPANA"]
+
+# Calendario del rango exacto de la campaña (memorizado por inicio/fin)
+if fin_camp < inicio_camp:
+    st.warning("FIN CAMPAÑA es anterior a INICIO CAMPAÑA; se muestra sólo el día de inicio.")
+rango = construir_calendario(inicio_camp, fin_camp)
+calendario_fechas = rango.fechas
+calendario_columnas = list(rango.etiquetas)
+fechas_legibles = rango.legibles
+
+columnas_iniciales = COLUMNAS_INICIALES
+calendario = None
+dias_fuera = {}
+
+if pauta_leida is not None:
+    try:
+        # Transmisiones desde la fila 15, ya cortadas donde 'PLAZA TRANS' está vacía
+        df_archivo = pauta_leida.transmisiones
+        if pauta_leida.filas_ignoradas:
+            st.info("Se ignoraron filas vacías o de totales al final del archivo.")
+
+        # Validar columnas requeridas
+        columnas_faltantes = [col for col in columnas_iniciales if col not in df_archivo.columns]
+        if columnas_faltantes:
+            st.error(f"El archivo no contiene las siguientes columnas obligatorias: {columnas_faltantes}")
+        else:
+            # Los días que no vienen en el archivo quedan en 0; los que traen spots fuera del rango bloquean el envío
+            dias_archivo = [c for c in calendario_columnas if c in df_archivo.columns]
+            validacion_archivo = validar_transmisiones(df_archivo, dias_archivo, calendario_columnas)
+            if validacion_archivo.conteos["DIAS"]:
+                st.warning(f"{validacion_archivo.conteos['DIAS']} celdas de días del archivo no eran enteros ≥ 0; "
+                           "se cargaron como 0 (o sin decimales).")
+            dias_fuera = validacion_archivo.dias_fuera
+            if dias_fuera:
+                st.error(f"El archivo tiene spots en días fuera del rango de la campaña ({', '.join(dias_fuera)}); "
+                         "revisa INICIO CAMPAÑA y FIN CAMPAÑA.")
+            with medir("calendario_archivo", *df_archivo.shape):
+                calendario = CalendarioSpots.desde_grid_ancho(
+                    df_archivo, calendario_fechas, calendario_columnas, columnas_iniciales
+                )
+            st.success("Archivo cargado correctamente. Puedes revisar y editar abajo.")
+
+    except Exception as e:
+        st.error(f"Error al leer el archivo: {e}")
+
+if calendario is None:
+    calendario = CalendarioSpots.ejemplo(calendario_fechas)
+
+# Si cambian las fechas se conservan los spots ya capturados en sus mismas fechas
+# (si el archivo traía spots fuera del rango, se vuelve a leer del archivo para el rango nuevo)
+calendario, version_base = calendario_base("calendario_nueva_pauta", digest_archivo, rango, calendario, dias_fuera)
+
+# Título sección transmisiones
+st.markdown(
+    f"""
+    <div style='display: flex; align-items: center; gap: 20px; margin-top: 0em;'>
+        <h2 style='font-size: 20px; font-weight: 600; margin: 0;'>📡 Transmisiones por Día</h2>
+        <span style='font-weight: bold;'>📅 Inicio: {inicio_camp.strftime('%d/%m/%Y')}</span>
+        <span style='font-weight: bold;'>🗓️ Fin: {fin_camp.strftime('%d/%m/%Y')}</span>
+    </div>
+    """, unsafe_allow_html=True
+)
+
+# Editor, recálculo y resumen (IVA/Moneda) se vuelven a correr solos al editar
+editor_transmisiones("calendario_nueva_pauta", calendario, version_base, rango, "data_editor_impacts")
+resumen, tipo_iva, divisa = st.session_state["calendario_nueva_pauta_resumen"]
+impactos_totales, subtotal, iva, total = resumen
+
+# Secciones adicionales
+st.markdown("""
+    <h2 style='font-size: 20px; font-weight: 600; margin-top: 0em;'>
+        📦 ¿Materiales, indicaciones especiales?
+    </h2>
+""", unsafe_allow_html=True)
+observaciones = st.text_area("Indica materiales u observaciones especiales", placeholder="Ejemplo : Materiales pendientes por el cliente.")
+
+# ————— Sección: Materiales publicitarios —————
+st.header("Materiales Publicitarios")
+
+seccion_materiales("materiales")
+
+st.markdown("""
+    <h2 style='font-size: 20px; font-weight: 600; margin-top: 0em;'>
+        🎙️ ¿Indicaciones Operativas / Conducción / Talentos?
+    </h2>
+""", unsafe_allow_html=True)
+talentos = st.text_area("Honorarios / Talentos", placeholder="Ejemplo : Detallar el monto de honorarios y talentos.")
+
+st.markdown("""
+    <h2 style='font-size: 20px; font-weight: 600; margin-top: 0em;'>
+        💳 ¿Indicaciones Facturación y Cobranza?
+    </h2>
+""", unsafe_allow_html=True)
+cobranza = st.text_area("Cobranza", placeholder = "Ejemplo : Facturación al término de la campaña. El cliente no es moroso; y no está bloqueado.")
+# Nuevo campo para cargar el pagaré
+pagare_pdf = st.file_uploader("📎 Cargar pagaré (PDF)", type=["pdf"], key="carga_pagare")
+
+# Totales e indicaciones completan el encabezado del formulario
+encabezado.update({
+    "TOTAL_IMPACTOS": impactos_totales,
+    "SUBTOTAL": subtotal,
+    "TIPO_IVA": tipo_iva,
+    "IVA": iva,
+    "TOTAL": total,
+    "MONEDA": divisa,
+    "ESTATUS_CAMPANA": "PROGRAMADA",
+    "OBSERVACIONES_MATERIALES": observaciones,
+    "INDICACIONES_TALENTOS": talentos,
+    "INDICACIONES_COBRANZA": cobranza,
+})
+calendario_guardar = st.session_state["calendario_nueva_pauta"]
+aviso_sobregiro(encabezado)
+
+col_action1, col_action2, col_action3 = st.columns(3)
+
+# Guardar y enviar corren en segundo plano; el resultado se muestra al terminar
+estatus_guardar = None
+with col_action1:
+    if st.button("💾 Guardar como Borrador"):
+        estatus_guardar = "BORRADOR"
+
+with col_action2:
+    if st.button("❌ Descartar Cambios"):
+        st.warning("❌ Cambios descartados por el usuario.")
+        st.rerun()  # Cambiado de st.experimental_rerun() a st.rerun()
+
+with col_action3:
+    # Los borradores se guardan aunque tengan errores; el envío no
+    if st.button("📤 Enviar Campaña OTC") and puede_enviar("calendario_nueva_pauta", dias_fuera):
+        estatus_guardar = "VENTAS"
+
+if estatus_guardar and "guardado_nueva_pauta" not in st.session_state:
+    encabezado_guardar = {**encabezado, "ESTATUS_OTC": estatus_guardar}
+    guardado = lanzar_trabajo(
+        "Guardando borrador" if estatus_guardar == "BORRADOR" else "Enviando campaña OTC",
+        partial(guardar_en_snowflake, encabezado_guardar, calendario_guardar,
+                list(st.session_state['materiales']), usuario),
+        llave=estatus_guardar
+    )
+    if guardado is not None:
+        st.session_state["guardado_nueva_pauta"] = (guardado, encabezado_guardar, calendario_guardar)
+
+if "guardado_nueva_pauta" in st.session_state:
+    guardado, encabezado_guardar, calendario_enviado = st.session_state["guardado_nueva_pauta"]
+    if not guardado.done():
+        avance_trabajos([guardado])
+    else:
+        del st.session_state["guardado_nueva_pauta"]
+        es_borrador = guardado.llave == "BORRADOR"
+        if guardado.cancelado:
+            st.warning("Guardado cancelado.")
+        elif guardado.exception() is not None:
+            accion = "guardar el borrador" if es_borrador else "enviar la campaña"
+            st.error(f"No se pudo {accion}: {guardado.exception()}")
+        elif es_borrador:
+            folio = guardado.result()
+            cache_metricas.invalidar(usuario)
+            st.success(f"✅ Borrador Guardado Exitosamente.\n   📄 Folio Generado: {folio}.")
+        else:
+            folio = guardado.result()
+            cache_metricas.invalidar(usuario)
+            # Excel y PDF de la pauta se generan en segundo plano
+            exportacion = lanzar_trabajo(
+                f"Generando archivos de {folio}",
+                partial(exportar_archivos, folio, encabezado_guardar, calendario_enviado)
+            )
+            if exportacion is not None:
+                st.session_state["exportacion_nueva_pauta"] = exportacion
+            #---
+            st.markdown(f"""
+            <div style="display: flex; justify-content: center; margin-top: 30px;">
+                <div style="border:1px solid #ccc; padding: 1.5em; border-radius: 10px; background-color: #eef6fb; width: 400px;">
+                    <h4 style="color:green;">Se guardó el <b>{folio}</b> exitosamente</h4>
+                    <p><b>CLIENTE:</b> {encabezado['CLIENTE']}</p>
+                    <p><b>CAMPAÑA:</b> {encabezado['CAMPANA']}</p>
+                    <p><b>INICIO CAMPAÑA:</b> {inicio_camp.strftime("%d/%m/%Y")}</p>
+                    <p><b>FIN CAMPAÑA:</b> {fin_camp.strftime("%d/%m/%Y")}</p>
+                    <p><b>IMPACTOS:</b> {impactos_totales}</p>
+                    <p><b>SUBTOTAL:</b> ${subtotal:,.2f}</p>
+                    <p><b>IVA:  ({tipo_iva}):</b> {"Exento" if tipo_iva == "Exento" else f"${iva:,.2f}"}</p>
+                    <p><b>TOTAL: ({divisa}):</b> ${total:,.2f}</p>
+                    <p><b>MATERIALES:</b> {len(st.session_state.get('materiales', []))}</p>
+                    <p><b>VENDEDOR:</b> {encabezado['EJECUTIVO']}</p>
+                </div>
+            </div>
+            """, unsafe_allow_html=True)
+            #---
+            st.success(f"✅ Campaña Enviada Correctamente.\n   📄 Folio Generado: {folio}.")
+
+# Descarga del Excel y PDF de la última campaña enviada
+exportacion = st.session_state.get("exportacion_nueva_pauta")
+if exportacion is not None:
+    if not exportacion.done():
+        avance_trabajos([exportacion])
+    elif exportacion.cancelado:
+        del st.session_state["exportacion_nueva_pauta"]
+    elif exportacion.exception() is not None:
+        st.error(f"No se pudieron generar los archivos de la pauta: {exportacion.exception()}")
+    else:
+        archivos = exportacion.result()
+        col_xlsx, col_pdf = st.columns(2)
+        col_xlsx.download_button(
+            "⬇️ Descargar Excel", archivos.xlsx, file_name=archivos.nombre_xlsx,
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
+        col_pdf.download_button("⬇️ Descargar PDF", archivos.pdf, file_name=archivos.nombre_pdf, mime="application/pdf")
+
@@ -0,0 +1 @@
+"""Lógica de negocio de las Órdenes/Pautas de Transmisión Radio, independiente de la UI."""
@@ -0,0 +1,97 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+IVA_TASAS = {
+    "16%": 0.16,
+    "8%": 0.08,
+    "0%": 0.0,
+    "Exento": 0.0
+}
+
+
+class Recalculo(NamedTuple):
+    transmisiones: pd.DataFrame
+    invalidos: pd.DataFrame
+    dias: np.ndarray  # spots capturados (float, sin truncar) de las columnas de día presentes
+
+
+class ResumenFinanciero(NamedTuple):
+    impactos: int
+    subtotal: float
+    iva: float
+    total: float
+
+
+def matriz_numerica(df: pd.DataFrame) -> tuple:
+    """
+    Convierte el bloque completo a una matriz float en una sola operación.
+    Devuelve la matriz (0 donde no hay número) y la máscara de celdas capturadas que no son número.
+    """
+    if all(pd.api.types.is_numeric_dtype(t) for t in df.dtypes):
+        numeros = df.to_numpy(dtype=float)
+        return np.nan_to_num(numeros), np.zeros(numeros.shape, dtype=bool)
+
+    valores = df.to_numpy(dtype=object)
+    try:
+        # Celdas que ya son números (o vacías): conversión directa de numpy
+        numeros = valores.astype(float)
+    except (ValueError, TypeError):
+        # Hay texto: sólo las columnas que lo tienen pasan por to_numeric
+        numeros = np.empty(valores.shape, dtype=float)
+        for j in range(valores.shape[1]):
+            try:
+                numeros[:, j] = valores[:, j].astype(float)
+            except (ValueError, TypeError):
+                numeros[:, j] = pd.to_numeric(pd.Series(valores[:, j]), errors="coerce").to_numpy(dtype=float)
+
+    # Sólo las celdas que no se pudieron convertir se revisan: nulas o en blanco no son error
+    invalidos = np.isnan(numeros)
+    if invalidos.any():
+        originales = pd.Series(valores[invalidos])
+        vacias = originales.isna() | originales.astype(str).str.strip().eq("")
+        invalidos[invalidos] = ~vacias.to_numpy()
+    return np.nan_to_num(numeros), invalidos
+
+
+def recalcular_totales(df: pd.DataFrame, columnas_dias: list) -> Recalculo:
+    """
+    Recalcula TOTAL IMPACTOS (suma de spots por día) y TOTAL INVERSION (impactos x TARIFA)
+    sobre la matriz completa de días, sin recorrer celda por celda. Los spots con decimales se truncan como int().
+    Devuelve el grid recalculado y una máscara con las celdas capturadas que no son número
+    (días y TARIFA); esas celdas cuentan como 0.
+    """
+    df = df.copy()
+    columnas_dias = [c for c in columnas_dias if c in df.columns]
+
+    spots, invalidos_dias = matriz_numerica(df[columnas_dias])
+    impactos = np.trunc(spots).sum(axis=1).astype("int64")
+    tarifa, invalidos_tarifa = matriz_numerica(df[["TARIFA"]])
+    tarifa = tarifa[:, 0]
+
+    invalidos = pd.DataFrame(invalidos_dias, index=df.index, columns=columnas_dias)
+    invalidos["TARIFA"] = invalidos_tarifa[:, 0]
+
+    df["TOTAL IMPACTOS"] = impactos
+    df["TOTAL INVERSION"] = np.round(impactos * tarifa, 2)
+    return Recalculo(df, invalidos, spots)
+
+
+def calcular_resumen(df: pd.DataFrame, tipo_iva: str) -> ResumenFinanciero:
+    """Subtotal, IVA y total de la pauta a partir de las columnas ya recalculadas."""
+    subtotal = float(pd.to_numeric(df["TOTAL INVERSION"], errors="coerce").fillna(0).sum())
+    iva = round(subtotal * IVA_TASAS[tipo_iva], 2)
+    total = round(subtotal + iva, 2)
+    impactos = int(pd.to_numeric(df["TOTAL IMPACTOS"], errors="coerce").fillna(0).sum())
+    return ResumenFinanciero(impactos, subtotal, iva, total)
+
+
+def tabla_resumen(resumen: ResumenFinanciero, tipo_iva: str, divisa: str) -> pd.DataFrame:
+    """Tabla de una fila con el resumen formateado para mostrar."""
+    return pd.DataFrame([{
+        "TOTAL IMPACTOS": resumen.impactos,
+        "SUBTOTAL": f"${resumen.subtotal:,.2f}",
+        f"IVA ({tipo_iva})": f"${resumen.iva:,.2f}" if tipo_iva != "Exento" else "Exento",
+        f"TOTAL ({divisa})": f"${resumen.total:,.2f}"
+    }])
@@ -0,0 +1,188 @@
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from pautas.calculos import matriz_numerica
+
+COLUMNAS_INICIALES = [
+    "PLAZA TRANS", "TIPO MEDIO", "MEDIO", "PROGRAMA", "DURACION",
+    "PRODUCTO", "VERSION", "TALENTO", "HORA INICIO", "HORA FIN",
+    "TOTAL IMPACTOS", "TARIFA", "TOTAL INVERSION"
+]
+
+DIAS_ES = ["L", "M", "M", "J", "V", "S", "D"]
+MESES_ES = ["ENE", "FEB", "MAR", "ABR", "MAY", "JUN", "JUL", "AGO", "SEP", "OCT", "NOV", "DIC"]
+
+# Fila inicial del editor cuando no se sube archivo
+FILA_EJEMPLO = {
+    "PLAZA TRANS": "MONTERREY", "TIPO MEDIO": "RADIO", "MEDIO": "XERT-AM", "PROGRAMA": ".",
+    "DURACION": "20''", "PRODUCTO": "SPOT", "VERSION": "VERSION1", "TALENTO": ".",
+    "HORA INICIO": "05:00", "HORA FIN": "10:00",
+    "TOTAL IMPACTOS": 0, "TARIFA": 0, "TOTAL INVERSION": 0
+}
+
+# Spots por día y fila: 0..65535 cabe de sobra en 2 bytes
+TIPO_SPOTS = np.uint16
+
+
+def etiquetas_dias(fechas) -> list:
+    """
+    Etiquetas de columna del editor ("1/L", "2/M", ...). Si el rango repite una etiqueta (mismo
+    número y día de la semana en campañas de más de un mes) se agrega el mes ("1-AGO/V") para que no choquen.
+    """
+    fechas = pd.DatetimeIndex(fechas)
+    cortas = [f"{f.day}/{DIAS_ES[f.weekday()]}" for f in fechas]
+    if len(set(cortas)) == len(cortas):
+        return cortas
+    return [f"{f.day}-{MESES_ES[f.month - 1]}/{DIAS_ES[f.weekday()]}" for f in fechas]
+
+
+class RangoCalendario(NamedTuple):
+    inicio: date
+    fin: date
+    fechas: tuple
+    etiquetas: tuple
+    legibles: tuple
+
+
+def _a_fecha(valor) -> date:
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+@lru_cache(maxsize=256)
+def _construir_rango(inicio: date, fin: date) -> RangoCalendario:
+    fechas = tuple(inicio + timedelta(days=i) for i in range((fin - inicio).days + 1))
+    return RangoCalendario(
+        inicio,
+        fin,
+        fechas,
+        tuple(etiquetas_dias(fechas)),
+        tuple(f.strftime('%d/%m/%Y') for f in fechas),
+    )
+
+
+def construir_calendario(inicio, fin) -> RangoCalendario:
+    """
+    Fechas, etiquetas cortas ("1/L") y legibles ("01/07/2025") del rango exacto de la campaña,
+    memorizadas por (inicio, fin). Si FIN es anterior a INICIO el rango queda de un día.
+    """
+    inicio, fin = _a_fecha(inicio), _a_fecha(fin)
+    return _construir_rango(inicio, max(inicio, fin))
+
+
+def _normalizar_fechas(fechas) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(pd.to_datetime(list(fechas))).normalize()
+
+
+class CalendarioSpots:
+    """
+    Spots por día de una pauta: los descriptores de cada fila (PLAZA TRANS, PROGRAMA, TARIFA, ...)
+    se guardan aparte y los conteos en una matriz uint16 filas x fechas indexada por fechas reales.
+    La vista ancha del editor (una columna por día) se genera sólo para mostrar.
+    """
+
+    def __init__(self, descriptores: pd.DataFrame, fechas, spots: np.ndarray = None):
+        self.descriptores = descriptores.reset_index(drop=True)
+        self.fechas = _normalizar_fechas(fechas)
+        forma = (len(self.descriptores), len(self.fechas))
+        if spots is None:
+            spots = np.zeros(forma, dtype=TIPO_SPOTS)
+        if spots.shape != forma:
+            raise ValueError(f"La matriz de spots {spots.shape} no coincide con filas x fechas {forma}")
+        self.spots = spots.astype(TIPO_SPOTS, copy=False)
+
+    @classmethod
+    def ejemplo(cls, fechas) -> "CalendarioSpots":
+        """Calendario de una fila con FILA_EJEMPLO y todos los días en 0."""
+        return cls(pd.DataFrame([FILA_EJEMPLO], columns=COLUMNAS_INICIALES), fechas)
+
+    @classmethod
+    def desde_grid_ancho(cls, df: pd.DataFrame, fechas, etiquetas: list,
+                         columnas_descriptores: list = None) -> "CalendarioSpots":
+        """
+        Construye el calendario desde el grid ancho del editor; los días ausentes quedan en 0.
+        Por defecto toda columna que no es de día se conserva como descriptor.
+        """
+        if columnas_descriptores is None:
+            columnas_descriptores = [c for c in df.columns if c not in set(etiquetas)]
+        descriptores = df[columnas_descriptores]
+        presentes = [e for e in etiquetas if e in df.columns]
+        spots = np.zeros((len(df), len(etiquetas)), dtype=TIPO_SPOTS)
+        if presentes:
+            numeros, _ = matriz_numerica(df[presentes])
+            posicion = {e: i for i, e in enumerate(etiquetas)}
+            posiciones = [posicion[e] for e in presentes]
+            spots[:, posiciones] = np.clip(np.trunc(numeros), 0, np.iinfo(TIPO_SPOTS).max)
+        return cls(descriptores, fechas, spots)
+
+    @classmethod
+    def desde_registros(cls, descriptores: pd.DataFrame, fechas, registros: pd.DataFrame) -> "CalendarioSpots":
+        """Reconstruye el calendario desde registros largos (FILA, FECHA, SPOTS) como los de registros()."""
+        calendario = cls(descriptores, fechas)
+        if not registros.empty:
+            columnas = calendario.fechas.get_indexer(pd.to_datetime(registros["FECHA"]).dt.normalize())
+            dentro = columnas >= 0
+            calendario.spots[registros["FILA"].to_numpy()[dentro], columnas[dentro]] = (
+                registros["SPOTS"].to_numpy()[dentro]
+            )
+        return calendario
+
+    def seleccionar(self, filas) -> "CalendarioSpots":
+        """Calendario sólo con las filas indicadas (máscara booleana o posiciones)."""
+        filas = np.asarray(filas)
+        return CalendarioSpots(self.descriptores.iloc[filas], self.fechas, self.spots[filas])
+
+    def reindexar(self, fechas) -> "CalendarioSpots":
+        """
+        Mueve los spots al nuevo rango de fechas: cada conteo conserva su fecha,
+        los días nuevos quedan en 0 y los que quedan fuera del rango se descartan.
+        """
+        nuevas = _normalizar_fechas(fechas)
+        posiciones = nuevas.get_indexer(self.fechas)
+        dentro = posiciones >= 0
+        spots = np.zeros((len(self.descriptores), len(nuevas)), dtype=TIPO_SPOTS)
+        spots[:, posiciones[dentro]] = self.spots[:, dentro]
+        return CalendarioSpots(self.descriptores, nuevas, spots)
+
+    def a_grid_ancho(self, etiquetas: list = None, columnas: list = None) -> pd.DataFrame:
+        """Vista ancha para st.data_editor: descriptores seguidos de una columna por día."""
+        etiquetas = etiquetas or etiquetas_dias(self.fechas)
+        dias = pd.DataFrame(self.spots.astype("int64"), columns=etiquetas, index=self.descriptores.index)
+        ancho = pd.concat([self.descriptores, dias], axis=1)
+        return ancho[columnas] if columnas else ancho
+
+    def registros(self) -> pd.DataFrame:
+        """Forma dispersa: sólo las celdas con spots, como (FILA, FECHA, SPOTS)."""
+        filas, columnas = np.nonzero(self.spots)
+        return pd.DataFrame({
+            "FILA": filas,
+            "FECHA": self.fechas[columnas],
+            "SPOTS": self.spots[filas, columnas],
+        })
+
+    def impactos(self) -> np.ndarray:
+        """TOTAL IMPACTOS por fila."""
+        return self.spots.sum(axis=1, dtype=np.int64)
+
+    def por_dia(self) -> pd.Series:
+        """Spots totales por fecha."""
+        return pd.Series(self.spots.sum(axis=0, dtype=np.int64), index=self.fechas)
+
+    @property
+    def densidad(self) -> float:
+        return float(np.count_nonzero(self.spots)) / self.spots.size if self.spots.size else 0.0
+
+    @property
+    def memoria_bytes(self) -> int:
+        return int(self.spots.nbytes + self.descriptores.memory_usage(deep=True).sum())
+
+
+def spots_por_dia(calendarios) -> pd.Series:
+    """Suma por fecha de varios calendarios (p. ej. todas las pautas de un periodo)."""
+    series = [c.por_dia() for c in calendarios]
+    if not series:
+        return pd.Series(dtype="int64")
+    return pd.concat(series).groupby(level=0).sum().sort_index()
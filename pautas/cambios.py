@@ -0,0 +1,260 @@
+import uuid
+from datetime import date, datetime
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from pautas.calendario import CalendarioSpots
+from pautas.convenios import movimientos_convenio, sentencia_saldos
+from pautas.edicion import PautaGuardada
+from pautas.persistencia import (
+    COLUMNAS_PAUTA, _cargar_temporal, filas_capturadas, tabla_materiales, tablas_transmision,
+)
+
+# Columna oculta del editor con el FILA guardado de cada renglón (vacía en los renglones nuevos)
+COLUMNA_FILA = "FILA"
+# Hasta este número de filas el cambio viaja como VALUES en la misma sentencia; más allá
+# se carga a una tabla temporal (write_pandas cuesta un PUT + COPY aunque sean pocas filas)
+MAX_FILAS_EN_LINEA = 500
+COLUMNAS_NUMERICAS = {"TOTAL_IMPACTOS", "SUBTOTAL", "IVA", "TOTAL"}
+
+
+class ConflictoVersion(RuntimeError):
+    """Otra persona guardó la pauta después de que se cargó; los cambios no se aplicaron."""
+
+
+class CambiosPauta(NamedTuple):
+    # Columnas del encabezado que cambiaron -> valor nuevo
+    encabezado: dict
+    # Renglones nuevos o modificados de PAUTA_TRANSMISIONES (fila completa)
+    transmisiones: pd.DataFrame
+    # FILA de los renglones borrados
+    filas_borradas: list
+    # (FILA, FECHA, SPOTS) de las celdas cambiadas; SPOTS = 0 borra la celda
+    spots: pd.DataFrame
+    # Lista completa de materiales si cambió, None si no
+    materiales: list
+    # Celdas de descriptores modificadas (sólo para informar)
+    celdas: int
+    # Cambio en el consumo de cada convenio afectado (movimientos_convenio)
+    convenios: pd.DataFrame
+
+    @property
+    def vacio(self) -> bool:
+        return not (self.encabezado or len(self.transmisiones) or self.filas_borradas
+                    or len(self.spots) or self.materiales is not None)
+
+    def resumen(self) -> str:
+        partes = []
+        if self.encabezado:
+            partes.append(f"{len(self.encabezado)} campos del encabezado")
+        if len(self.transmisiones) or self.filas_borradas:
+            partes.append(f"{len(self.transmisiones)} renglones nuevos o modificados ({self.celdas} celdas), "
+                          f"{len(self.filas_borradas)} borrados")
+        if len(self.spots):
+            partes.append(f"{len(self.spots)} días con spots")
+        if self.materiales is not None:
+            partes.append("materiales")
+        return ", ".join(partes) or "sin cambios"
+
+
+def _normalizar(columna: str, valor):
+    if valor is None or valor is pd.NA or (isinstance(valor, float) and np.isnan(valor)):
+        return None
+    if columna in COLUMNAS_NUMERICAS:
+        return round(float(valor), 2)
+    if isinstance(valor, (datetime, pd.Timestamp)):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    texto = str(valor).strip()
+    return texto or None
+
+
+def cambios_encabezado(original: dict, editado: dict) -> dict:
+    """Columnas de PAUTAS cuyo valor editado difiere del cargado."""
+    return {
+        columna: valor for columna, valor in editado.items()
+        if columna in COLUMNAS_PAUTA and _normalizar(columna, valor) != _normalizar(columna, original.get(columna))
+    }
+
+
+def numeros_fila(calendario: CalendarioSpots, siguiente: int) -> np.ndarray:
+    """FILA de cada renglón del editor; los renglones nuevos reciben números a partir de siguiente."""
+    if COLUMNA_FILA not in calendario.descriptores:
+        return np.arange(siguiente, siguiente + len(calendario.descriptores))
+    filas = pd.to_numeric(calendario.descriptores[COLUMNA_FILA], errors="coerce").to_numpy(dtype=float, copy=True)
+    nuevos = np.isnan(filas)
+    filas[nuevos] = np.arange(siguiente, siguiente + int(nuevos.sum()))
+    return filas.astype(np.int64)
+
+
+def _diferencias(original: pd.DataFrame, editado: pd.DataFrame) -> pd.DataFrame:
+    """Máscara celda por celda (mismos índice y columnas) de valores distintos; dos vacíos son iguales."""
+    vacios = original.isna() & editado.isna()
+    return (original.ne(editado) & ~vacios).fillna(True)
+
+
+def calcular_cambios(pauta: PautaGuardada, encabezado: dict, calendario: CalendarioSpots,
+                     materiales: list) -> CambiosPauta:
+    """
+    Compara lo editado con la versión cargada y devuelve sólo lo que cambió: campos del
+    encabezado, renglones nuevos/modificados/borrados y celdas de spots. Todo es por columnas
+    (sin recorrer celdas), así que el costo crece con la pauta una vez en memoria y el guardado
+    con el tamaño del cambio.
+    """
+    folio = pauta.folio
+    originales = numeros_fila(pauta.calendario, 0)
+    siguiente = int(originales.max()) + 1 if len(originales) else 0
+
+    capturado = filas_capturadas(calendario)
+    filas_antes, spots_antes = tablas_transmision(folio, pauta.calendario, originales)
+    filas_despues, spots_despues = tablas_transmision(folio, capturado, numeros_fila(capturado, siguiente))
+    filas_antes = filas_antes.set_index("FILA")
+    filas_despues = filas_despues.set_index("FILA")
+
+    borradas = filas_antes.index.difference(filas_despues.index)
+    nuevas = filas_despues.index.difference(filas_antes.index)
+    comunes = filas_despues.index.intersection(filas_antes.index)
+    columnas = [c for c in filas_despues.columns if c != "FOLIO_INTERNO"]
+    distintas = _diferencias(filas_antes.loc[comunes, columnas], filas_despues.loc[comunes, columnas])
+    modificadas = comunes[distintas.any(axis=1).to_numpy()]
+    transmisiones = filas_despues.loc[nuevas.append(modificadas)].reset_index()
+
+    # Celdas de spots: unión de ambas formas dispersas; un día que desaparece queda en 0
+    llave = ["FILA", "FECHA"]
+    unidos = spots_antes[llave + ["SPOTS"]].merge(
+        spots_despues[llave + ["SPOTS"]], on=llave, how="outer", suffixes=("_ANTES", "")
+    ).fillna({"SPOTS_ANTES": 0, "SPOTS": 0})
+    spots = unidos.loc[unidos["SPOTS"] != unidos["SPOTS_ANTES"], llave + ["SPOTS"]]
+    spots = spots.astype({"FILA": "int64", "SPOTS": "int64"}).reset_index(drop=True)
+
+    tabla_antes = tabla_materiales(folio, pauta.materiales)
+    tabla_despues = tabla_materiales(folio, materiales)
+    iguales = tabla_antes.reset_index(drop=True).equals(tabla_despues.reset_index(drop=True))
+
+    return CambiosPauta(
+        cambios_encabezado(pauta.encabezado, encabezado),
+        transmisiones,
+        [int(f) for f in borradas],
+        spots,
+        None if iguales else list(materiales),
+        int(distintas.to_numpy().sum()) + len(nuevas) * len(columnas),
+        movimientos_convenio([pauta.encabezado], [{**pauta.encabezado, **encabezado}]),
+    )
+
+
+def _fuente(sesion, tabla: pd.DataFrame, temporal: str, cargadas: list) -> tuple:
+    """
+    Subconsulta con las filas del cambio para el USING del MERGE y sus parámetros.
+    Los cambios chicos van como VALUES en la misma sentencia; los grandes, por tabla temporal.
+    """
+    columnas = ", ".join(f'"{c}"' for c in tabla.columns)
+    if len(tabla) > MAX_FILAS_EN_LINEA:
+        cargadas.append(_cargar_temporal(sesion, tabla, temporal))
+        return f"SELECT {columnas} FROM {temporal}", []
+    renglon = f"({', '.join('?' for _ in tabla.columns)})"
+    valores = ", ".join(renglon for _ in range(len(tabla)))
+    parametros = [
+        None if v is None or v is pd.NA or (isinstance(v, float) and np.isnan(v))
+        else (v.item() if isinstance(v, np.generic) else v)
+        for fila in tabla.itertuples(index=False, name=None) for v in fila
+    ]
+    return f"SELECT * FROM (VALUES {valores}) AS V({columnas})", parametros
+
+
+def _merge_transmisiones(sesion, folio: str, cambios: CambiosPauta, temporal: str, cargadas: list) -> tuple:
+    """MERGE de los renglones nuevos, modificados (fila completa) y borrados de PAUTA_TRANSMISIONES."""
+    columnas = [c for c in cambios.transmisiones.columns if c not in ("FOLIO_INTERNO", "FILA")]
+    borradas = pd.DataFrame({"FILA": cambios.filas_borradas}).reindex(columns=["FILA"] + columnas)
+    tabla = pd.concat([
+        cambios.transmisiones.drop(columns="FOLIO_INTERNO").assign(BORRAR=False),
+        borradas.assign(BORRAR=True),
+    ], ignore_index=True)
+    tabla = tabla.astype(object).where(tabla.notna(), None)
+    fuente, parametros = _fuente(sesion, tabla, temporal, cargadas)
+    asignaciones = ", ".join(f'{c} = S."{c}"' for c in columnas)
+    valores = ", ".join(f'S."{c}"' for c in columnas)
+    sql = (
+        f"MERGE INTO PAUTA_TRANSMISIONES T USING ({fuente}) S "
+        'ON T.FOLIO_INTERNO = ? AND T.FILA = S."FILA" '
+        'WHEN MATCHED AND S."BORRAR" THEN DELETE '
+        f"WHEN MATCHED THEN UPDATE SET {asignaciones} "
+        f'WHEN NOT MATCHED AND NOT S."BORRAR" THEN INSERT (FOLIO_INTERNO, FILA, {", ".join(columnas)}) '
+        f'VALUES (?, S."FILA", {valores})'
+    )
+    return sql, parametros + [folio, folio]
+
+
+def _merge_spots(sesion, folio: str, cambios: CambiosPauta, temporal: str, cargadas: list) -> tuple:
+    """MERGE de las celdas de PAUTA_SPOTS que cambiaron; las que quedan en 0 se borran."""
+    fuente, parametros = _fuente(sesion, cambios.spots, temporal, cargadas)
+    sql = (
+        f"MERGE INTO PAUTA_SPOTS T USING ({fuente}) S "
+        'ON T.FOLIO_INTERNO = ? AND T.FILA = S."FILA" AND T.FECHA = S."FECHA" '
+        'WHEN MATCHED AND S."SPOTS" = 0 THEN DELETE '
+        'WHEN MATCHED THEN UPDATE SET SPOTS = S."SPOTS" '
+        'WHEN NOT MATCHED AND S."SPOTS" > 0 THEN INSERT (FOLIO_INTERNO, FILA, FECHA, SPOTS) '
+        'VALUES (?, S."FILA", S."FECHA", S."SPOTS")'
+    )
+    return sql, parametros + [folio, folio]
+
+
+def _insertar_materiales(sesion, folio: str, cambios: CambiosPauta, temporal: str, cargadas: list) -> tuple:
+    tabla = tabla_materiales(folio, cambios.materiales)
+    fuente, parametros = _fuente(sesion, tabla, temporal, cargadas)
+    lista = ", ".join(f'"{c}"' for c in tabla.columns)
+    return f"INSERT INTO PAUTA_MATERIALES ({lista}) {fuente}", parametros
+
+
+def aplicar_cambios(sesion, folio: str, version: int, cambios: CambiosPauta) -> int:
+    """
+    Aplica el cambio en una transacción: el UPDATE de PAUTAS sube la versión sólo si sigue
+    siendo la cargada (concurrencia optimista), cada tabla de detalle recibe un solo MERGE
+    con sus renglones cambiados y los saldos de CONVENIOS se ajustan por la diferencia.
+    Si otra persona guardó antes lanza ConflictoVersion y no toca nada. Devuelve la versión nueva.
+    """
+    sufijo = uuid.uuid4().hex[:12].upper()
+    cargadas = []
+    en_transaccion = False
+    try:
+        # Las fuentes grandes se cargan antes de abrir la transacción (crear la tabla temporal es DDL)
+        sentencias = []
+        if len(cambios.transmisiones) or cambios.filas_borradas:
+            sentencias.append(_merge_transmisiones(sesion, folio, cambios, f"TMP_CAMBIOS_TRANSMISIONES_{sufijo}", cargadas))
+        if len(cambios.spots):
+            sentencias.append(_merge_spots(sesion, folio, cambios, f"TMP_CAMBIOS_SPOTS_{sufijo}", cargadas))
+        if cambios.materiales is not None:
+            # Los materiales son pocos por pauta: se reemplaza la lista completa
+            sentencias.append(("DELETE FROM PAUTA_MATERIALES WHERE FOLIO_INTERNO = ?", [folio]))
+            if cambios.materiales:
+                sentencias.append(_insertar_materiales(sesion, folio, cambios, f"TMP_CAMBIOS_MATERIALES_{sufijo}", cargadas))
+        if not cambios.convenios.empty:
+            # El UPDATE de PAUTAS confirma que el encabezado guardado era el cargado: el ajuste es exacto
+            sentencias.append(sentencia_saldos(cambios.convenios))
+
+        sesion.sql("BEGIN TRANSACTION").collect()
+        en_transaccion = True
+        asignaciones = "".join(f", {columna} = ?" for columna in cambios.encabezado)
+        actualizadas = sesion.sql(
+            f"UPDATE PAUTAS SET VERSION = VERSION + 1{asignaciones} WHERE FOLIO_INTERNO = ? AND VERSION = ?",
+            params=list(cambios.encabezado.values()) + [folio, int(version)]
+        ).collect()
+        if not actualizadas or int(actualizadas[0][0]) == 0:
+            raise ConflictoVersion(
+                f"La pauta {folio} fue modificada por alguien más después de abrirla (versión {version}); "
+                "vuelve a abrirla para ver los cambios."
+            )
+        for sql, parametros in sentencias:
+            sesion.sql(sql, params=parametros).collect()
+        sesion.sql("COMMIT").collect()
+        en_transaccion = False
+    except Exception:
+        if en_transaccion:
+            sesion.sql("ROLLBACK").collect()
+        raise
+    finally:
+        for temporal in cargadas:
+            sesion.sql(f"DROP TABLE IF EXISTS {temporal}").collect()
+    return int(version) + 1
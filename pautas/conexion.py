@@ -0,0 +1,192 @@
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from pautas.medicion import medir
+
+logger = logging.getLogger(__name__)
+
+# Sesiones abiertas como máximo por contenedor (los nodos CPU_X64_XS tienen 0.5 CPU)
+MAX_SESIONES = int(os.getenv("SNOWFLAKE_MAX_SESIONES", "4"))
+# Segundos que una sesión puede estar inactiva antes de volver a probarla con SELECT 1
+PRUEBA_DESPUES_DE = 60
+# Segundos que se espera una sesión libre cuando todas están en uso
+ESPERA_MAXIMA = 30
+
+# Códigos de Snowflake de token/sesión expirada o inválida
+CODIGOS_SESION_EXPIRADA = {390111, 390112, 390114}
+
+
+def parametros_conexion() -> dict:
+    """Parámetros de conexión a Snowflake tomados de las variables de entorno (.env)."""
+    return {
+        "account": os.getenv("SNOWFLAKE_ACCOUNT"),
+        "user": os.getenv("SNOWFLAKE_USER"),
+        "password": os.getenv("SNOWFLAKE_PASSWORD"),
+        "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
+        "database": os.getenv("SNOWFLAKE_DATABASE"),
+        "schema": os.getenv("SNOWFLAKE_SCHEMA"),
+        "role": os.getenv("SNOWFLAKE_ROLE"),
+        # Mantiene vivo el token mientras la sesión está en el pool
+        "client_session_keep_alive": True
+    }
+
+
+def conexion_configurada() -> bool:
+    """True si hay cuenta y usuario de Snowflake configurados."""
+    parametros = parametros_conexion()
+    return bool(parametros["account"] and parametros["user"])
+
+
+def sesion_expirada(error: Exception) -> bool:
+    """True si el error indica que el token o la sesión de Snowflake ya no son válidos."""
+    for atributo in ("sql_error_code", "errno"):
+        # Algunos errores traen códigos no numéricos (p. ej. SQLSTATE); se ignoran sin ocultar el error original
+        codigo = str(getattr(error, atributo, None) or "").strip()
+        if codigo.isdigit() and int(codigo) in CODIGOS_SESION_EXPIRADA:
+            return True
+    mensaje = str(error).lower()
+    return "token has expired" in mensaje or "session no longer exists" in mensaje
+
+
+def _crear_sesion():
+    from snowflake.snowpark import Session
+    return Session.builder.configs(parametros_conexion()).create()
+
+
+class PoolSesiones:
+    """
+    Pool de sesiones de Snowpark compartido por todos los usuarios del proceso.
+    Limita las sesiones abiertas, prueba las que llevan tiempo inactivas antes de
+    entregarlas y reemplaza las que expiraron.
+    """
+
+    def __init__(self, crear=_crear_sesion, maximo: int = MAX_SESIONES,
+                 prueba_despues_de: float = PRUEBA_DESPUES_DE, espera_maxima: float = ESPERA_MAXIMA):
+        self._crear = crear
+        self.maximo = maximo
+        self.prueba_despues_de = prueba_despues_de
+        self.espera_maxima = espera_maxima
+        self._libres = deque()  # (sesion, último uso)
+        self._abiertas = 0
+        self._condicion = threading.Condition()
+
+    def _sana(self, sesion) -> bool:
+        try:
+            sesion.sql("SELECT 1").collect()
+            return True
+        except Exception as e:
+            logger.info("Sesión de Snowflake descartada: %s", e)
+            return False
+
+    def _cerrar(self, sesion):
+        try:
+            sesion.close()
+        except Exception:
+            pass
+
+    def tomar(self):
+        """Entrega una sesión sana; crea una nueva si hay cupo o espera a que se libere una."""
+        limite = time.monotonic() + self.espera_maxima
+        with self._condicion:
+            while True:
+                if self._libres:
+                    sesion, ultimo_uso = self._libres.pop()
+                    break
+                if self._abiertas < self.maximo:
+                    self._abiertas += 1
+                    sesion, ultimo_uso = None, None
+                    break
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    raise TimeoutError(f"No hay sesiones de Snowflake libres ({self.maximo} en uso)")
+                self._condicion.wait(restante)
+
+        # La prueba y la conexión se hacen fuera del candado para no bloquear a otros usuarios
+        try:
+            if sesion is not None and time.monotonic() - ultimo_uso > self.prueba_despues_de:
+                if not self._sana(sesion):
+                    self._cerrar(sesion)
+                    sesion = None
+            if sesion is None:
+                sesion = self._crear()
+        except Exception:
+            self._liberar_cupo()
+            raise
+        return sesion
+
+    def devolver(self, sesion, descartar: bool = False):
+        """Regresa la sesión al pool, o la cierra si quedó inservible."""
+        if descartar:
+            self._cerrar(sesion)
+            self._liberar_cupo()
+            return
+        with self._condicion:
+            self._libres.append((sesion, time.monotonic()))
+            self._condicion.notify()
+
+    def _liberar_cupo(self):
+        with self._condicion:
+            self._abiertas -= 1
+            self._condicion.notify()
+
+    @contextmanager
+    def sesion(self):
+        sesion = self.tomar()
+        descartar = False
+        try:
+            yield sesion
+        except Exception as e:
+            descartar = sesion_expirada(e)
+            raise
+        finally:
+            self.devolver(sesion, descartar)
+
+    def ejecutar(self, funcion):
+        """
+        Ejecuta funcion(sesion) con una sesión del pool. Si la sesión expiró a mitad
+        de la operación se reconecta y se reintenta una vez.
+        """
+        try:
+            with self.sesion() as sesion:
+                return funcion(sesion)
+        except Exception as e:
+            if not sesion_expirada(e):
+                raise
+            logger.info("Sesión de Snowflake expirada; reconectando")
+            with self.sesion() as sesion:
+                return funcion(sesion)
+
+    def cerrar_todas(self):
+        with self._condicion:
+            libres, self._libres = list(self._libres), deque()
+            self._abiertas -= len(libres)
+        for sesion, _ in libres:
+            self._cerrar(sesion)
+
+
+_pool = None
+_candado = threading.Lock()
+
+
+def obtener_pool() -> PoolSesiones:
+    """Pool único del proceso, compartido entre sesiones de Streamlit."""
+    global _pool
+    with _candado:
+        if _pool is None:
+            _pool = PoolSesiones()
+        return _pool
+
+
+def sesion_snowflake():
+    """Context manager con una sesión del pool: `with sesion_snowflake() as sesion: ...`"""
+    return obtener_pool().sesion()
+
+
+def ejecutar(funcion):
+    """Atajo de obtener_pool().ejecutar(funcion)."""
+    with medir("snowflake"):
+        return obtener_pool().ejecutar(funcion)
@@ -0,0 +1,206 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Segundos que se reutilizan los saldos antes de volver a leer CONVENIOS
+TTL_CONVENIOS = 120
+# Estatus OTC que todavía no consumen el convenio
+ESTATUS_SIN_CONSUMO = ("BORRADOR",)
+
+# Columna mostrada en el listado -> columna de la tabla CONVENIOS
+COLUMNAS_CONVENIO = {
+    "CONVENIO": "NOMBRE_CONVENIO",
+    "TIPO CONVENIO": "TIPO_CONVENIO",
+    "CLIENTE": "CLIENTE",
+    "MONEDA": "MONEDA",
+    "CONTRATADO": "MONTO_CONTRATADO",
+    "CONSUMIDO": "MONTO_CONSUMIDO",
+    "PAUTAS": "PAUTAS",
+    "ACTUALIZADO": "ACTUALIZADO",
+}
+
+# Los saldos ya están acumulados en la tabla: leerla no depende de cuántas pautas existan
+CONSULTA_CONVENIOS = f"SELECT {', '.join(COLUMNAS_CONVENIO.values())} FROM CONVENIOS"
+
+COLUMNAS_MOVIMIENTO = ["NOMBRE_CONVENIO", "TIPO_CONVENIO", "CLIENTE", "MONEDA", "MONTO", "PAUTAS"]
+
+# Datos de ejemplo para trabajar sin conexión a Snowflake
+CONVENIOS_EJEMPLO = {
+    "NOMBRE_CONVENIO": ["POLLO LOCO 2025", "OCHOA FA 2025"],
+    "TIPO_CONVENIO": ["EFECTIVO", "FACTURACION ANTICIPADA"],
+    "CLIENTE": ["POLLO LOCO", "POLLOS ASADOS OCHOA"],
+    "MONEDA": ["MN", "MN"],
+    "MONTO_CONTRATADO": [150000.0, 100000.0],
+    "MONTO_CONSUMIDO": [102000.0, 100000.0],
+    "PAUTAS": [2, 1],
+    "ACTUALIZADO": [pd.Timestamp("2025-07-24"), pd.Timestamp("2025-07-16")],
+}
+
+
+def nombre_convenio(valor) -> str:
+    """Llave del convenio: el nombre capturado sin espacios de más y en mayúsculas."""
+    if valor is None or valor is pd.NA or (isinstance(valor, float) and np.isnan(valor)):
+        return ""
+    return " ".join(str(valor).split()).upper()
+
+
+def consume_convenio(encabezado: dict) -> bool:
+    return bool(nombre_convenio(encabezado.get("NOMBRE_CONVENIO"))) and \
+        (encabezado.get("ESTATUS_OTC") or "") not in ESTATUS_SIN_CONSUMO
+
+
+def _monto(valor) -> float:
+    monto = pd.to_numeric(pd.Series([valor]), errors="coerce").iloc[0]
+    return 0.0 if pd.isna(monto) else round(float(monto), 2)
+
+
+def movimientos_convenio(antes: list, despues: list) -> pd.DataFrame:
+    """
+    Cambio en el consumo de cada convenio al pasar de los encabezados antes a despues:
+    las pautas de antes que consumían se restan y las de despues se suman. Así un envío es
+    ([], [nuevo]) y una edición ([guardado], [editado]), aunque cambie el convenio o el TOTAL.
+    Devuelve una fila por convenio afectado (COLUMNAS_MOVIMIENTO).
+    """
+    filas = [
+        (nombre_convenio(e.get("NOMBRE_CONVENIO")), e.get("TIPO_CONVENIO"), e.get("CLIENTE"), e.get("MONEDA"),
+         signo * _monto(e.get("TOTAL")), signo)
+        for signo, encabezados in ((-1, antes), (1, despues))
+        for e in encabezados if consume_convenio(e)
+    ]
+    movimientos = pd.DataFrame(filas, columns=COLUMNAS_MOVIMIENTO)
+    if movimientos.empty:
+        return movimientos
+    # Tipo, cliente y moneda se toman del último encabezado (el editado sobre el guardado)
+    movimientos = movimientos.groupby("NOMBRE_CONVENIO", sort=False).agg({
+        "TIPO_CONVENIO": "last", "CLIENTE": "last", "MONEDA": "last", "MONTO": "sum", "PAUTAS": "sum",
+    }).reset_index()
+    movimientos["MONTO"] = movimientos["MONTO"].round(2)
+    return movimientos[(movimientos["MONTO"] != 0) | (movimientos["PAUTAS"] != 0)].reset_index(drop=True)
+
+
+def sentencia_saldos(movimientos: pd.DataFrame) -> tuple:
+    """
+    MERGE que suma los movimientos a los totales acumulados de CONVENIOS (para correr dentro de la
+    transacción que guarda la pauta). Un convenio que no existe se crea sin monto contratado.
+    """
+    renglon = f"({', '.join('?' for _ in COLUMNAS_MOVIMIENTO)})"
+    valores = ", ".join(renglon for _ in range(len(movimientos)))
+    parametros = [
+        None if v is None or v is pd.NA or (isinstance(v, float) and np.isnan(v))
+        else (v.item() if isinstance(v, np.generic) else v)
+        for fila in movimientos[COLUMNAS_MOVIMIENTO].itertuples(index=False, name=None) for v in fila
+    ]
+    sql = (
+        f"MERGE INTO CONVENIOS C USING (SELECT * FROM (VALUES {valores}) AS M({', '.join(COLUMNAS_MOVIMIENTO)})) M "
+        "ON C.NOMBRE_CONVENIO = M.NOMBRE_CONVENIO "
+        "WHEN MATCHED THEN UPDATE SET MONTO_CONSUMIDO = C.MONTO_CONSUMIDO + M.MONTO, "
+        "PAUTAS = C.PAUTAS + M.PAUTAS, ACTUALIZADO = CURRENT_TIMESTAMP() "
+        "WHEN NOT MATCHED THEN INSERT (NOMBRE_CONVENIO, TIPO_CONVENIO, CLIENTE, MONEDA, MONTO_CONSUMIDO, PAUTAS, ACTUALIZADO) "
+        "VALUES (M.NOMBRE_CONVENIO, M.TIPO_CONVENIO, M.CLIENTE, M.MONEDA, M.MONTO, M.PAUTAS, CURRENT_TIMESTAMP())"
+    )
+    return sql, parametros
+
+
+def consultar_convenios(sesion) -> pd.DataFrame:
+    return sesion.sql(CONSULTA_CONVENIOS).to_pandas()
+
+
+def convenios_ejemplo() -> pd.DataFrame:
+    return pd.DataFrame(CONVENIOS_EJEMPLO)
+
+
+def registrar_convenio(sesion, nombre: str, tipo: str, cliente: str, moneda: str, contratado: float):
+    """Alta o actualización del monto contratado de un convenio; lo consumido no se toca."""
+    sesion.sql(
+        "MERGE INTO CONVENIOS C USING (SELECT ? AS NOMBRE_CONVENIO) M ON C.NOMBRE_CONVENIO = M.NOMBRE_CONVENIO "
+        "WHEN MATCHED THEN UPDATE SET TIPO_CONVENIO = ?, CLIENTE = ?, MONEDA = ?, MONTO_CONTRATADO = ?, "
+        "ACTUALIZADO = CURRENT_TIMESTAMP() "
+        "WHEN NOT MATCHED THEN INSERT (NOMBRE_CONVENIO, TIPO_CONVENIO, CLIENTE, MONEDA, MONTO_CONTRATADO, "
+        "MONTO_CONSUMIDO, PAUTAS, ACTUALIZADO) VALUES (M.NOMBRE_CONVENIO, ?, ?, ?, ?, 0, 0, CURRENT_TIMESTAMP())",
+        params=[nombre_convenio(nombre)] + [tipo, cliente, moneda, float(contratado)] * 2
+    ).collect()
+
+
+def tabla_convenios(saldos: pd.DataFrame) -> pd.DataFrame:
+    """Listado para mostrar: columnas de COLUMNAS_CONVENIO más RESTANTE y % CONSUMIDO."""
+    tabla = saldos.rename(columns={v: k for k, v in COLUMNAS_CONVENIO.items()})
+    contratado = pd.to_numeric(tabla["CONTRATADO"], errors="coerce")
+    consumido = pd.to_numeric(tabla["CONSUMIDO"], errors="coerce").fillna(0)
+    tabla["RESTANTE"] = contratado - consumido
+    tabla["% CONSUMIDO"] = (consumido / contratado.where(contratado > 0)).round(4)
+    orden = ["CONVENIO", "TIPO CONVENIO", "CLIENTE", "MONEDA", "CONTRATADO", "CONSUMIDO", "RESTANTE",
+             "% CONSUMIDO", "PAUTAS", "ACTUALIZADO"]
+    return tabla[orden].sort_values("CONVENIO").reset_index(drop=True)
+
+
+class SaldosConvenios:
+    """
+    Saldos de los convenios leídos de CONVENIOS, donde cada guardado ya deja los totales
+    acumulados. Se reutilizan durante TTL y lo que se guarda desde este proceso se suma
+    al momento, sin volver a consultar.
+    """
+
+    def __init__(self, ttl: float = TTL_CONVENIOS):
+        self.ttl = ttl
+        self._saldos = None  # DataFrame indexado por NOMBRE_CONVENIO
+        self._expira = 0.0
+        self._candado = threading.Lock()
+
+    def obtener(self, consultar) -> pd.DataFrame:
+        """Saldos vigentes; llama consultar() -> DataFrame de CONVENIOS sólo si expiraron."""
+        with self._candado:
+            if self._saldos is None or self._expira <= time.monotonic():
+                saldos = consultar().copy()
+                saldos["NOMBRE_CONVENIO"] = saldos["NOMBRE_CONVENIO"].map(nombre_convenio)
+                self._saldos = saldos.set_index("NOMBRE_CONVENIO")
+                self._expira = time.monotonic() + self.ttl
+            return self._saldos.reset_index()
+
+    def aplicar(self, movimientos: pd.DataFrame):
+        """Suma movimientos_convenio(...) a los saldos en memoria (si ya están cargados)."""
+        with self._candado:
+            if self._saldos is None or movimientos.empty:
+                return
+            movimientos = movimientos.set_index("NOMBRE_CONVENIO")
+            nuevos = movimientos.index.difference(self._saldos.index)
+            if len(nuevos):
+                altas = movimientos.loc[nuevos, ["TIPO_CONVENIO", "CLIENTE", "MONEDA"]].assign(
+                    MONTO_CONTRATADO=np.nan, MONTO_CONSUMIDO=0.0, PAUTAS=0
+                )
+                self._saldos = pd.concat([self._saldos, altas])
+            indice = movimientos.index
+            self._saldos.loc[indice, "MONTO_CONSUMIDO"] = (
+                self._saldos.loc[indice, "MONTO_CONSUMIDO"].astype(float) + movimientos["MONTO"]
+            ).round(2)
+            self._saldos.loc[indice, "PAUTAS"] = self._saldos.loc[indice, "PAUTAS"].astype("int64") + movimientos["PAUTAS"]
+            self._saldos.loc[indice, "ACTUALIZADO"] = pd.Timestamp.now()
+
+    def invalidar(self):
+        with self._candado:
+            self._expira = 0.0
+
+
+def sobregiro(saldos: pd.DataFrame, encabezado: dict, anterior: dict = None):
+    """
+    (convenio, restante, monto de la pauta) si enviar la pauta deja el convenio con saldo
+    negativo; None si no tiene convenio, el convenio no tiene monto contratado o alcanza.
+    anterior es la versión guardada de la pauta (al editar), cuyo consumo ya está en el saldo.
+    """
+    nombre = nombre_convenio(encabezado.get("NOMBRE_CONVENIO"))
+    if not nombre:
+        return None
+    fila = saldos[saldos["NOMBRE_CONVENIO"] == nombre]
+    if fila.empty or pd.isna(fila["MONTO_CONTRATADO"].iloc[0]):
+        return None
+    adicional = _monto(encabezado.get("TOTAL"))
+    if anterior and consume_convenio(anterior) and nombre_convenio(anterior.get("NOMBRE_CONVENIO")) == nombre:
+        adicional -= _monto(anterior.get("TOTAL"))
+    restante = float(fila["MONTO_CONTRATADO"].iloc[0]) - float(fila["MONTO_CONSUMIDO"].iloc[0])
+    if adicional <= 0 or restante - adicional >= 0:
+        return None
+    return nombre, restante, adicional
+
+
+saldos_convenios = SaldosConvenios()
@@ -0,0 +1,189 @@
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+from pautas.materiales import hash_archivo
+
+# Bytes del inicio del MP3 en los que se busca la primera trama
+BUSQUEDA_MP3 = 64 * 1024
+# Duraciones recordadas por hash de contenido
+MAX_DURACIONES = 1024
+
+# kbps por índice de bitrate: (versión MPEG 1 o 2/2.5, capa)
+BITRATES_MP3 = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+# Hz por índice de frecuencia, según los bits de versión (3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5)
+FRECUENCIAS_MP3 = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+
+def _tamano(archivo) -> int:
+    archivo.seek(0, os.SEEK_END)
+    return archivo.tell()
+
+
+def duracion_wav(archivo) -> float:
+    """Duración de un WAV con los chunks fmt y data del encabezado RIFF."""
+    archivo.seek(0)
+    riff = archivo.read(12)
+    if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:12] != b"WAVE":
+        return None
+    bytes_por_segundo = None
+    while True:
+        chunk = archivo.read(8)
+        if len(chunk) < 8:
+            return None
+        nombre, tamano = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if nombre == b"fmt ":
+            fmt = archivo.read(16)
+            bytes_por_segundo = struct.unpack("<I", fmt[8:12])[0]
+            archivo.seek(tamano - 16 + (tamano & 1), os.SEEK_CUR)
+        elif nombre == b"data":
+            return tamano / bytes_por_segundo if bytes_por_segundo else None
+        else:
+            archivo.seek(tamano + (tamano & 1), os.SEEK_CUR)
+
+
+def _saltar_id3(archivo) -> int:
+    """Posición donde empieza el audio después de la etiqueta ID3v2 (si la hay)."""
+    archivo.seek(0)
+    cabecera = archivo.read(10)
+    if len(cabecera) < 10 or cabecera[:3] != b"ID3":
+        return 0
+    tamano = (cabecera[6] << 21) | (cabecera[7] << 14) | (cabecera[8] << 7) | cabecera[9]
+    pie = 10 if cabecera[5] & 0x10 else 0
+    return 10 + tamano + pie
+
+
+def duracion_mp3(archivo) -> float:
+    """
+    Duración de un MP3 con la cabecera Xing/Info o VBRI de la primera trama (VBR),
+    o con el bitrate de la primera trama y el tamaño del archivo (CBR).
+    """
+    inicio = _saltar_id3(archivo)
+    archivo.seek(inicio)
+    bloque = archivo.read(BUSQUEDA_MP3)
+    for i in range(len(bloque) - 4):
+        if bloque[i] != 0xFF or bloque[i + 1] & 0xE0 != 0xE0:
+            continue
+        b1, b2, b3 = bloque[i + 1], bloque[i + 2], bloque[i + 3]
+        bits_version, bits_capa = (b1 >> 3) & 3, (b1 >> 1) & 3
+        indice_bitrate, indice_frecuencia = b2 >> 4, (b2 >> 2) & 3
+        if bits_version == 1 or bits_capa == 0 or indice_bitrate in (0, 15) or indice_frecuencia == 3:
+            continue
+        version = 1 if bits_version == 3 else 2
+        capa = 4 - bits_capa
+        frecuencia = FRECUENCIAS_MP3[bits_version][indice_frecuencia]
+        bitrate = BITRATES_MP3[(version, capa)][indice_bitrate] * 1000
+        mono = (b3 >> 6) == 3
+        if capa == 1:
+            muestras = 384
+        elif capa == 2 or version == 1:
+            muestras = 1152
+        else:
+            muestras = 576
+
+        info_lateral = (17 if mono else 32) if version == 1 else (9 if mono else 17)
+        xing = i + 4 + info_lateral
+        if bloque[xing:xing + 4] in (b"Xing", b"Info"):
+            banderas = struct.unpack(">I", bloque[xing + 4:xing + 8])[0]
+            if banderas & 1:
+                tramas = struct.unpack(">I", bloque[xing + 8:xing + 12])[0]
+                return tramas * muestras / frecuencia
+        vbri = i + 36
+        if bloque[vbri:vbri + 4] == b"VBRI":
+            tramas = struct.unpack(">I", bloque[vbri + 14:vbri + 18])[0]
+            return tramas * muestras / frecuencia
+
+        fin = _tamano(archivo)
+        archivo.seek(fin - 128)
+        if archivo.read(3) == b"TAG":
+            fin -= 128
+        return (fin - inicio - i) * 8 / bitrate
+    return None
+
+
+def duracion_mp4(archivo) -> float:
+    """Duración de un MP4/MOV con el átomo mvhd; salta mdat y demás átomos sin leerlos."""
+    fin = _tamano(archivo)
+    posicion, limite = 0, fin
+    while posicion + 8 <= limite:
+        archivo.seek(posicion)
+        cabecera = archivo.read(8)
+        tamano, tipo = struct.unpack(">I4s", cabecera)
+        encabezado = 8
+        if tamano == 1:
+            tamano = struct.unpack(">Q", archivo.read(8))[0]
+            encabezado = 16
+        elif tamano == 0:
+            tamano = limite - posicion
+        if tamano < encabezado:
+            return None
+        if tipo == b"moov":
+            # Se entra al átomo moov y se recorren sus hijos
+            posicion, limite = posicion + encabezado, posicion + tamano
+            continue
+        if tipo == b"mvhd":
+            version = archivo.read(1)[0]
+            archivo.seek(3, os.SEEK_CUR)
+            if version == 1:
+                _, _, escala, duracion = struct.unpack(">QQIQ", archivo.read(28))
+            else:
+                _, _, escala, duracion = struct.unpack(">IIII", archivo.read(16))
+            return duracion / escala if escala else None
+        posicion += tamano
+    return None
+
+
+PROBADORES = {".wav": duracion_wav, ".mp3": duracion_mp3, ".mp4": duracion_mp4}
+
+
+class CacheDuraciones:
+    """Duraciones ya calculadas, por hash de contenido (el mismo spot subido dos veces no se vuelve a leer)."""
+
+    def __init__(self, maximo: int = MAX_DURACIONES):
+        self.maximo = maximo
+        self._valores = OrderedDict()
+        self._candado = threading.Lock()
+
+    def obtener(self, digest: str, calcular):
+        with self._candado:
+            if digest in self._valores:
+                self._valores.move_to_end(digest)
+                return self._valores[digest]
+        valor = calcular()
+        with self._candado:
+            self._valores[digest] = valor
+            if len(self._valores) > self.maximo:
+                self._valores.popitem(last=False)
+        return valor
+
+
+cache_duraciones = CacheDuraciones()
+
+
+def duracion_segundos(archivo, nombre: str = None, digest: str = None) -> float:
+    """
+    Duración en segundos leyendo sólo los encabezados del archivo (sin decodificar).
+    Devuelve None si el formato no tiene duración (pdf) o el encabezado no se reconoce.
+    """
+    nombre = nombre or archivo.name
+    probador = PROBADORES.get(os.path.splitext(nombre)[1].lower())
+    if probador is None:
+        return None
+
+    def calcular():
+        try:
+            return probador(archivo)
+        except (struct.error, IndexError, ValueError, ZeroDivisionError, OSError):
+            return None
+        finally:
+            archivo.seek(0)
+
+    return cache_duraciones.obtener(digest or hash_archivo(archivo), calcular)
@@ -0,0 +1,145 @@
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import pandas as pd
+
+from pautas.calendario import COLUMNAS_INICIALES, FILA_EJEMPLO, CalendarioSpots, construir_calendario
+from pautas.listado import DATOS_EJEMPLO
+from pautas.persistencia import COLUMNAS_MATERIAL, COLUMNAS_PAUTA, COLUMNAS_TRANSMISION
+
+# Pautas cargadas que se recuerdan en el proceso (cada una pesa lo que su matriz de spots)
+MAX_PAUTAS = 32
+
+
+class PautaGuardada(NamedTuple):
+    folio: str
+    version: int
+    encabezado: dict
+    calendario: CalendarioSpots
+    materiales: list
+
+
+def _encabezado(fila: dict) -> dict:
+    encabezado = {columna: fila.get(columna) for columna in COLUMNAS_PAUTA}
+    for columna in ("INICIO_CAMPANA", "FIN_CAMPANA"):
+        if encabezado[columna] is not None:
+            encabezado[columna] = pd.Timestamp(encabezado[columna]).date()
+    encabezado["FECHA_CAPTURA"] = fila.get("FECHA_CAPTURA")
+    return encabezado
+
+
+def _armar_pauta(folio: str, version: int, encabezado: dict, transmisiones: pd.DataFrame,
+                 spots: pd.DataFrame, materiales: pd.DataFrame) -> PautaGuardada:
+    """Reconstruye el calendario (fechas de la campaña) y los materiales a partir de las filas leídas."""
+    rango = construir_calendario(encabezado["INICIO_CAMPANA"], encabezado["FIN_CAMPANA"])
+    descriptores = transmisiones.sort_values("FILA")
+    posiciones = pd.Index(descriptores["FILA"]).get_indexer(spots["FILA"])
+    registros = spots.assign(FILA=posiciones)[posiciones >= 0]
+    descriptores = descriptores.rename(columns={v: k for k, v in COLUMNAS_TRANSMISION.items()})
+    # FILA viaja como descriptor (oculto en el editor) para saber qué renglón se modificó o borró
+    calendario = CalendarioSpots.desde_registros(
+        descriptores.reindex(columns=COLUMNAS_INICIALES + ["FILA"]), rango.fechas, registros
+    )
+    materiales = materiales.rename(columns={v: k for k, v in COLUMNAS_MATERIAL.items()})
+    return PautaGuardada(folio, int(version), encabezado, calendario, materiales.to_dict("records"))
+
+
+def cargar_pauta(sesion, folio: str) -> PautaGuardada:
+    """Encabezado, transmisiones, spots y materiales de un folio, con la versión de su encabezado."""
+    columnas = ", ".join(["VERSION", "FECHA_CAPTURA"] + COLUMNAS_PAUTA)
+    filas = sesion.sql(f"SELECT {columnas} FROM PAUTAS WHERE FOLIO_INTERNO = ?", params=[folio]).collect()
+    if not filas:
+        raise KeyError(f"No existe la pauta {folio}")
+    fila = filas[0].as_dict()
+
+    transmisiones = sesion.sql(
+        f"SELECT FILA, {', '.join(COLUMNAS_TRANSMISION.values())} FROM PAUTA_TRANSMISIONES WHERE FOLIO_INTERNO = ?",
+        params=[folio]
+    ).to_pandas()
+    spots = sesion.sql(
+        "SELECT FILA, FECHA, SPOTS FROM PAUTA_SPOTS WHERE FOLIO_INTERNO = ?", params=[folio]
+    ).to_pandas()
+    materiales = sesion.sql(
+        f"SELECT {', '.join(COLUMNAS_MATERIAL.values())} FROM PAUTA_MATERIALES WHERE FOLIO_INTERNO = ?",
+        params=[folio]
+    ).to_pandas()
+    return _armar_pauta(folio, fila["VERSION"], _encabezado(fila), transmisiones, spots, materiales)
+
+
+def pauta_ejemplo(folio: str) -> PautaGuardada:
+    """Pauta del folio tomada de DATOS_EJEMPLO, con una fila de FILA_EJEMPLO (sin Snowflake)."""
+    ejemplo = pd.DataFrame(DATOS_EJEMPLO)
+    encontradas = ejemplo[ejemplo["FOLIO INTERNO"] == folio]
+    if encontradas.empty:
+        raise KeyError(f"No existe la pauta {folio}")
+    fila = encontradas.iloc[0]
+    encabezado = _encabezado({
+        "CLIENTE": fila["CLIENTE"],
+        "AGENCIA": fila["AGENCIA"],
+        "TIPO_CONVENIO": fila["TIPO CONVENIO"],
+        "CAMPANA": fila["CAMPAÑA"],
+        "INICIO_CAMPANA": fila["INICIO CAMPAÑA"],
+        "FIN_CAMPANA": fila["FIN CAMPAÑA"],
+        "EJECUTIVO": fila["EJECUTIVO"],
+        "FACTURAR_A": fila["CLIENTE"],
+        "PLAZA_VENTA": fila["PLAZA VENTA"],
+        "TOTAL": float(fila["TOTAL"]),
+        "MONEDA": fila["MONEDA"],
+        "ESTATUS_CAMPANA": fila["ESTATUS CAMPAÑA"],
+        "ESTATUS_OTC": fila["ESTATUS OTC"],
+        "FECHA_CAPTURA": fila["FECHA CAPTURA"],
+    })
+    transmisiones = pd.DataFrame([FILA_EJEMPLO]).rename(columns=COLUMNAS_TRANSMISION)
+    transmisiones.insert(0, "FILA", 0)
+    spots = pd.DataFrame({"FILA": [], "FECHA": [], "SPOTS": []})
+    return _armar_pauta(folio, fila["VERSION"], encabezado, transmisiones, spots,
+                        pd.DataFrame(columns=list(COLUMNAS_MATERIAL.values())))
+
+
+class CachePautas:
+    """
+    Pautas cargadas por (folio, versión). Si la precarga de un folio sigue en curso cuando se
+    abre la edición, se espera a esa misma carga en lugar de lanzar otra. Una versión nueva
+    de un folio reemplaza a las anteriores.
+    """
+
+    def __init__(self, maximo: int = MAX_PAUTAS):
+        self.maximo = maximo
+        self._valores = OrderedDict()  # (folio, versión) -> PautaGuardada
+        self._candados = {}
+        self._candado = threading.Lock()
+
+    def _candado_folio(self, folio: str) -> threading.Lock:
+        with self._candado:
+            return self._candados.setdefault(folio, threading.Lock())
+
+    def obtener(self, folio: str, version: int, cargar) -> PautaGuardada:
+        """Pauta del folio en esa versión; llama cargar(folio) sólo si no está en memoria."""
+        llave = (folio, int(version))
+        with self._candado_folio(folio):
+            with self._candado:
+                if llave in self._valores:
+                    self._valores.move_to_end(llave)
+                    return self._valores[llave]
+            pauta = cargar(folio)
+            with self._candado:
+                for anterior in [l for l in self._valores if l[0] == folio]:
+                    del self._valores[anterior]
+                self._valores[(folio, pauta.version)] = pauta
+                while len(self._valores) > self.maximo:
+                    self._valores.popitem(last=False)
+            return pauta
+
+    def contiene(self, folio: str, version: int) -> bool:
+        with self._candado:
+            return (folio, int(version)) in self._valores
+
+    def invalidar(self, folio: str):
+        """Descarta las versiones del folio en memoria (después de guardar cambios)."""
+        with self._candado:
+            for llave in [l for l in self._valores if l[0] == folio]:
+                del self._valores[llave]
+
+
+cache_pautas = CachePautas()
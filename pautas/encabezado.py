@@ -0,0 +1,137 @@
+import re
+import unicodedata
+
+import pandas as pd
+
+# Campo del formulario -> etiquetas con que aparece en los encabezados de las pautas.
+# Las etiquetas se comparan normalizadas (sin acentos, mayúsculas, sin ':' final).
+ALIAS_ENCABEZADO = {
+    "CLIENTE": ["CLIENTE", "CLIENTE / RAZON SOCIAL", "RAZON SOCIAL"],
+    "AGENCIA": ["AGENCIA"],
+    "MARCA": ["MARCA"],
+    "TIPO CONVENIO": ["TIPO CONVENIO", "TIPO DE CONVENIO"],
+    "NOMBRE DEL CONVENIO": ["NOMBRE DEL CONVENIO", "NOMBRE CONVENIO"],
+    "ANUNCIA": ["ANUNCIA"],
+    "CAMPAÑA": ["CAMPAÑA", "NOMBRE CAMPAÑA"],
+    "INICIO CAMPAÑA": ["INICIO CAMPAÑA", "INICIO DE CAMPAÑA", "FECHA INICIO"],
+    "FIN CAMPAÑA": ["FIN CAMPAÑA", "FIN DE CAMPAÑA", "FECHA FIN"],
+    "NUMERO DE ORDEN": ["NUMERO DE ORDEN", "NO. DE ORDEN"],
+    "EJECUTIVO / VENDEDOR": ["AGENTE / EJECUTIVO", "EJECUTIVO / VENDEDOR", "EJECUTIVO", "VENDEDOR"],
+    "NOMBRE EVENTO": ["NOMBRE EVENTO", "NOMBRE DEL EVENTO"],
+    "FACTURAR A": ["FACTURAR A"],
+    "FIRMA PAGARE (SI / NO)": ["FIRMA PAGARE", "FIRMA PAGARE (SI / NO)"],
+    "ES AGREGADO (SI / NO)": ["ES AGREGADO", "ES AGREGADO (SI / NO)"],
+    "ES CLIENTE NUEVO (SI/NO)": ["ES CLIENTE NUEVO", "ES CLIENTE NUEVO (SI / NO)"],
+}
+
+# Columna de PAUTAS -> campo del formulario de datos generales
+CAMPOS_PAUTA = {
+    "CLIENTE": "CLIENTE",
+    "AGENCIA": "AGENCIA",
+    "MARCA": "MARCA",
+    "TIPO_CONVENIO": "TIPO CONVENIO",
+    "NOMBRE_CONVENIO": "NOMBRE DEL CONVENIO",
+    "ANUNCIA": "ANUNCIA",
+    "CAMPANA": "CAMPAÑA",
+    "INICIO_CAMPANA": "INICIO CAMPAÑA",
+    "FIN_CAMPANA": "FIN CAMPAÑA",
+    "NUMERO_ORDEN": "NUMERO DE ORDEN",
+    "EJECUTIVO": "EJECUTIVO / VENDEDOR",
+    "NOMBRE_EVENTO": "NOMBRE EVENTO",
+    "FACTURAR_A": "FACTURAR A",
+    "ES_CLIENTE_NUEVO": "ES CLIENTE NUEVO (SI/NO)",
+    "ES_AGREGADO": "ES AGREGADO (SI / NO)",
+    "FIRMA_PAGARE": "FIRMA PAGARE (SI / NO)",
+}
+
+CAMPOS_FECHA = {"INICIO CAMPAÑA", "FIN CAMPAÑA"}
+CAMPOS_SI_NO = {"FIRMA PAGARE (SI / NO)", "ES AGREGADO (SI / NO)", "ES CLIENTE NUEVO (SI/NO)"}
+
+
+def normalizar_etiqueta(texto: str) -> str:
+    """Quita acentos, pasa a mayúsculas, colapsa espacios y elimina ':' finales."""
+    sin_acentos = "".join(
+        c for c in unicodedata.normalize("NFKD", str(texto)) if not unicodedata.combining(c)
+    )
+    return re.sub(r"\s+", " ", sin_acentos.upper()).strip().rstrip(":").strip()
+
+
+def indexar_encabezado(encabezado_df: pd.DataFrame) -> dict:
+    """
+    Recorre el bloque de encabezado una sola vez y construye un índice
+    etiqueta normalizada -> valor (la celda a la derecha de la etiqueta).
+    Si una etiqueta se repite se conserva la primera aparición.
+    """
+    indice = {}
+    for fila in encabezado_df.itertuples(index=False):
+        for i, celda in enumerate(fila):
+            if isinstance(celda, str) and celda.strip():
+                etiqueta = normalizar_etiqueta(celda)
+                if etiqueta not in indice:
+                    indice[etiqueta] = fila[i + 1] if i + 1 < len(fila) else None
+    return indice
+
+
+def _a_texto(valor) -> str:
+    if valor is None or (not isinstance(valor, str) and pd.isna(valor)):
+        return ""
+    if isinstance(valor, float) and valor.is_integer():
+        return str(int(valor))
+    return str(valor).strip()
+
+
+def _a_fecha(valor):
+    if valor is None or (isinstance(valor, str) and not valor.strip()):
+        return None
+    try:
+        fecha = pd.to_datetime(valor, dayfirst=True)
+    except (ValueError, TypeError):
+        return None
+    return None if pd.isna(fecha) else fecha
+
+
+# Lo que puede seguir al alias en una etiqueta con complemento: paréntesis o separador
+# (p. ej. "FIRMA PAGARE (SI/NO)", "CLIENTE - RAZON SOCIAL"), no otra palabra ("CLIENTE NUEVO")
+_COMPLEMENTO = re.compile(r"\s*[(/\-]")
+
+
+def _buscar(indice: dict, etiquetas: list):
+    # Búsqueda directa por alias; si ninguno coincide, se acepta una etiqueta que sea el alias
+    # seguido de un complemento
+    for etiqueta in etiquetas:
+        clave = normalizar_etiqueta(etiqueta)
+        if clave in indice:
+            return True, indice[clave]
+    for etiqueta in etiquetas:
+        clave = normalizar_etiqueta(etiqueta)
+        for existente, valor in indice.items():
+            if existente.startswith(clave) and _COMPLEMENTO.match(existente, len(clave)):
+                return True, valor
+    return False, None
+
+
+def extraer_datos_generales(encabezado_df: pd.DataFrame, alias: dict = None) -> dict:
+    """
+    Extrae los datos generales de la pauta con tipos ya convertidos:
+    fechas como Timestamp (dayfirst), SI/NO en mayúsculas y el resto como texto.
+    Sólo se devuelven los campos encontrados, para combinarlos con los valores por defecto.
+    """
+    alias = alias or ALIAS_ENCABEZADO
+    indice = indexar_encabezado(encabezado_df)
+
+    datos = {}
+    for campo, etiquetas in alias.items():
+        encontrado, valor = _buscar(indice, etiquetas)
+        if not encontrado:
+            continue
+        if campo in CAMPOS_FECHA:
+            fecha = _a_fecha(valor)
+            if fecha is not None:
+                datos[campo] = fecha
+        elif campo in CAMPOS_SI_NO:
+            texto = normalizar_etiqueta(_a_texto(valor))
+            if texto in ("SI", "NO"):
+                datos[campo] = texto
+        else:
+            datos[campo] = _a_texto(valor)
+    return datos
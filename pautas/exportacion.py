@@ -0,0 +1,225 @@
+from datetime import date, datetime
+from io import BytesIO
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from pautas.calendario import COLUMNAS_INICIALES, MESES_ES, CalendarioSpots, etiquetas_dias
+
+TITULO = "ORDEN / PAUTA DE TRANSMISIÓN RADIO"
+
+# Campos del encabezado (columnas de PAUTAS) en el orden del bloque de datos generales
+CAMPOS_ENCABEZADO = {
+    "CLIENTE": "CLIENTE",
+    "AGENCIA": "AGENCIA",
+    "MARCA": "MARCA",
+    "ANUNCIA": "ANUNCIA",
+    "CAMPANA": "CAMPAÑA",
+    "INICIO_CAMPANA": "INICIO CAMPAÑA",
+    "FIN_CAMPANA": "FIN CAMPAÑA",
+    "TIPO_CONVENIO": "TIPO DE CONVENIO",
+    "NOMBRE_CONVENIO": "NOMBRE CONVENIO",
+    "NUMERO_ORDEN": "NÚMERO DE ORDEN",
+    "EJECUTIVO": "EJECUTIVO / VENDEDOR",
+    "NOMBRE_EVENTO": "NOMBRE DEL EVENTO",
+    "FACTURAR_A": "FACTURAR A",
+    "ES_CLIENTE_NUEVO": "ES CLIENTE NUEVO",
+    "ES_AGREGADO": "ES AGREGADO",
+    "FIRMA_PAGARE": "FIRMA PAGARÉ",
+    "ESTATUS_OTC": "ESTATUS OTC",
+}
+
+# Columnas del grid que caben en el PDF horizontal (los días se agrupan por mes)
+COLUMNAS_PDF = {
+    "PLAZA TRANS": 18, "MEDIO": 18, "PROGRAMA": 30, "DURACION": 10, "VERSION": 18,
+    "HORA INICIO": 11, "HORA FIN": 11,
+}
+ANCHO_MES_PDF = 9
+ANCHO_TOTAL_PDF = 17
+
+# Filas entre cada reporte de avance
+FILAS_POR_AVANCE = 200
+
+
+class ArchivosPauta(NamedTuple):
+    nombre_xlsx: str
+    xlsx: bytes
+    nombre_pdf: str
+    pdf: bytes
+
+
+def _texto(valor) -> str:
+    if valor is None or (isinstance(valor, float) and np.isnan(valor)):
+        return ""
+    if isinstance(valor, (datetime, pd.Timestamp)):
+        return valor.strftime("%d/%m/%Y")
+    if isinstance(valor, date):
+        return valor.strftime("%d/%m/%Y")
+    return str(valor)
+
+
+def filas_encabezado(folio: str, encabezado: dict) -> list:
+    """Pares (etiqueta, valor) del bloque de datos generales."""
+    filas = [("FOLIO", folio)]
+    filas += [(etiqueta, _texto(encabezado.get(campo))) for campo, etiqueta in CAMPOS_ENCABEZADO.items()]
+    return filas
+
+
+def filas_resumen(encabezado: dict) -> list:
+    """Pares (concepto, valor numérico) del resumen financiero."""
+    tipo_iva = encabezado.get("TIPO_IVA", "")
+    return [
+        ("TOTAL IMPACTOS", int(encabezado.get("TOTAL_IMPACTOS") or 0)),
+        ("SUBTOTAL", float(encabezado.get("SUBTOTAL") or 0)),
+        (f"IVA ({tipo_iva})", "Exento" if tipo_iva == "Exento" else float(encabezado.get("IVA") or 0)),
+        (f"TOTAL ({encabezado.get('MONEDA', '')})", float(encabezado.get("TOTAL") or 0)),
+    ]
+
+
+def _valor_celda(valor):
+    """Valor nativo para openpyxl (sin tipos de numpy ni NaN)."""
+    if valor is None or valor is pd.NA or (isinstance(valor, float) and np.isnan(valor)):
+        return None
+    if isinstance(valor, np.generic):
+        return valor.item()
+    if isinstance(valor, pd.Timestamp):
+        return valor.to_pydatetime()
+    return valor
+
+
+def _sin_avance(progreso: float, mensaje: str = None):
+    pass
+
+
+def escribir_xlsx(folio: str, encabezado: dict, calendario: CalendarioSpots, avance=_sin_avance) -> bytes:
+    """
+    Libro con el bloque de encabezado, el grid de transmisiones (una columna por día)
+    y el resumen financiero. Usa el modo write_only de openpyxl: las filas se escriben
+    en streaming y la memoria no crece con el tamaño de la pauta.
+    avance(fracción) se llama cada FILAS_POR_AVANCE filas.
+    """
+    from openpyxl import Workbook
+
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet("Pauta")
+
+    hoja.append([TITULO])
+    for etiqueta, valor in filas_encabezado(folio, encabezado):
+        hoja.append([etiqueta, valor])
+    hoja.append([])
+
+    descriptores = calendario.descriptores.reindex(columns=COLUMNAS_INICIALES)
+    hoja.append([None] * len(COLUMNAS_INICIALES) + [f.strftime("%d/%m/%Y") for f in calendario.fechas])
+    hoja.append(COLUMNAS_INICIALES + etiquetas_dias(calendario.fechas))
+    total_filas = max(len(descriptores), 1)
+    for i, (fila, spots) in enumerate(zip(descriptores.itertuples(index=False, name=None), calendario.spots)):
+        if i % FILAS_POR_AVANCE == 0:
+            avance(i / total_filas)
+        # Los días sin spots se dejan vacíos, como en el formato original
+        dias = [int(s) if s else None for s in spots]
+        hoja.append([_valor_celda(v) for v in fila] + dias)
+    hoja.append([])
+
+    hoja.append(["RESUMEN"])
+    for concepto, valor in filas_resumen(encabezado):
+        hoja.append([concepto, valor])
+
+    salida = BytesIO()
+    libro.save(salida)
+    return salida.getvalue()
+
+
+def _latin1(texto: str) -> str:
+    """Las fuentes base del PDF sólo cubren latin-1 (acentos y Ñ sí; emojis no)."""
+    return texto.encode("latin-1", "replace").decode("latin-1")
+
+
+def spots_por_mes(calendario: CalendarioSpots) -> pd.DataFrame:
+    """Spots por fila y mes de campaña (columnas "AGO-25", ...), para el grid del PDF."""
+    meses = calendario.fechas.to_period("M")
+    unicos = meses.unique()
+    posiciones = unicos.get_indexer(meses)
+    totales = np.zeros((len(calendario.descriptores), len(unicos)), dtype=np.int64)
+    np.add.at(totales.T, posiciones, calendario.spots.T.astype(np.int64))
+    columnas = [f"{MESES_ES[p.month - 1]}-{p.year % 100:02d}" for p in unicos]
+    return pd.DataFrame(totales, columns=columnas, index=calendario.descriptores.index)
+
+
+def escribir_pdf(folio: str, encabezado: dict, calendario: CalendarioSpots, avance=_sin_avance) -> bytes:
+    """PDF horizontal con el mismo contenido del Excel; los spots diarios se agrupan por mes."""
+    from fpdf import FPDF
+
+    pdf = FPDF(orientation="L", unit="mm", format="A4")
+    pdf.set_auto_page_break(auto=True, margin=12)
+    pdf.add_page()
+
+    pdf.set_font("Helvetica", "B", 13)
+    pdf.cell(0, 8, _latin1(TITULO), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font("Helvetica", "", 8)
+    filas = filas_encabezado(folio, encabezado)
+    mitad = (len(filas) + 1) // 2
+    for izquierda, derecha in zip(filas[:mitad], filas[mitad:] + [("", "")]):
+        for etiqueta, valor in (izquierda, derecha):
+            pdf.set_font("Helvetica", "B", 8)
+            pdf.cell(38, 5, _latin1(etiqueta))
+            pdf.set_font("Helvetica", "", 8)
+            pdf.cell(96, 5, _latin1(valor)[:60])
+        pdf.ln()
+    pdf.ln(3)
+
+    descriptores = calendario.descriptores.reindex(columns=COLUMNAS_INICIALES)
+    meses = spots_por_mes(calendario)
+    encabezados = (
+        [(c, ancho) for c, ancho in COLUMNAS_PDF.items()]
+        + [(m, ANCHO_MES_PDF) for m in meses.columns]
+        + [(c, ANCHO_TOTAL_PDF) for c in ("IMPACTOS", "TARIFA", "INVERSION")]
+    )
+
+    def encabezado_grid():
+        pdf.set_font("Helvetica", "B", 6)
+        for titulo, ancho in encabezados:
+            pdf.cell(ancho, 5, _latin1(titulo), border=1, align="C")
+        pdf.ln()
+        pdf.set_font("Helvetica", "", 6)
+
+    encabezado_grid()
+    posiciones = [COLUMNAS_INICIALES.index(c) for c in COLUMNAS_PDF]
+    totales = descriptores[["TOTAL IMPACTOS", "TARIFA", "TOTAL INVERSION"]].apply(pd.to_numeric, errors="coerce").fillna(0)
+    total_filas = max(len(descriptores), 1)
+    for i, (fila, por_mes, (impactos, tarifa, inversion)) in enumerate(zip(
+        descriptores.itertuples(index=False, name=None), meses.to_numpy(), totales.itertuples(index=False, name=None)
+    )):
+        if i % FILAS_POR_AVANCE == 0:
+            avance(i / total_filas)
+        if pdf.will_page_break(5):
+            pdf.add_page()
+            encabezado_grid()
+        for posicion, ancho in zip(posiciones, COLUMNAS_PDF.values()):
+            pdf.cell(ancho, 5, _latin1(_texto(fila[posicion]))[:int(ancho / 1.2)], border=1)
+        for total_mes in por_mes:
+            pdf.cell(ANCHO_MES_PDF, 5, str(int(total_mes)) if total_mes else "", border=1, align="R")
+        for texto in (f"{int(impactos):,}", f"${tarifa:,.2f}", f"${inversion:,.2f}"):
+            pdf.cell(ANCHO_TOTAL_PDF, 5, texto, border=1, align="R")
+        pdf.ln()
+    pdf.ln(4)
+
+    pdf.set_font("Helvetica", "B", 9)
+    pdf.cell(0, 6, "RESUMEN", new_x="LMARGIN", new_y="NEXT")
+    for concepto, valor in filas_resumen(encabezado):
+        pdf.set_font("Helvetica", "B", 8)
+        pdf.cell(40, 5, _latin1(concepto))
+        pdf.set_font("Helvetica", "", 8)
+        texto = valor if isinstance(valor, str) else (f"{valor:,}" if isinstance(valor, int) else f"${valor:,.2f}")
+        pdf.cell(40, 5, texto, align="R", new_x="LMARGIN", new_y="NEXT")
+
+    return bytes(pdf.output())
+
+
+def exportar_pauta(folio: str, encabezado: dict, calendario: CalendarioSpots, avance=_sin_avance) -> ArchivosPauta:
+    """Excel y PDF de la pauta; el avance va de 0 a 0.6 con el Excel y de 0.6 a 1 con el PDF."""
+    base = f"{folio}_Resumen_Pauta"
+    xlsx = escribir_xlsx(folio, encabezado, calendario, lambda p: avance(0.6 * p, "Generando Excel"))
+    pdf = escribir_pdf(folio, encabezado, calendario, lambda p: avance(0.6 + 0.4 * p, "Generando PDF"))
+    return ArchivosPauta(f"{base}.xlsx", xlsx, f"{base}.pdf", pdf)
+
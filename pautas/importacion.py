@@ -0,0 +1,291 @@
+"""
+Importación en lote de pautas (libros .xlsx u órdenes en .pdf) desde un zip o una carpeta.
+
+    python -m pautas.importacion pautas_agencia.zip --reporte reporte.csv
+    python -m pautas.importacion carpeta/ --validar
+
+Los libros se leen en paralelo en un pool de procesos (uno por CPU) con las mismas reglas que
+la captura de "Nueva Pauta"; las pautas válidas se cargan en bloque en una sola transacción.
+"""
+
+import argparse
+import io
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path, PurePosixPath
+from typing import NamedTuple
+
+import pandas as pd
+
+from pautas.calculos import IVA_TASAS, calcular_resumen, recalcular_totales
+from pautas.calendario import COLUMNAS_INICIALES, CalendarioSpots, construir_calendario
+from pautas.encabezado import CAMPOS_FECHA, CAMPOS_PAUTA, CAMPOS_SI_NO, extraer_datos_generales
+from pautas.ingesta import hash_contenido, leer_archivo_pauta
+from pautas.persistencia import guardar_pautas
+from pautas.trabajos import contexto_procesos
+from pautas.validacion import validar_transmisiones
+
+# Procesos que leen libros a la vez (por defecto uno por CPU)
+PROCESOS = int(os.getenv("IMPORTACION_PROCESOS", os.cpu_count() or 1))
+# Archivos de pauta que se aceptan en el lote
+EXTENSIONES_LIBRO = (".xlsx", ".pdf")
+# Libros por lote, para no aceptar zips con miles de archivos
+MAX_LIBROS_LOTE = 300
+
+COLUMNAS_REPORTE = ["ARCHIVO", "ESTADO", "FOLIO", "CLIENTE", "CAMPAÑA", "FILAS", "IMPACTOS", "TOTAL", "DETALLE"]
+
+
+class LibroLote(NamedTuple):
+    nombre: str
+    contenido: bytes
+
+
+class ResultadoLibro(NamedTuple):
+    archivo: str
+    encabezado: dict  # None si el libro no se pudo importar
+    calendario: CalendarioSpots
+    error: str
+    advertencias: tuple
+
+    @property
+    def valido(self) -> bool:
+        return self.error is None
+
+
+def es_libro(nombre: str) -> bool:
+    ruta = PurePosixPath(nombre.replace("\\", "/"))
+    return (
+        ruta.suffix.lower() in EXTENSIONES_LIBRO
+        and not ruta.name.startswith(("~$", "."))
+        and "__MACOSX" not in ruta.parts
+    )
+
+
+def _limitar(libros: list) -> list:
+    if len(libros) > MAX_LIBROS_LOTE:
+        raise ValueError(f"El lote tiene {len(libros)} libros; el máximo es {MAX_LIBROS_LOTE}.")
+    return libros
+
+
+def libros_zip(contenido: bytes) -> list:
+    """Libros .xlsx y .pdf de un zip (se ignoran carpetas de macOS y archivos temporales de Excel)."""
+    with zipfile.ZipFile(io.BytesIO(contenido)) as zf:
+        nombres = sorted(n for n in zf.namelist() if not n.endswith("/") and es_libro(n))
+        _limitar(nombres)
+        return [LibroLote(nombre, zf.read(nombre)) for nombre in nombres]
+
+
+def libros_en_ruta(ruta) -> list:
+    """Libros .xlsx y .pdf de un zip o de una carpeta (incluidas sus subcarpetas)."""
+    ruta = Path(ruta)
+    if ruta.is_dir():
+        archivos = _limitar(sorted(p for p in ruta.rglob("*") if p.is_file() and es_libro(str(p.relative_to(ruta)))))
+        return [LibroLote(str(p.relative_to(ruta)), p.read_bytes()) for p in archivos]
+    if zipfile.is_zipfile(ruta):
+        return libros_zip(ruta.read_bytes())
+    raise ValueError(f"{ruta} no es una carpeta ni un archivo zip.")
+
+
+def _encabezado(datos: dict) -> dict:
+    """Encabezado con columnas de PAUTAS; los campos que el libro no trae quedan vacíos (o "NO")."""
+    encabezado = {}
+    for columna, campo in CAMPOS_PAUTA.items():
+        valor = datos.get(campo)
+        if campo in CAMPOS_FECHA:
+            valor = valor.date()
+        elif valor is None:
+            valor = "NO" if campo in CAMPOS_SI_NO else ""
+        encabezado[columna] = valor
+    return encabezado
+
+
+def procesar_libro(nombre: str, contenido: bytes) -> ResultadoLibro:
+    """
+    Lee y valida un libro con el layout de la captura (encabezado en filas 0-12, títulos en la
+    fila 15, grid cortado en la primera PLAZA TRANS vacía) y arma su pauta con totales
+    recalculados. Corre en los procesos del pool: los errores se devuelven como texto.
+    """
+    def fallo(error):
+        return ResultadoLibro(nombre, None, None, error, ())
+
+    try:
+        # Ya corre en un proceso del pool: las páginas de un PDF se leen en serie
+        leida = leer_archivo_pauta(contenido, procesos=1)
+        datos = extraer_datos_generales(leida.encabezado)
+    except Exception as e:
+        return fallo(f"No se pudo leer el libro: {e}")
+
+    faltantes = [col for col in COLUMNAS_INICIALES if col not in leida.transmisiones.columns]
+    if faltantes:
+        return fallo(f"Faltan columnas obligatorias: {faltantes}")
+    if leida.transmisiones.empty:
+        return fallo("El libro no tiene transmisiones.")
+    fechas_faltantes = [campo for campo in sorted(CAMPOS_FECHA) if campo not in datos]
+    if fechas_faltantes:
+        return fallo(f"No se encontró {' ni '.join(fechas_faltantes)} en el encabezado.")
+    if datos["FIN CAMPAÑA"] < datos["INICIO CAMPAÑA"]:
+        return fallo("FIN CAMPAÑA es anterior a INICIO CAMPAÑA.")
+
+    advertencias = []
+    if leida.filas_ignoradas:
+        advertencias.append("Se ignoraron filas vacías o de totales al final del archivo.")
+    rango = construir_calendario(datos["INICIO CAMPAÑA"], datos["FIN CAMPAÑA"])
+    etiquetas = list(rango.etiquetas)
+
+    try:
+        # Se valida el grid tal como viene (los errores quedan en el reporte; la pauta entra como borrador)
+        presentes = [c for c in etiquetas if c in leida.transmisiones.columns]
+        validacion = validar_transmisiones(leida.transmisiones, presentes, etiquetas)
+        advertencias += validacion.mensajes()
+        calendario = CalendarioSpots.desde_grid_ancho(
+            leida.transmisiones, rango.fechas, etiquetas, COLUMNAS_INICIALES
+        )
+        recalculado = recalcular_totales(calendario.a_grid_ancho(etiquetas), etiquetas).transmisiones
+        calendario = CalendarioSpots(recalculado[COLUMNAS_INICIALES], rango.fechas, calendario.spots)
+    except Exception as e:
+        return fallo(f"No se pudieron leer las transmisiones: {e}")
+
+    tipo_iva = next(iter(IVA_TASAS))
+    resumen = calcular_resumen(recalculado, tipo_iva)
+    encabezado = _encabezado(datos)
+    encabezado.update({
+        "TOTAL_IMPACTOS": resumen.impactos,
+        "SUBTOTAL": resumen.subtotal,
+        "TIPO_IVA": tipo_iva,
+        "IVA": resumen.iva,
+        "TOTAL": resumen.total,
+        "MONEDA": "MN",
+        "ESTATUS_CAMPANA": "PROGRAMADA",
+        "ESTATUS_OTC": "BORRADOR",
+    })
+    return ResultadoLibro(nombre, encabezado, calendario, None, tuple(advertencias))
+
+
+def leer_lote(libros: list, procesos: int = None, avance=None) -> list:
+    """
+    Procesa los libros en un pool de procesos y devuelve un ResultadoLibro por libro, en el
+    orden recibido. Los libros repetidos (mismo contenido) se reportan sin volver a leerlos.
+    avance(fraccion, mensaje) se llama al terminar cada libro; si lanza una excepción (p. ej.
+    al cancelar el trabajo) se cancelan los libros pendientes.
+    """
+    resultados = [None] * len(libros)
+    vistos = {}
+    pendientes = []
+    for i, libro in enumerate(libros):
+        digest = hash_contenido(libro.contenido)
+        if digest in vistos:
+            resultados[i] = ResultadoLibro(libro.nombre, None, None, f"Duplicado de {vistos[digest]}.", ())
+        else:
+            vistos[digest] = libro.nombre
+            pendientes.append(i)
+
+    def reportar(hechos):
+        if avance is not None:
+            avance(hechos / len(pendientes), f"{hechos} de {len(pendientes)} libros leídos")
+
+    procesos = min(procesos or PROCESOS, len(pendientes))
+    if procesos <= 1:
+        # Con una sola CPU el pool sólo agregaría el costo de copiar los libros a otro proceso
+        for hechos, i in enumerate(pendientes, 1):
+            resultados[i] = procesar_libro(*libros[i])
+            reportar(hechos)
+        return resultados
+
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto_procesos()) as pool:
+        futuros = {pool.submit(procesar_libro, *libros[i]): i for i in pendientes}
+        try:
+            for hechos, futuro in enumerate(as_completed(futuros), 1):
+                resultados[futuros[futuro]] = futuro.result()
+                reportar(hechos)
+        except BaseException:
+            for futuro in futuros:
+                futuro.cancel()
+            raise
+    return resultados
+
+
+def cargar_lote(sesion, resultados: list, usuario: str) -> dict:
+    """Guarda en bloque las pautas válidas (todas o ninguna); devuelve archivo -> folio."""
+    validos = [r for r in resultados if r.valido]
+    folios = guardar_pautas(sesion, [(r.encabezado, r.calendario, []) for r in validos], usuario)
+    return {r.archivo: folio for r, folio in zip(validos, folios)}
+
+
+def reporte_lote(resultados: list, folios: dict = None, error_carga: str = None) -> pd.DataFrame:
+    """Una fila por libro: VALIDA (sin cargar), IMPORTADA, NO CARGADA (falló la carga) o ERROR."""
+    filas = []
+    for r in resultados:
+        fila = {"ARCHIVO": r.archivo, "FOLIO": None, "CLIENTE": None, "CAMPAÑA": None,
+                "FILAS": None, "IMPACTOS": None, "TOTAL": None}
+        if not r.valido:
+            fila.update({"ESTADO": "ERROR", "DETALLE": r.error})
+        else:
+            fila.update({
+                "CLIENTE": r.encabezado["CLIENTE"],
+                "CAMPAÑA": r.encabezado["CAMPANA"],
+                "FILAS": len(r.calendario.descriptores),
+                "IMPACTOS": r.encabezado["TOTAL_IMPACTOS"],
+                "TOTAL": r.encabezado["TOTAL"],
+                "DETALLE": "; ".join(r.advertencias),
+            })
+            if error_carga is not None:
+                fila.update({"ESTADO": "NO CARGADA", "DETALLE": error_carga})
+            elif folios:
+                fila.update({"ESTADO": "IMPORTADA", "FOLIO": folios.get(r.archivo)})
+            else:
+                fila["ESTADO"] = "VALIDA"
+        filas.append(fila)
+    return pd.DataFrame(filas, columns=COLUMNAS_REPORTE).astype({"FILAS": "Int64", "IMPACTOS": "Int64"})
+
+
+def _cargar_env(ruta: str = ".env"):
+    # Mismo formato que test_connection.py; no pisa variables ya definidas
+    if os.path.exists(ruta):
+        with open(ruta) as f:
+            for linea in f:
+                linea = linea.strip()
+                if linea and not linea.startswith("#") and "=" in linea:
+                    llave, valor = linea.split("=", 1)
+                    os.environ.setdefault(llave, valor)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Importa en lote pautas (.xlsx o .pdf) desde un zip o una carpeta.")
+    parser.add_argument("ruta", help="Archivo .zip o carpeta con los libros")
+    parser.add_argument("--procesos", type=int, default=None, help=f"Procesos de lectura (por defecto {PROCESOS})")
+    parser.add_argument("--usuario", default=None, help="CAPTURADO_POR de las pautas (por defecto SNOWFLAKE_USER)")
+    parser.add_argument("--reporte", default=None, help="Escribe el reporte por archivo en este CSV")
+    parser.add_argument("--validar", action="store_true", help="Sólo lee y valida, no carga a Snowflake")
+    args = parser.parse_args(argv)
+
+    _cargar_env()
+    libros = libros_en_ruta(args.ruta)
+    print(f"{len(libros)} libros en {args.ruta}")
+    resultados = leer_lote(libros, args.procesos)
+
+    folios, error_carga = None, None
+    validos = sum(r.valido for r in resultados)
+    if validos and not args.validar:
+        from pautas.conexion import conexion_configurada, ejecutar
+        if not conexion_configurada():
+            error_carga = "Snowflake no está configurado (.env); no se cargó ninguna pauta."
+        else:
+            usuario = args.usuario or os.getenv("SNOWFLAKE_USER") or "LOCAL"
+            try:
+                folios = ejecutar(lambda sesion: cargar_lote(sesion, resultados, usuario))
+            except Exception as e:
+                error_carga = f"No se pudo cargar el lote: {e}"
+
+    reporte = reporte_lote(resultados, folios, error_carga)
+    if args.reporte:
+        reporte.to_csv(args.reporte, index=False, encoding="utf-8-sig")
+    with pd.option_context("display.max_colwidth", 80, "display.width", 200):
+        print(reporte.to_string(index=False))
+    print(reporte["ESTADO"].value_counts().to_string())
+    return 1 if error_carga or validos < len(resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
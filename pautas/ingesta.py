@@ -0,0 +1,115 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from typing import NamedTuple
+
+import pandas as pd
+
+# Layout del formato de pauta: encabezado en filas 0-12, nombres de columnas en la fila 14
+FILAS_ENCABEZADO = 13
+FILA_COLUMNAS = 14
+# Pautas leídas que se recuerdan por hash de contenido
+MAX_LECTURAS = 16
+
+
+class PautaLeida(NamedTuple):
+    encabezado: pd.DataFrame
+    transmisiones: pd.DataFrame
+    filas_ignoradas: bool
+
+
+def hash_contenido(contenido: bytes) -> str:
+    """Devuelve el hash sha256 (hex) del contenido de un archivo subido."""
+    return hashlib.sha256(contenido).hexdigest()
+
+
+def _nombres_columnas(fila) -> list:
+    """Convierte la fila de títulos en nombres de columna, igual que read_excel(header=...)."""
+    nombres = []
+    vistos = {}
+    for i, valor in enumerate(fila):
+        nombre = f"Unnamed: {i}" if pd.isna(valor) else valor
+        if nombre in vistos:
+            vistos[nombre] += 1
+            nombre = f"{nombre}.{vistos[nombre]}"
+        else:
+            vistos[nombre] = 0
+        nombres.append(nombre)
+    return nombres
+
+
+def separar_libro(crudo: pd.DataFrame) -> PautaLeida:
+    """
+    Separa una hoja leída con header=None en bloque de encabezado y grid de transmisiones.
+    El grid se corta en la primera fila con 'PLAZA TRANS' vacía (filas vacías o de totales).
+    """
+    encabezado = crudo.iloc[:FILAS_ENCABEZADO].reset_index(drop=True)
+
+    if len(crudo) <= FILA_COLUMNAS:
+        return PautaLeida(encabezado, pd.DataFrame(), False)
+
+    transmisiones = crudo.iloc[FILA_COLUMNAS + 1:].reset_index(drop=True)
+    transmisiones.columns = _nombres_columnas(crudo.iloc[FILA_COLUMNAS])
+    transmisiones = transmisiones.infer_objects()
+
+    filas_ignoradas = False
+    if "PLAZA TRANS" in transmisiones.columns:
+        fila_corte = transmisiones[transmisiones["PLAZA TRANS"].isna()].index
+        if not fila_corte.empty:
+            transmisiones = transmisiones.iloc[:fila_corte[0]]
+            filas_ignoradas = True
+
+    return PautaLeida(encabezado, transmisiones, filas_ignoradas)
+
+
+def leer_libro_pauta(contenido: bytes) -> PautaLeida:
+    """Lee el libro de pauta una sola vez y lo separa en encabezado y transmisiones."""
+    crudo = pd.read_excel(io.BytesIO(contenido), header=None)
+    return separar_libro(crudo)
+
+
+def es_pdf(contenido: bytes) -> bool:
+    return contenido[:1024].lstrip().startswith(b"%PDF")
+
+
+def leer_archivo_pauta(contenido: bytes, procesos: int = None, avance=None) -> PautaLeida:
+    """Lee una pauta en Excel o en PDF (según su contenido) con el mismo resultado."""
+    if es_pdf(contenido):
+        from pautas.lectura_pdf import leer_pdf_pauta
+        return leer_pdf_pauta(contenido, procesos, avance)
+    return leer_libro_pauta(contenido)
+
+
+class CacheLecturas:
+    """
+    Pautas ya leídas por hash de contenido, compartidas por las sesiones del proceso. La
+    página consulta antes de lanzar la lectura en segundo plano; el trabajo guarda lo leído.
+    """
+
+    def __init__(self, maximo: int = MAX_LECTURAS):
+        self.maximo = maximo
+        self._valores = OrderedDict()
+        self._candado = threading.Lock()
+
+    def consultar(self, digest: str) -> PautaLeida:
+        """La pauta leída con ese hash, o None si no está en memoria."""
+        with self._candado:
+            if digest in self._valores:
+                self._valores.move_to_end(digest)
+                return self._valores[digest]
+        return None
+
+    def obtener(self, digest: str, leer) -> PautaLeida:
+        leida = self.consultar(digest)
+        if leida is not None:
+            return leida
+        leida = leer()
+        with self._candado:
+            self._valores[digest] = leida
+            if len(self._valores) > self.maximo:
+                self._valores.popitem(last=False)
+        return leida
+
+
+cache_lecturas = CacheLecturas()
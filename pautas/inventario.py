@@ -0,0 +1,318 @@
+import os
+import threading
+import time
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from pautas.calendario import CalendarioSpots
+from pautas.validacion import minutos_del_dia
+
+# Spots por hora que vende un medio cuando no aparece en CAPACIDAD_MEDIOS
+SPOTS_POR_HORA = float(os.getenv("INVENTARIO_SPOTS_HORA", "12"))
+# Segundos que se usa el inventario antes de volver a leerlo de Snowflake; lo que se envía o
+# edita en este proceso se suma al momento, la recarga trae lo de otros contenedores
+TTL_INVENTARIO = 300
+# Estatus OTC que todavía no ocupan inventario
+ESTATUS_SIN_INVENTARIO = ("BORRADOR",)
+
+# Spots ocupados por medio, bloque horario y día, agregados en Snowflake (sólo de hoy en adelante)
+CONSULTA_INVENTARIO = f"""
+SELECT UPPER(TRIM(T.MEDIO)) AS MEDIO, T.HORA_INICIO, T.HORA_FIN, S.FECHA, SUM(S.SPOTS) AS SPOTS
+FROM PAUTA_SPOTS S
+JOIN PAUTA_TRANSMISIONES T ON T.FOLIO_INTERNO = S.FOLIO_INTERNO AND T.FILA = S.FILA
+JOIN PAUTAS P ON P.FOLIO_INTERNO = S.FOLIO_INTERNO
+WHERE S.FECHA >= ?
+  AND COALESCE(P.ESTATUS_OTC, '') NOT IN ({', '.join('?' for _ in ESTATUS_SIN_INVENTARIO)})
+GROUP BY 1, 2, 3, 4
+"""
+CONSULTA_CAPACIDAD = "SELECT UPPER(TRIM(MEDIO)) AS MEDIO, SPOTS_POR_HORA FROM CAPACIDAD_MEDIOS"
+
+COLUMNAS_INVENTARIO = ["MEDIO", "INICIO", "FIN", "FECHA", "SPOTS"]
+COLUMNAS_CONFLICTO = ["FILAS", "MEDIO", "HORARIO", "FECHA", "SOLICITADOS", "OCUPADOS", "CAPACIDAD"]
+
+
+def ocupa_inventario(estatus_otc) -> bool:
+    return (estatus_otc or "") not in ESTATUS_SIN_INVENTARIO
+
+
+def _hora(minutos: int) -> str:
+    return f"{int(minutos) // 60:02}:{int(minutos) % 60:02}"
+
+
+def _registros(medios: pd.Series, horas_inicio: pd.Series, horas_fin: pd.Series) -> tuple:
+    """MEDIO normalizado y minutos de inicio/fin; máscara de filas con medio y horario válidos."""
+    medio = medios.astype("string").str.strip().str.upper().fillna("")
+    inicio, inicio_ok = minutos_del_dia(horas_inicio)
+    fin, fin_ok = minutos_del_dia(horas_fin)
+    validas = inicio_ok & fin_ok & (inicio < fin) & (medio != "").to_numpy()
+    return medio.to_numpy(dtype=object), inicio, fin, validas
+
+
+def registros_inventario(calendario: CalendarioSpots) -> pd.DataFrame:
+    """
+    Spots del calendario en forma larga (FILA, MEDIO, INICIO, FIN, FECHA, SPOTS), con el horario en
+    minutos. Las filas sin MEDIO o con horario inválido no ocupan inventario (la validación las reporta).
+    """
+    descriptores = calendario.descriptores
+    medio, inicio, fin, validas = _registros(
+        descriptores["MEDIO"], descriptores["HORA INICIO"], descriptores["HORA FIN"]
+    )
+    registros = calendario.registros()
+    registros = registros[validas[registros["FILA"].to_numpy()]]
+    filas = registros["FILA"].to_numpy()
+    return pd.DataFrame({
+        "FILA": filas,
+        "MEDIO": medio[filas],
+        "INICIO": inicio[filas],
+        "FIN": fin[filas],
+        "FECHA": pd.to_datetime(registros["FECHA"]).to_numpy(dtype="datetime64[D]"),
+        "SPOTS": registros["SPOTS"].to_numpy(dtype=np.int64),
+    })
+
+
+def consultar_inventario(sesion, desde: date = None) -> tuple:
+    """Registros agregados del inventario y spots por hora de cada medio, leídos de Snowflake."""
+    desde = desde or date.today()
+    tabla = sesion.sql(CONSULTA_INVENTARIO, params=[desde, *ESTATUS_SIN_INVENTARIO]).to_pandas()
+    medio, inicio, fin, validas = _registros(tabla["MEDIO"], tabla["HORA_INICIO"], tabla["HORA_FIN"])
+    registros = pd.DataFrame({
+        "MEDIO": medio,
+        "INICIO": inicio,
+        "FIN": fin,
+        "FECHA": pd.to_datetime(tabla["FECHA"]).to_numpy(dtype="datetime64[D]"),
+        "SPOTS": pd.to_numeric(tabla["SPOTS"]).to_numpy(dtype=np.int64),
+    })[validas]
+    capacidades = {
+        fila["MEDIO"]: float(fila["SPOTS_POR_HORA"]) for fila in sesion.sql(CONSULTA_CAPACIDAD).collect()
+    }
+    return registros, capacidades
+
+
+def _traslape(inicios_a, fines_a, inicios_b, fines_b) -> np.ndarray:
+    """Minutos en común de cada intervalo a con cada intervalo b (matriz a x b)."""
+    return np.clip(
+        np.minimum(fines_a[:, None], fines_b[None, :]) - np.maximum(inicios_a[:, None], inicios_b[None, :]),
+        0, None
+    )
+
+
+class _BloquesMedio:
+    """Spots ocupados de un medio: una fila por bloque horario [inicio, fin) y una columna por día."""
+
+    def __init__(self, dias: int):
+        self.posiciones = {}  # (inicio, fin) -> fila de la matriz
+        self.spots = np.zeros((0, dias), dtype=np.int32)
+        self._indice = None
+
+    @property
+    def indice(self) -> pd.IntervalIndex:
+        """Índice de intervalos de los bloques, en el orden de las filas de la matriz."""
+        if self._indice is None:
+            bloques = np.array(list(self.posiciones), dtype=np.int64).reshape(-1, 2)
+            self._indice = pd.IntervalIndex.from_arrays(bloques[:, 0], bloques[:, 1], closed="left")
+        return self._indice
+
+    def filas(self, inicios, fines) -> np.ndarray:
+        """Fila de cada bloque (inicio, fin); los bloques nuevos se agregan a la matriz."""
+        bloques = list(zip(inicios.tolist(), fines.tolist()))
+        nuevos = [b for b in dict.fromkeys(bloques) if b not in self.posiciones]
+        if nuevos:
+            for bloque in nuevos:
+                self.posiciones[bloque] = len(self.posiciones)
+            self.spots = np.vstack([self.spots, np.zeros((len(nuevos), self.spots.shape[1]), dtype=np.int32)])
+            self._indice = None
+        return np.array([self.posiciones[b] for b in bloques], dtype=np.int64)
+
+    def ampliar(self, dias: int):
+        if dias > self.spots.shape[1]:
+            extra = np.zeros((self.spots.shape[0], dias - self.spots.shape[1]), dtype=np.int32)
+            self.spots = np.hstack([self.spots, extra])
+
+    def traslapados(self, inicio: int, fin: int, columnas: np.ndarray) -> tuple:
+        """Bloques que se cruzan con [inicio, fin) y sus spots en las columnas dadas (-1 = fuera del inventario)."""
+        if not self.posiciones:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.zeros((0, len(columnas)))
+        cruzan = self.indice.overlaps(pd.Interval(inicio, fin, closed="left"))
+        dentro = (columnas >= 0) & (columnas < self.spots.shape[1])
+        spots = np.zeros((int(cruzan.sum()), len(columnas)))
+        spots[:, dentro] = self.spots[np.flatnonzero(cruzan)][:, columnas[dentro]]
+        return self.indice.left[cruzan].to_numpy(), self.indice.right[cruzan].to_numpy(), spots
+
+
+class Inventario:
+    """
+    Spots vendidos por medio, bloque horario y día, para detectar sobreventa antes de enviar.
+    Se carga agregado desde Snowflake (una consulta GROUP BY) y después se actualiza en memoria
+    con cada pauta enviada o editada, sin volver a recorrer las pautas guardadas. Cada medio
+    tiene un índice de intervalos de sus bloques (HORA INICIO, HORA FIN): al revisar un bloque
+    sólo se leen los que se cruzan con él.
+    """
+
+    def __init__(self, ttl: float = TTL_INVENTARIO, spots_por_hora: float = SPOTS_POR_HORA):
+        self.ttl = ttl
+        self.spots_por_hora = spots_por_hora
+        self._candado = threading.RLock()
+        self._expira = 0.0
+        self._reiniciar(date.today(), {})
+
+    def _reiniciar(self, origen: date, capacidades: dict):
+        self.origen = np.datetime64(origen, "D")
+        self.dias = 0
+        self.capacidades = capacidades
+        self._medios = {}
+
+    def capacidad(self, medio: str) -> float:
+        """Spots por hora que se pueden vender en el medio."""
+        return self.capacidades.get(medio, self.spots_por_hora)
+
+    def _columnas(self, fechas: np.ndarray) -> np.ndarray:
+        return (fechas.astype("datetime64[D]") - self.origen).astype(np.int64)
+
+    def _sumar(self, registros: pd.DataFrame, signo: int):
+        registros = registros.assign(DIA=self._columnas(registros["FECHA"].to_numpy()))
+        registros = registros[registros["DIA"] >= 0]
+        if registros.empty:
+            return
+        dias = int(registros["DIA"].max()) + 1
+        if dias > self.dias:
+            # Se crece de a un año para no copiar las matrices con cada fecha nueva
+            self.dias = max(dias, self.dias + 366)
+            for bloques in self._medios.values():
+                bloques.ampliar(self.dias)
+        agregados = registros.groupby(["MEDIO", "INICIO", "FIN", "DIA"], sort=False)["SPOTS"].sum().reset_index()
+        for medio, grupo in agregados.groupby("MEDIO", sort=False):
+            bloques = self._medios.setdefault(medio, _BloquesMedio(self.dias))
+            filas = bloques.filas(grupo["INICIO"].to_numpy(), grupo["FIN"].to_numpy())
+            np.add.at(bloques.spots, (filas, grupo["DIA"].to_numpy()), signo * grupo["SPOTS"].to_numpy())
+
+    def cargar(self, registros: pd.DataFrame, capacidades: dict, origen: date = None):
+        """Reemplaza el inventario con registros agregados (MEDIO, INICIO, FIN, FECHA, SPOTS)."""
+        with self._candado:
+            self._reiniciar(origen or date.today(), capacidades)
+            self._sumar(registros, 1)
+            self._expira = time.monotonic() + self.ttl
+
+    def asegurar(self, consultar):
+        """Recarga el inventario con consultar() -> (registros, capacidades) si ya expiró."""
+        with self._candado:
+            if self._expira <= time.monotonic():
+                self.cargar(*consultar())
+
+    def agregar(self, calendario: CalendarioSpots):
+        """Suma los spots de una pauta enviada (si el inventario ya está cargado)."""
+        with self._candado:
+            if self._expira > time.monotonic():
+                self._sumar(registros_inventario(calendario), 1)
+
+    def quitar(self, calendario: CalendarioSpots):
+        """Resta los spots de una pauta (la versión anterior al guardar una edición)."""
+        with self._candado:
+            if self._expira > time.monotonic():
+                self._sumar(registros_inventario(calendario), -1)
+
+    def invalidar(self):
+        with self._candado:
+            self._expira = 0.0
+
+    def revisar(self, calendario: CalendarioSpots, excluir: CalendarioSpots = None) -> pd.DataFrame:
+        """
+        Celdas del calendario que sobrevenden su bloque: para cada bloque pedido y día con spots,
+        suma lo ya vendido en los bloques que se cruzan con él (en proporción a los minutos en
+        común) más lo que pide la pauta, y lo compara con spots por hora x horas del bloque.
+        excluir es la versión guardada de la misma pauta (al editar), que ya está en el inventario.
+        Devuelve una fila por bloque y día sobrevendidos, con las filas del editor (1, 2, ...) que los piden.
+        """
+        propios = _con_dia(registros_inventario(calendario))
+        if propios.empty:
+            return pd.DataFrame(columns=COLUMNAS_CONFLICTO)
+        excluidos = _con_dia(registros_inventario(excluir)) if excluir is not None else propios.iloc[:0]
+        # Se agrega una sola vez por medio, bloque y día; por medio ya sólo se trabaja con arreglos
+        pedidos = _por_medio(propios)
+        guardados = _por_medio(excluidos)
+        origen = self.origen.astype(np.int64)
+
+        conflictos = []
+        with self._candado:
+            for medio, (inicio, fin, dia, cantidad) in pedidos.items():
+                dias = np.unique(dia)
+
+                # Bloques pedidos por la pauta (y los de su versión guardada, que se descuentan)
+                piden = _matriz_bloques(inicio, fin, dia, cantidad, dias)
+                if medio in guardados:
+                    g_inicio, g_fin, g_dia, g_cantidad = guardados[medio]
+                    mismos = np.isin(g_dia, dias)
+                    guardado = _matriz_bloques(g_inicio[mismos], g_fin[mismos], g_dia[mismos], g_cantidad[mismos], dias)
+                else:
+                    guardado = _matriz_bloques(*(np.empty(0, dtype=np.int64),) * 4, dias)
+                bloques = self._medios.get(medio)
+                if bloques is not None:
+                    vendidos = bloques.traslapados(int(piden[0].min()), int(piden[1].max()), dias - origen)
+                else:
+                    vendidos = _matriz_bloques(*(np.empty(0, dtype=np.int64),) * 4, dias)
+
+                inicios = np.concatenate([vendidos[0], guardado[0], piden[0]])
+                fines = np.concatenate([vendidos[1], guardado[1], piden[1]])
+                spots = np.vstack([vendidos[2], -guardado[2], piden[2]])
+                # Fracción de cada bloque que cae dentro de cada bloque pedido
+                pesos = _traslape(piden[0], piden[1], inicios, fines) / (fines - inicios)
+                carga = pesos @ spots
+                propia = pesos[:, len(inicios) - len(piden[0]):] @ piden[2]
+                capacidad = self.capacidad(medio) * (piden[1] - piden[0]) / 60
+                excedidos = (carga > capacidad[:, None] + 1e-9) & (piden[2] > 0)
+                for b, d in zip(*np.nonzero(excedidos)):
+                    conflictos.append({
+                        "MEDIO": medio,
+                        "INICIO": int(piden[0][b]),
+                        "FIN": int(piden[1][b]),
+                        "DIA": int(dias[d]),
+                        "SOLICITADOS": int(piden[2][b, d]),
+                        "OCUPADOS": round(float(carga[b, d] - propia[b, d]), 1),
+                        "CAPACIDAD": round(float(capacidad[b]), 1),
+                    })
+
+        if not conflictos:
+            return pd.DataFrame(columns=COLUMNAS_CONFLICTO)
+        llave = ["MEDIO", "INICIO", "FIN", "DIA"]
+        conflictos = pd.DataFrame(conflictos)
+        filas = (
+            propios.merge(conflictos[llave], on=llave)[llave + ["FILA"]]
+            .drop_duplicates()
+            .sort_values("FILA")
+            .assign(FILA=lambda f: (f["FILA"] + 1).astype(str))
+            .groupby(llave, sort=False)["FILA"]
+            .agg(", ".join)
+            .rename("FILAS")
+            .reset_index()
+        )
+        conflictos = conflictos.merge(filas, on=llave).sort_values(["MEDIO", "DIA", "INICIO"])
+        conflictos["HORARIO"] = [f"{_hora(i)}-{_hora(f)}" for i, f in zip(conflictos["INICIO"], conflictos["FIN"])]
+        conflictos["FECHA"] = conflictos["DIA"].to_numpy().astype("datetime64[D]").astype(object)
+        return conflictos[COLUMNAS_CONFLICTO].reset_index(drop=True)
+
+
+def _con_dia(registros: pd.DataFrame) -> pd.DataFrame:
+    """Agrega DIA (días desde 1970-01-01) para usar las fechas como llaves enteras."""
+    return registros.assign(DIA=registros["FECHA"].to_numpy(dtype="datetime64[D]").astype(np.int64))
+
+
+def _por_medio(registros: pd.DataFrame) -> dict:
+    """Spots agregados por bloque y día de cada medio: medio -> (inicios, fines, días, spots)."""
+    agregados = registros.groupby(["MEDIO", "INICIO", "FIN", "DIA"], sort=False)["SPOTS"].sum().reset_index()
+    columnas = [agregados[c].to_numpy(dtype=np.int64) for c in ("INICIO", "FIN", "DIA", "SPOTS")]
+    return {
+        medio: tuple(c[posiciones] for c in columnas)
+        for medio, posiciones in agregados.groupby("MEDIO", sort=False).indices.items()
+    }
+
+
+def _matriz_bloques(inicios, fines, dias_registro, spots, dias: np.ndarray) -> tuple:
+    """Bloques distintos (inicios, fines) y sus spots por día (bloques x dias, que viene ordenado)."""
+    bloques, fila = np.unique(np.stack([inicios, fines], axis=1).reshape(-1, 2), axis=0, return_inverse=True)
+    matriz = np.zeros((len(bloques), len(dias)))
+    np.add.at(matriz, (fila.ravel(), np.searchsorted(dias, dias_registro)), spots)
+    return bloques[:, 0], bloques[:, 1], matriz
+
+
+inventario = Inventario()
@@ -0,0 +1,298 @@
+"""
+Lectura de pautas en PDF (órdenes de agencia) con el mismo resultado que un libro de Excel:
+bloque de encabezado con etiquetas y valores, y grid de transmisiones con sus títulos.
+
+pdfminer.six (Python puro) sólo se usa para obtener los caracteres y las líneas de cada página
+con su posición; el acomodo en renglones, palabras y columnas se hace aquí. Las páginas de
+los PDFs largos se leen en paralelo en un pool de procesos.
+"""
+
+import bisect
+import io
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import NamedTuple
+
+import pandas as pd
+
+from pautas.calendario import COLUMNAS_INICIALES
+from pautas.encabezado import ALIAS_ENCABEZADO, normalizar_etiqueta
+from pautas.ingesta import PautaLeida
+from pautas.trabajos import contexto_procesos
+
+# Procesos que leen páginas a la vez (por defecto uno por CPU)
+PROCESOS_PDF = int(os.getenv("PDF_PROCESOS", os.cpu_count() or 1))
+# Con menos páginas cuesta más levantar el pool que leerlas en serie
+MIN_PAGINAS_PARALELO = 4
+# Separación entre caracteres (en tamaños de letra) a partir de la cual empieza otra palabra,
+# y entre palabras del encabezado a partir de la cual empieza otra celda
+SEPARACION_PALABRAS = 0.25
+SEPARACION_CELDAS = 1.0
+# Columnas que debe llenar un renglón para ser fila del grid (descarta pies de página y notas)
+MIN_COLUMNAS_FILA = 3
+
+# Título normalizado -> columna del grid; los títulos de varias palabras se reconocen completos
+TITULOS_GRID = {normalizar_etiqueta(c): c for c in COLUMNAS_INICIALES}
+ETIQUETAS_ENCABEZADO = {normalizar_etiqueta(e) for alias in ALIAS_ENCABEZADO.values() for e in alias}
+MAX_PALABRAS_TITULO = max(len(t.split()) for t in list(TITULOS_GRID) + list(ETIQUETAS_ENCABEZADO))
+
+NUMERO = re.compile(r"^\$?-?(\d{1,3}(,\d{3})+|\d+)(\.\d+)?$")
+
+
+class Palabra(NamedTuple):
+    x0: float
+    x1: float
+    texto: str
+    tamano: float
+
+
+class Renglon(NamedTuple):
+    y: float  # centro vertical (el origen del PDF está abajo)
+    palabras: list  # Palabra de izquierda a derecha
+
+
+class PaginaPdf(NamedTuple):
+    renglones: list  # Renglon de arriba hacia abajo
+    verticales: list  # (x, y0, y1) de las líneas verticales: bordes de las celdas
+
+
+def _objetos(contenedor):
+    from pdfminer.layout import LTChar
+
+    for objeto in contenedor:
+        if isinstance(objeto, LTChar) or not hasattr(objeto, "__iter__"):
+            yield objeto
+        else:
+            # Texto dentro de figuras (XObjects)
+            yield from _objetos(objeto)
+
+
+def _renglones(caracteres: list) -> list:
+    """Agrupa caracteres (x0, x1, y, tamaño, texto) en renglones y palabras."""
+    renglones = []
+    for caracter in sorted(caracteres, key=lambda c: -c[2]):
+        if renglones and abs(renglones[-1][0] - caracter[2]) <= 0.4 * caracter[3]:
+            renglones[-1][1].append(caracter)
+        else:
+            renglones.append((caracter[2], [caracter]))
+
+    resultado = []
+    for y, fila in renglones:
+        palabras = []
+        actual = None
+        for x0, x1, _, tamano, texto in sorted(fila):
+            if not texto.strip():
+                actual = None
+                continue
+            if actual is not None and x0 - actual[1] <= SEPARACION_PALABRAS * tamano:
+                actual = [actual[0], max(actual[1], x1), actual[2] + texto, actual[3]]
+                palabras[-1] = actual
+            else:
+                actual = [x0, x1, texto, tamano]
+                palabras.append(actual)
+        if palabras:
+            resultado.append(Renglon(y, [Palabra(*p) for p in palabras]))
+    return resultado
+
+
+def _paginas(contenido: bytes, numeros=None):
+    """PaginaPdf de las páginas pedidas (todas si numeros es None), en orden."""
+    from pdfminer.converter import PDFPageAggregator
+    from pdfminer.layout import LTChar, LTCurve
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    recursos = PDFResourceManager()
+    # Sin LAParams: sólo los caracteres y trazos con su posición, sin análisis de layout
+    agregador = PDFPageAggregator(recursos, laparams=None)
+    interprete = PDFPageInterpreter(recursos, agregador)
+    for pagina in PDFPage.get_pages(io.BytesIO(contenido), numeros):
+        interprete.process_page(pagina)
+        caracteres, verticales = [], []
+        for objeto in _objetos(agregador.get_result()):
+            if isinstance(objeto, LTChar):
+                caracteres.append((objeto.x0, objeto.x1, (objeto.y0 + objeto.y1) / 2, objeto.size, objeto.get_text()))
+            elif isinstance(objeto, LTCurve) and objeto.height > 1:
+                # Bordes izquierdo y derecho de rectángulos (o una línea vertical)
+                bordes = {objeto.x0, objeto.x1} if objeto.width > 1 else {(objeto.x0 + objeto.x1) / 2}
+                verticales += [(x, objeto.y0, objeto.y1) for x in bordes]
+        yield PaginaPdf(_renglones(caracteres), verticales)
+
+
+_documento = None
+
+
+def _iniciar_proceso(contenido: bytes):
+    # Cada proceso del pool recibe el PDF una sola vez, no con cada página
+    global _documento
+    _documento = contenido
+
+
+def _leer_pagina(numero: int) -> PaginaPdf:
+    return next(_paginas(_documento, [numero]))
+
+
+def contar_paginas(contenido: bytes) -> int:
+    from pdfminer.pdfdocument import PDFDocument
+    from pdfminer.pdfpage import PDFPage
+    from pdfminer.pdfparser import PDFParser
+
+    documento = PDFDocument(PDFParser(io.BytesIO(contenido)))
+    return sum(1 for _ in PDFPage.create_pages(documento))
+
+
+def _agrupar(palabras: list, conocidos: dict) -> list:
+    """
+    Une palabras consecutivas que forman un título conocido ("HORA" + "INICIO").
+    Devuelve (texto, x0, x1, conocido) por grupo; conocido es el nombre canónico o None.
+    """
+    grupos = []
+    i = 0
+    while i < len(palabras):
+        for n in range(min(MAX_PALABRAS_TITULO, len(palabras) - i), 0, -1):
+            texto = " ".join(p.texto for p in palabras[i:i + n])
+            canonico = conocidos.get(normalizar_etiqueta(texto))
+            if canonico is not None or n == 1:
+                grupos.append((texto, palabras[i].x0, palabras[i + n - 1].x1, canonico))
+                i += n
+                break
+    return grupos
+
+
+def _titulos(renglon: Renglon):
+    """Títulos del grid si el renglón es el de títulos (trae PLAZA TRANS); si no, None."""
+    titulos = _agrupar(renglon.palabras, TITULOS_GRID)
+    if not any(canonico == "PLAZA TRANS" for _, _, _, canonico in titulos):
+        return None
+    return [(canonico or texto, x0, x1) for texto, x0, x1, canonico in titulos]
+
+
+def _columnas(titulos: list, verticales: list, y: float) -> tuple:
+    """
+    Límites izquierdos y nombres de las columnas del grid. Con bordes de celda se usan los
+    bordes que encierran a cada título; sin ellos, el punto medio entre títulos vecinos.
+    """
+    bordes = sorted({round(x, 1) for x, y0, y1 in verticales if y0 - 1 <= y <= y1 + 1})
+    izquierdas = []
+    for i, (_, x0, x1) in enumerate(titulos):
+        izquierda = (titulos[i - 1][2] + x0) / 2 if i else float("-inf")
+        centro = (x0 + x1) / 2
+        k = bisect.bisect_right(bordes, centro)
+        if k and (not izquierdas or bordes[k - 1] > izquierdas[-1]):
+            izquierda = bordes[k - 1]
+        izquierdas.append(izquierda)
+    izquierdas[0] = float("-inf")
+    return izquierdas, [nombre for nombre, _, _ in titulos]
+
+
+def _valor(texto: str):
+    """Números del PDF ("$1,500.00", "3") como número; lo demás se queda como texto."""
+    limpio = texto.replace(" ", "")
+    if not NUMERO.match(limpio):
+        return texto
+    numero = float(limpio.replace("$", "").replace(",", ""))
+    return int(numero) if numero.is_integer() and "." not in limpio else numero
+
+
+def _fila_grid(renglon: Renglon, izquierdas: list, nombres: list) -> dict:
+    celdas = {}
+    for palabra in renglon.palabras:
+        columna = nombres[bisect.bisect_right(izquierdas, (palabra.x0 + palabra.x1) / 2) - 1]
+        celdas.setdefault(columna, []).append(palabra.texto)
+    return {columna: _valor(" ".join(textos)) for columna, textos in celdas.items()}
+
+
+def _celdas_encabezado(renglon: Renglon) -> list:
+    """
+    Celdas de un renglón del encabezado: palabras cercanas forman una celda y una celda que
+    empieza con una etiqueta conocida seguida de ':' ("CLIENTE: POLLO LOCO") se separa en
+    etiqueta y valor.
+    """
+    grupos = []
+    for palabra in renglon.palabras:
+        if grupos and palabra.x0 - grupos[-1][-1].x1 <= SEPARACION_CELDAS * palabra.tamano:
+            grupos[-1].append(palabra)
+        else:
+            grupos.append([palabra])
+
+    celdas = []
+    for grupo in grupos:
+        textos = [p.texto for p in grupo]
+        for n in range(min(MAX_PALABRAS_TITULO, len(textos) - 1), 0, -1):
+            separada = textos[n - 1].endswith(":") or textos[n].startswith(":")
+            if separada and normalizar_etiqueta(" ".join(textos[:n])) in ETIQUETAS_ENCABEZADO:
+                celdas += [" ".join(textos[:n]), " ".join(textos[n:]).lstrip(": ").strip()]
+                break
+        else:
+            celdas.append(" ".join(textos))
+    return celdas
+
+
+def armar_pauta(paginas: list) -> PautaLeida:
+    """
+    Arma encabezado y transmisiones a partir de las páginas ya leídas. El encabezado son los
+    renglones antes de los títulos del grid; el grid, los renglones con PLAZA TRANS de esa
+    página y las siguientes (los títulos repetidos en cada página se vuelven a tomar).
+    """
+    if not any(pagina.renglones for pagina in paginas):
+        raise ValueError("El PDF no tiene texto (¿es una imagen escaneada?); no se puede leer la pauta.")
+
+    encabezado, filas = [], []
+    columnas = None
+    filas_ignoradas = False
+    for pagina in paginas:
+        for renglon in pagina.renglones:
+            titulos = _titulos(renglon)
+            if titulos is not None:
+                columnas = _columnas(titulos, pagina.verticales, renglon.y)
+            elif columnas is None:
+                encabezado.append(_celdas_encabezado(renglon))
+            else:
+                fila = _fila_grid(renglon, *columnas)
+                if len(fila) >= MIN_COLUMNAS_FILA and str(fila.get("PLAZA TRANS", "")).strip():
+                    filas.append(fila)
+                else:
+                    filas_ignoradas = True
+
+    ancho = max((len(celdas) for celdas in encabezado), default=0)
+    encabezado = pd.DataFrame([celdas + [None] * (ancho - len(celdas)) for celdas in encabezado])
+    if columnas is None:
+        return PautaLeida(encabezado, pd.DataFrame(), False)
+    nombres = list(dict.fromkeys(columnas[1]))
+    transmisiones = pd.DataFrame(filas, columns=nombres).infer_objects()
+    return PautaLeida(encabezado, transmisiones, filas_ignoradas)
+
+
+def leer_pdf_pauta(contenido: bytes, procesos: int = None, avance=None) -> PautaLeida:
+    """
+    Lee una pauta en PDF. Las páginas se extraen en paralelo (un proceso por CPU) cuando son
+    MIN_PAGINAS_PARALELO o más; avance(fraccion, mensaje) se llama al terminar cada página.
+    """
+    total = contar_paginas(contenido)
+
+    def reportar(hechas):
+        if avance is not None:
+            avance(hechas / total, f"{hechas} de {total} páginas leídas")
+
+    procesos = min(procesos or PROCESOS_PDF, total)
+    if procesos <= 1 or total < MIN_PAGINAS_PARALELO:
+        paginas = []
+        for pagina in _paginas(contenido):
+            paginas.append(pagina)
+            reportar(len(paginas))
+        return armar_pauta(paginas)
+
+    paginas = [None] * total
+    with ProcessPoolExecutor(max_workers=procesos, mp_context=contexto_procesos(),
+                             initializer=_iniciar_proceso, initargs=(contenido,)) as pool:
+        futuros = {pool.submit(_leer_pagina, numero): numero for numero in range(total)}
+        try:
+            for hechas, futuro in enumerate(as_completed(futuros), 1):
+                paginas[futuros[futuro]] = futuro.result()
+                reportar(hechas)
+        except BaseException:
+            for futuro in futuros:
+                futuro.cancel()
+            raise
+    return armar_pauta(paginas)
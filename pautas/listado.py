@@ -0,0 +1,183 @@
+from datetime import date, datetime, time
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+TAMANO_PAGINA = 50
+
+# Columna mostrada en el grid -> columna de la tabla PAUTAS
+COLUMNAS_LISTADO = {
+    "FOLIO INTERNO": "FOLIO_INTERNO",
+    "FOLIO F1": "FOLIO_F1",
+    "CLIENTE": "CLIENTE",
+    "AGENCIA": "AGENCIA",
+    "TIPO CONVENIO": "TIPO_CONVENIO",
+    "CAMPAÑA": "CAMPANA",
+    "INICIO CAMPAÑA": "INICIO_CAMPANA",
+    "FIN CAMPAÑA": "FIN_CAMPANA",
+    "TOTAL": "TOTAL",
+    "MONEDA": "MONEDA",
+    "ESTATUS CAMPAÑA": "ESTATUS_CAMPANA",
+    "ESTATUS OTC": "ESTATUS_OTC",
+    "FECHA CAPTURA": "FECHA_CAPTURA",
+    "PLAZA VENTA": "PLAZA_VENTA",
+    "EJECUTIVO": "EJECUTIVO",
+    # No se muestra: identifica la versión cargada al editar
+    "VERSION": "VERSION",
+}
+
+# Estatus OTC en el orden del flujo (también el orden de la categoría en el grid)
+ESTATUS_OTC = ["BORRADOR", "VENTAS", "CONTACTO COMERCIAL", "CAPTURA", "PROCESADO F1"]
+MONEDAS = ["MN", "USD", "EUR"]
+
+# Tipos del listado: el formato de moneda y fechas se aplica sólo al dibujar el grid
+COLUMNAS_FECHA = ["INICIO CAMPAÑA", "FIN CAMPAÑA", "FECHA CAPTURA"]
+COLUMNAS_CATEGORIA = {
+    "ESTATUS OTC": ESTATUS_OTC,
+    "MONEDA": MONEDAS,
+    "PLAZA VENTA": None,  # categorías tomadas de los datos
+}
+
+# Datos de ejemplo para trabajar sin conexión a Snowflake
+DATOS_EJEMPLO = {
+    "FOLIO INTERNO": ["FOLIO-001", "FOLIO-002", "FOLIO-003"],
+    "FOLIO F1": ["MTY0525277066", "",""],
+    "CLIENTE": ["POLLO LOCO", "POLLOS ASADOS OCHOA","POLLO LOCO"],
+    "AGENCIA": ["", "",""],
+    "TIPO CONVENIO": ["EFECTIVO", "FACTURACION ANTICIPADA","EFECTIVO"],
+    "CAMPAÑA": ["VERANO 2025", "BUEN FIN 2025","NAVIDAD 2025"],
+    "INICIO CAMPAÑA": pd.to_datetime(["2025-07-01", "2025-10-15", "2025-12-01"]),
+    "FIN CAMPAÑA": pd.to_datetime(["2025-07-31", "2025-10-31", "2025-12-31"]),
+    "TOTAL": [12000.0, 100000.0, 90000.0],
+    "MONEDA": ["MN", "MN","MN"],
+    "ESTATUS CAMPAÑA": ["EN PROCESO","PROGRAMADA", "PROGRAMADA"],
+    "ESTATUS OTC": ["PROCESADO F1", "CAPTURA", "CONTACTO COMERCIAL"],
+    "FECHA CAPTURA": pd.to_datetime(["2025-06-27", "2025-07-16", "2025-07-24"]),
+    "PLAZA VENTA": ["MONTERREY", "MONTERREY","MONTERREY"],
+    "EJECUTIVO": ["CRISTA REYNA", "CRISTA REYNA","CRISTA REYNA"],
+    "VERSION": [1, 1, 1]
+}
+
+
+def tipar_listado(pautas: pd.DataFrame) -> pd.DataFrame:
+    """
+    Columnas del listado con tipos nativos: fechas datetime64, TOTAL float, VERSION entero y
+    ESTATUS OTC / MONEDA / PLAZA VENTA categóricas. Ordenar y filtrar no reinterpreta texto.
+    """
+    pautas = pautas.copy()
+    for columna in COLUMNAS_FECHA:
+        pautas[columna] = pd.to_datetime(pautas[columna], errors="coerce")
+    pautas["TOTAL"] = pd.to_numeric(pautas["TOTAL"], errors="coerce").astype("float64")
+    pautas["VERSION"] = pd.to_numeric(pautas["VERSION"], errors="coerce").fillna(0).astype("int64")
+    for columna, categorias in COLUMNAS_CATEGORIA.items():
+        valores = pautas[columna].astype("string")
+        if categorias is None:
+            pautas[columna] = valores.astype("category")
+        else:
+            # Un valor fuera del catálogo se agrega al final en lugar de perderse
+            extra = sorted(set(valores.dropna()) - set(categorias))
+            pautas[columna] = pd.Categorical(valores, categories=categorias + extra)
+    return pautas
+
+
+class FiltrosListado(NamedTuple):
+    cliente: str = ""
+    agencia: str = ""
+    campana: str = ""
+    fecha_inicio: Optional[date] = None
+    fecha_fin: Optional[date] = None
+    estatus_otc: tuple = ()
+
+
+class PaginaListado(NamedTuple):
+    pautas: pd.DataFrame
+    # (FECHA CAPTURA, FOLIO INTERNO) de la última fila; None si no hay más páginas
+    siguiente: Optional[tuple]
+
+
+def _patron_like(texto: str) -> str:
+    escapado = texto.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escapado}%"
+
+
+def consulta_listado(filtros: FiltrosListado, cursor: tuple = None, tamano: int = TAMANO_PAGINA) -> tuple:
+    """
+    Arma la consulta parametrizada (qmark) de una página del listado.
+    Paginación por llave (keyset) sobre FECHA_CAPTURA DESC, FOLIO_INTERNO DESC:
+    la página siguiente empieza después del cursor de la anterior, sin OFFSET.
+    Se pide una fila extra para saber si existe otra página.
+    """
+    condiciones = []
+    parametros = []
+
+    for columna, texto in (("CLIENTE", filtros.cliente), ("AGENCIA", filtros.agencia), ("CAMPANA", filtros.campana)):
+        if texto and texto.strip():
+            condiciones.append(f"{columna} ILIKE ? ESCAPE '\\\\'")
+            parametros.append(_patron_like(texto))
+
+    if filtros.fecha_inicio:
+        condiciones.append("FECHA_CAPTURA >= ?")
+        parametros.append(datetime.combine(filtros.fecha_inicio, time.min))
+    if filtros.fecha_fin:
+        condiciones.append("FECHA_CAPTURA <= ?")
+        parametros.append(datetime.combine(filtros.fecha_fin, time.max))
+
+    if filtros.estatus_otc:
+        condiciones.append(f"ESTATUS_OTC IN ({', '.join('?' for _ in filtros.estatus_otc)})")
+        parametros.extend(filtros.estatus_otc)
+
+    if cursor is not None:
+        fecha_cursor, folio_cursor = cursor
+        condiciones.append("(FECHA_CAPTURA < ? OR (FECHA_CAPTURA = ? AND FOLIO_INTERNO < ?))")
+        parametros.extend([fecha_cursor, fecha_cursor, folio_cursor])
+
+    columnas = ",\n    ".join(f'{origen} AS "{destino}"' for destino, origen in COLUMNAS_LISTADO.items())
+    where = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+    sql = (
+        f"SELECT\n    {columnas}\nFROM PAUTAS\n{where}\n"
+        "ORDER BY FECHA_CAPTURA DESC, FOLIO_INTERNO DESC\n"
+        f"LIMIT {int(tamano) + 1}"
+    )
+    return sql, parametros
+
+
+def _paginar(pautas: pd.DataFrame, tamano: int) -> PaginaListado:
+    siguiente = None
+    if len(pautas) > tamano:
+        pautas = pautas.iloc[:tamano]
+        ultima = pautas.iloc[-1]
+        siguiente = (ultima["FECHA CAPTURA"], ultima["FOLIO INTERNO"])
+    return PaginaListado(pautas.reset_index(drop=True), siguiente)
+
+
+def listar_pautas(sesion, filtros: FiltrosListado, cursor: tuple = None,
+                  tamano: int = TAMANO_PAGINA) -> PaginaListado:
+    """Trae una sola página del listado aplicando los filtros en Snowflake."""
+    sql, parametros = consulta_listado(filtros, cursor, tamano)
+    pautas = sesion.sql(sql, params=parametros).to_pandas()
+    return _paginar(tipar_listado(pautas), tamano)
+
+
+def listar_pautas_ejemplo(filtros: FiltrosListado, cursor: tuple = None,
+                          tamano: int = TAMANO_PAGINA) -> PaginaListado:
+    """Mismos filtros y paginación que listar_pautas, sobre DATOS_EJEMPLO (sin Snowflake)."""
+    pautas = tipar_listado(pd.DataFrame(DATOS_EJEMPLO))
+    captura = pautas["FECHA CAPTURA"]
+
+    filtro = pd.Series(True, index=pautas.index)
+    for columna, texto in (("CLIENTE", filtros.cliente), ("AGENCIA", filtros.agencia), ("CAMPAÑA", filtros.campana)):
+        if texto and texto.strip():
+            filtro &= pautas[columna].str.contains(texto.strip(), case=False, regex=False)
+    if filtros.fecha_inicio:
+        filtro &= captura >= pd.Timestamp(filtros.fecha_inicio)
+    if filtros.fecha_fin:
+        filtro &= captura < pd.Timestamp(filtros.fecha_fin) + pd.Timedelta(days=1)
+    if filtros.estatus_otc:
+        filtro &= pautas["ESTATUS OTC"].isin(filtros.estatus_otc)
+    if cursor is not None:
+        fecha_cursor = pd.Timestamp(cursor[0])
+        filtro &= (captura < fecha_cursor) | ((captura == fecha_cursor) & (pautas["FOLIO INTERNO"] < cursor[1]))
+
+    orden = pd.DataFrame({"captura": captura, "folio": pautas["FOLIO INTERNO"]})[filtro]
+    orden = orden.sort_values(["captura", "folio"], ascending=False)
+    return _paginar(pautas.loc[orden.index], tamano)
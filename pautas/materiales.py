@@ -0,0 +1,90 @@
+import hashlib
+import os
+import threading
+from typing import NamedTuple
+
+# Stage interno donde se guardan los archivos de materiales, direccionados por contenido
+ETAPA_MATERIALES = "@MATERIALES_STAGE"
+# Bloque de lectura para calcular el hash sin duplicar el archivo en memoria
+TAMANO_BLOQUE = 1024 * 1024
+# A partir de este tamaño el PUT se parte en piezas que suben en paralelo
+UMBRAL_MULTIPARTE = 64 * 1024 * 1024
+PARTES_PARALELAS = 4
+
+
+class ReferenciaMaterial(NamedTuple):
+    hash: str
+    ruta: str
+    nombre: str
+    tamano: int
+    subido: bool
+
+
+def hash_archivo(archivo) -> str:
+    """sha256 del archivo leído por bloques; deja el cursor al inicio."""
+    digest = hashlib.sha256()
+    archivo.seek(0)
+    for bloque in iter(lambda: archivo.read(TAMANO_BLOQUE), b""):
+        digest.update(bloque)
+    archivo.seek(0)
+    return digest.hexdigest()
+
+
+def tamano_archivo(archivo) -> int:
+    archivo.seek(0, os.SEEK_END)
+    tamano = archivo.tell()
+    archivo.seek(0)
+    return tamano
+
+
+def ruta_material(digest: str, nombre: str) -> str:
+    """Ruta en el stage por contenido: el mismo archivo siempre cae en la misma ruta."""
+    extension = os.path.splitext(nombre)[1].lower()
+    return f"{ETAPA_MATERIALES}/{digest[:2]}/{digest}{extension}"
+
+
+class RegistroEtapa:
+    """Hashes que ya se sabe que están en el stage, para no repetir el LIST en cada subida."""
+
+    def __init__(self):
+        self._conocidos = set()
+        self._candado = threading.Lock()
+
+    def contiene(self, sesion, ruta: str) -> bool:
+        with self._candado:
+            if ruta in self._conocidos:
+                return True
+        existe = bool(sesion.sql(f"LIST '{ruta}'").collect())
+        if existe:
+            self.agregar(ruta)
+        return existe
+
+    def agregar(self, ruta: str):
+        with self._candado:
+            self._conocidos.add(ruta)
+
+
+registro_etapa = RegistroEtapa()
+
+
+def subir_material(sesion, archivo, nombre: str = None) -> ReferenciaMaterial:
+    """
+    Sube el archivo al stage de materiales si su contenido no está ya guardado.
+    El PUT lee el archivo como stream; los archivos grandes (mp4) se suben en
+    partes paralelas. Devuelve sólo la referencia (hash y ruta), no el contenido.
+    """
+    nombre = nombre or archivo.name
+    digest = hash_archivo(archivo)
+    ruta = ruta_material(digest, nombre)
+    tamano = tamano_archivo(archivo)
+
+    if registro_etapa.contiene(sesion, ruta):
+        return ReferenciaMaterial(digest, ruta, nombre, tamano, False)
+
+    paralelo = PARTES_PARALELAS if tamano >= UMBRAL_MULTIPARTE else 1
+    sesion.file.put_stream(
+        archivo, ruta, parallel=paralelo, auto_compress=False, source_compression="NONE", overwrite=False
+    )
+    archivo.seek(0)
+    registro_etapa.agregar(ruta)
+    return ReferenciaMaterial(digest, ruta, nombre, tamano, True)
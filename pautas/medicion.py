@@ -0,0 +1,325 @@
+"""
+Medición de tiempos por rerun: cada sección envuelta en medir("nombre") registra su
+latencia, las filas y columnas que procesó y el cambio de memoria del proceso.
+
+Se activa para todo el proceso con MEDICION=1 o por sesión (?medicion=1, ver
+componentes.medicion). Sin un rerun medido en curso medir() devuelve un tramo vacío,
+así que el costo desactivado es leer una ContextVar.
+
+Cada rerun terminado se escribe como una línea JSON en el logger "pautas.medicion" y se
+acumula en registro_mediciones, que se exporta en formato de texto de Prometheus (y se
+sirve en /metrics si MEDICION_PUERTO está definido).
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Mide todos los reruns del proceso (no sólo los de las sesiones que lo piden)
+MEDICION_GLOBAL = os.getenv("MEDICION", "") == "1"
+# Puerto del endpoint /metrics (0 = sin servidor) y la interfaz donde escucha
+PUERTO_METRICAS = int(os.getenv("MEDICION_PUERTO", "0") or 0)
+HOST_METRICAS = os.getenv("MEDICION_HOST", "127.0.0.1")
+# Reruns recientes que se conservan para el panel y la exportación JSON
+MAX_RERUNS = 50
+# Límites (segundos) del histograma de latencia
+LIMITES_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_rerun_actual = contextvars.ContextVar("rerun_medido", default=None)
+# Anidamiento de tramos en el hilo actual (un trabajo de fondo lleva su propia copia)
+_nivel = contextvars.ContextVar("nivel_medicion", default=0)
+
+try:
+    _BYTES_PAGINA = os.sysconf("SC_PAGE_SIZE")
+except (AttributeError, ValueError, OSError):
+    _BYTES_PAGINA = 4096
+
+
+def memoria_proceso() -> int:
+    """Memoria residente del proceso en bytes (0 si el sistema no la expone en /proc)."""
+    try:
+        with open("/proc/self/statm") as archivo:
+            return int(archivo.read().split()[1]) * _BYTES_PAGINA
+    except (OSError, IndexError, ValueError):
+        return 0
+
+
+class RerunMedido:
+    """Tramos de un rerun (o de un fragmento) medido; se cierra con terminar_rerun."""
+
+    __slots__ = ("sesion", "numero", "pagina", "inicio", "memoria", "tramos", "abierto", "_candado")
+
+    def __init__(self, sesion: str, numero: int, pagina: str = ""):
+        self.sesion = sesion
+        self.numero = numero
+        self.pagina = pagina
+        self.tramos = []
+        self.abierto = True
+        self._candado = threading.Lock()
+        self.memoria = memoria_proceso()
+        self.inicio = time.perf_counter()
+
+    def agregar(self, tramo: dict) -> bool:
+        """Agrega el tramo si el rerun sigue abierto (los de trabajos de fondo pueden llegar tarde)."""
+        with self._candado:
+            if self.abierto:
+                self.tramos.append(tramo)
+            return self.abierto
+
+
+class Tramo:
+    """Sección medida: se usa como `with medir("seccion") as tramo: ... tramo.dimensiones(df)`."""
+
+    __slots__ = ("rerun", "seccion", "filas", "columnas", "nivel", "_token", "_inicio", "_memoria")
+
+    def __init__(self, rerun: RerunMedido, seccion: str, filas: int = None, columnas: int = None):
+        self.rerun = rerun
+        self.seccion = seccion
+        self.filas = filas
+        self.columnas = columnas
+
+    def dimensiones(self, datos=None, filas: int = None, columnas: int = None):
+        """Filas y columnas procesadas, tomadas de un DataFrame (datos.shape) o dadas a mano."""
+        if datos is not None:
+            filas, columnas = datos.shape
+        self.filas, self.columnas = filas, columnas
+
+    def __enter__(self):
+        self.nivel = _nivel.get()
+        self._token = _nivel.set(self.nivel + 1)
+        self._memoria = memoria_proceso()
+        self._inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, tipo, error, traza):
+        duracion = time.perf_counter() - self._inicio
+        _nivel.reset(self._token)
+        tramo = {
+            "seccion": self.seccion,
+            "nivel": self.nivel,
+            "desde": round(self._inicio - self.rerun.inicio, 6),
+            "segundos": round(duracion, 6),
+            "filas": self.filas,
+            "columnas": self.columnas,
+            "memoria_bytes": memoria_proceso() - self._memoria,
+            "error": tipo.__name__ if tipo is not None else None,
+        }
+        if not self.rerun.agregar(tramo):
+            registro_mediciones.acumular(tramo)
+        return False
+
+
+class _TramoVacio:
+    """Lo que devuelve medir() sin medición activa: no registra nada."""
+
+    __slots__ = ()
+
+    def dimensiones(self, datos=None, filas: int = None, columnas: int = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, error, traza):
+        return False
+
+
+_TRAMO_VACIO = _TramoVacio()
+
+
+def medir(seccion: str, filas: int = None, columnas: int = None):
+    """Tramo de la sección dentro del rerun medido en curso (o uno vacío si no hay)."""
+    rerun = _rerun_actual.get()
+    if rerun is None:
+        return _TRAMO_VACIO
+    return Tramo(rerun, seccion, filas, columnas)
+
+
+def midiendo() -> bool:
+    return _rerun_actual.get() is not None
+
+
+def iniciar_rerun(sesion: str, numero: int, pagina: str = "") -> RerunMedido:
+    """Abre el rerun medido del hilo actual; los medir() siguientes se registran en él."""
+    rerun = RerunMedido(sesion, numero, pagina)
+    _rerun_actual.set(rerun)
+    return rerun
+
+
+def terminar_rerun(rerun: RerunMedido) -> dict:
+    """Cierra el rerun, lo acumula en registro_mediciones y lo escribe como JSON en el log."""
+    segundos = time.perf_counter() - rerun.inicio
+    with rerun._candado:
+        rerun.abierto = False
+    if _rerun_actual.get() is rerun:
+        # El hilo del script se reutiliza entre reruns: sin limpiar, el siguiente quedaría medido
+        _rerun_actual.set(None)
+    resultado = {
+        "sesion": rerun.sesion,
+        "rerun": rerun.numero,
+        "pagina": rerun.pagina,
+        "inicio": time.time() - segundos,
+        "segundos": round(segundos, 6),
+        "memoria_bytes": memoria_proceso() - rerun.memoria,
+        "tramos": rerun.tramos,
+    }
+    registro_mediciones.registrar(resultado)
+    logger.info(json.dumps(resultado, ensure_ascii=False, default=str))
+    return resultado
+
+
+def _etiqueta(valor: str) -> str:
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Acumulado:
+    __slots__ = ("cuenta", "suma", "maximo", "cubetas", "filas", "memoria")
+
+    def __init__(self):
+        self.cuenta = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+        self.cubetas = [0] * len(LIMITES_LATENCIA)
+        self.filas = 0
+        self.memoria = 0
+
+    def sumar(self, segundos: float, filas, memoria: int):
+        self.cuenta += 1
+        self.suma += segundos
+        self.maximo = max(self.maximo, segundos)
+        for i, limite in enumerate(LIMITES_LATENCIA):
+            if segundos <= limite:
+                self.cubetas[i] += 1
+        self.filas += filas or 0
+        self.memoria += memoria
+
+
+class RegistroMediciones:
+    """
+    Acumulados del proceso por sección (cuenta, suma, máximo e histograma de latencia,
+    filas y memoria) más los últimos MAX_RERUNS reruns completos para el panel.
+    """
+
+    def __init__(self, maximo: int = MAX_RERUNS):
+        self.reruns = 0
+        self._secciones = {}  # sección -> _Acumulado
+        self._total = _Acumulado()
+        self._recientes = deque(maxlen=maximo)
+        self._candado = threading.Lock()
+
+    def _acumular(self, tramo: dict):
+        acumulado = self._secciones.get(tramo["seccion"])
+        if acumulado is None:
+            acumulado = self._secciones[tramo["seccion"]] = _Acumulado()
+        acumulado.sumar(tramo["segundos"], tramo["filas"], tramo["memoria_bytes"])
+
+    def acumular(self, tramo: dict):
+        """Suma un tramo que terminó después de su rerun (p. ej. en un trabajo de fondo)."""
+        with self._candado:
+            self._acumular(tramo)
+
+    def registrar(self, rerun: dict):
+        with self._candado:
+            self.reruns += 1
+            self._total.sumar(rerun["segundos"], None, rerun["memoria_bytes"])
+            for tramo in rerun["tramos"]:
+                self._acumular(tramo)
+            self._recientes.append(rerun)
+
+    def recientes(self, sesion: str = None) -> list:
+        with self._candado:
+            return [r for r in self._recientes if sesion is None or r["sesion"] == sesion]
+
+    def secciones(self) -> list:
+        """Una fila por sección: cuenta, promedio y máximo (ms), filas y memoria acumuladas."""
+        with self._candado:
+            return [
+                {"SECCION": seccion, "VECES": a.cuenta, "PROMEDIO MS": a.suma / a.cuenta * 1000,
+                 "MAXIMO MS": a.maximo * 1000, "FILAS": a.filas, "MEMORIA MB": a.memoria / 2 ** 20}
+                for seccion, a in sorted(self._secciones.items())
+            ]
+
+    def json(self, sesion: str = None) -> str:
+        """Reruns recientes (de la sesión, o todos) como líneas JSON."""
+        return "\n".join(json.dumps(r, ensure_ascii=False, default=str) for r in self.recientes(sesion))
+
+    def prometheus(self) -> str:
+        """Acumulados en el formato de texto de exposición de Prometheus."""
+        with self._candado:
+            lineas = [
+                "# HELP pautas_reruns_total Reruns medidos.",
+                "# TYPE pautas_reruns_total counter",
+                f"pautas_reruns_total {self.reruns}",
+                "# HELP pautas_rerun_segundos Duración de cada rerun medido.",
+                "# TYPE pautas_rerun_segundos histogram",
+            ]
+            _histograma(lineas, "pautas_rerun_segundos", self._total)
+            secciones = [(_etiqueta(s), a) for s, a in sorted(self._secciones.items())]
+            lineas += ["# HELP pautas_seccion_segundos Duración de cada sección medida.",
+                       "# TYPE pautas_seccion_segundos histogram"]
+            for seccion, acumulado in secciones:
+                _histograma(lineas, "pautas_seccion_segundos", acumulado, f'seccion="{seccion}"')
+            lineas += ["# HELP pautas_seccion_filas_total Filas procesadas por sección.",
+                       "# TYPE pautas_seccion_filas_total counter"]
+            lineas += [f'pautas_seccion_filas_total{{seccion="{s}"}} {a.filas}' for s, a in secciones]
+            lineas += ["# HELP pautas_seccion_memoria_bytes_total Cambio acumulado de memoria residente por sección.",
+                       "# TYPE pautas_seccion_memoria_bytes_total counter"]
+            lineas += [f'pautas_seccion_memoria_bytes_total{{seccion="{s}"}} {a.memoria}' for s, a in secciones]
+        return "\n".join(lineas) + "\n"
+
+
+def _histograma(lineas: list, metrica: str, acumulado: _Acumulado, etiquetas: str = ""):
+    previas = f"{etiquetas}," if etiquetas else ""
+    for limite, cuenta in zip(LIMITES_LATENCIA, acumulado.cubetas):
+        lineas.append(f'{metrica}_bucket{{{previas}le="{limite}"}} {cuenta}')
+    lineas.append(f'{metrica}_bucket{{{previas}le="+Inf"}} {acumulado.cuenta}')
+    sufijo = f"{{{etiquetas}}}" if etiquetas else ""
+    lineas.append(f"{metrica}_sum{sufijo} {acumulado.suma:.6f}")
+    lineas.append(f"{metrica}_count{sufijo} {acumulado.cuenta}")
+
+
+registro_mediciones = RegistroMediciones()
+
+_servidor = None
+_candado_servidor = threading.Lock()
+
+
+class _ManejadorMetricas(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        cuerpo = registro_mediciones.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def iniciar_servidor(puerto: int = PUERTO_METRICAS, host: str = HOST_METRICAS):
+    """Sirve /metrics en un hilo de fondo (una vez por proceso; no hace nada sin puerto)."""
+    global _servidor
+    if not puerto or _servidor is not None:
+        return
+    with _candado_servidor:
+        if _servidor is not None:
+            return
+        try:
+            _servidor = ThreadingHTTPServer((host, puerto), _ManejadorMetricas)
+        except OSError as e:
+            # Otro proceso ya ocupa el puerto: no se vuelve a intentar en cada rerun
+            logger.warning("No se pudo abrir el endpoint de métricas en %s:%s: %s", host, puerto, e)
+            _servidor = False
+            return
+        threading.Thread(target=_servidor.serve_forever, name="medicion-metricas", daemon=True).start()
@@ -0,0 +1,71 @@
+import threading
+import time
+
+import pandas as pd
+
+from pautas.listado import DATOS_EJEMPLO, ESTATUS_OTC
+
+# Segundos que se reutilizan las métricas de un usuario antes de volver a consultarlas
+TTL_METRICAS = 120
+
+CONSULTA_METRICAS = """
+SELECT ESTATUS_OTC, COUNT(*) AS PAUTAS
+FROM PAUTAS
+WHERE CAPTURADO_POR = ?
+GROUP BY ESTATUS_OTC
+"""
+
+
+def _conteos(filas) -> dict:
+    conteos = {estatus: 0 for estatus in ESTATUS_OTC}
+    for estatus, pautas in filas:
+        conteos[estatus] = conteos.get(estatus, 0) + int(pautas)
+    conteos["TOTAL"] = sum(conteos.values())
+    return conteos
+
+
+def consultar_metricas(sesion, usuario: str) -> dict:
+    """Conteo de pautas del usuario por ESTATUS OTC en una sola consulta agregada."""
+    filas = sesion.sql(CONSULTA_METRICAS, params=[usuario]).collect()
+    return _conteos((fila["ESTATUS_OTC"], fila["PAUTAS"]) for fila in filas)
+
+
+def metricas_ejemplo(usuario: str) -> dict:
+    """Mismos conteos sobre DATOS_EJEMPLO, para trabajar sin Snowflake."""
+    conteos = pd.Series(DATOS_EJEMPLO["ESTATUS OTC"]).value_counts()
+    return _conteos(conteos.items())
+
+
+class CacheMetricas:
+    """
+    Métricas por usuario con expiración. Si varias sesiones del mismo usuario las piden a la
+    vez sólo una consulta; las demás esperan y reutilizan el resultado.
+    """
+
+    def __init__(self, ttl: float = TTL_METRICAS):
+        self.ttl = ttl
+        self._valores = {}  # usuario -> (expira, métricas)
+        self._candados = {}
+        self._candado = threading.Lock()
+
+    def _candado_usuario(self, usuario: str) -> threading.Lock:
+        with self._candado:
+            return self._candados.setdefault(usuario, threading.Lock())
+
+    def obtener(self, usuario: str, consultar) -> dict:
+        """Métricas vigentes del usuario; llama consultar(usuario) sólo si expiraron."""
+        with self._candado_usuario(usuario):
+            guardado = self._valores.get(usuario)
+            if guardado and guardado[0] > time.monotonic():
+                return guardado[1]
+            metricas = consultar(usuario)
+            self._valores[usuario] = (time.monotonic() + self.ttl, metricas)
+            return metricas
+
+    def invalidar(self, usuario: str):
+        """Descarta las métricas del usuario (al guardar un borrador o enviar una campaña)."""
+        with self._candado_usuario(usuario):
+            self._valores.pop(usuario, None)
+
+
+cache_metricas = CacheMetricas()
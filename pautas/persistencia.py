@@ -0,0 +1,173 @@
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from pautas.calendario import COLUMNAS_INICIALES, CalendarioSpots
+from pautas.convenios import movimientos_convenio, sentencia_saldos
+
+# Columnas del encabezado que se guardan en PAUTAS (además de FOLIO_INTERNO y CAPTURADO_POR)
+COLUMNAS_PAUTA = [
+    "CLIENTE", "AGENCIA", "MARCA", "TIPO_CONVENIO", "NOMBRE_CONVENIO", "ANUNCIA", "CAMPANA",
+    "INICIO_CAMPANA", "FIN_CAMPANA", "NUMERO_ORDEN", "EJECUTIVO", "NOMBRE_EVENTO", "FACTURAR_A",
+    "ES_CLIENTE_NUEVO", "ES_AGREGADO", "FIRMA_PAGARE", "PLAZA_VENTA",
+    "TOTAL_IMPACTOS", "SUBTOTAL", "TIPO_IVA", "IVA", "TOTAL", "MONEDA",
+    "ESTATUS_CAMPANA", "ESTATUS_OTC",
+    "OBSERVACIONES_MATERIALES", "INDICACIONES_TALENTOS", "INDICACIONES_COBRANZA",
+]
+
+# Columna del grid de transmisiones -> columna de PAUTA_TRANSMISIONES
+COLUMNAS_TRANSMISION = {col: col.replace(" ", "_") for col in COLUMNAS_INICIALES}
+
+# Llave del material en session_state -> columna de PAUTA_MATERIALES
+COLUMNAS_MATERIAL = {
+    "Nombre": "NOMBRE",
+    "Archivo": "ARCHIVO",
+    "Versión": "VERSION",
+    "Tipo": "TIPO",
+    "Duración": "DURACION",
+    "Hash": "HASH_CONTENIDO",
+    "Ruta": "RUTA_ETAPA",
+}
+
+
+def formato_folio(numero: int) -> str:
+    return f"FOLIO-{numero:03}"
+
+
+def siguiente_folio(sesion) -> str:
+    """Folio nuevo desde la secuencia SEQ_FOLIO_PAUTA; no choca entre vendedores concurrentes."""
+    numero = sesion.sql("SELECT SEQ_FOLIO_PAUTA.NEXTVAL AS FOLIO").collect()[0]["FOLIO"]
+    return formato_folio(int(numero))
+
+
+def filas_capturadas(calendario: CalendarioSpots) -> CalendarioSpots:
+    """Descarta las filas agregadas en el editor sin PLAZA TRANS (filas en blanco)."""
+    plaza = calendario.descriptores["PLAZA TRANS"]
+    capturadas = (plaza.notna() & (plaza.astype(str).str.strip() != "")).to_numpy()
+    return calendario.seleccionar(capturadas)
+
+
+def tablas_transmision(folio: str, calendario: CalendarioSpots, numeros_fila=None) -> tuple:
+    """
+    Filas de PAUTA_TRANSMISIONES (descriptores) y de PAUTA_SPOTS (sólo días con spots)
+    listas para carga masiva. numeros_fila es el FILA de cada renglón (por defecto 0..n-1).
+    """
+    numeros_fila = np.arange(len(calendario.descriptores)) if numeros_fila is None else np.asarray(numeros_fila)
+    filas = calendario.descriptores.reindex(columns=COLUMNAS_INICIALES).rename(columns=COLUMNAS_TRANSMISION)
+    for columna in ("TOTAL_IMPACTOS", "TARIFA", "TOTAL_INVERSION"):
+        filas[columna] = pd.to_numeric(filas[columna], errors="coerce").fillna(0)
+    texto = [c for c in filas.columns if c not in ("TOTAL_IMPACTOS", "TARIFA", "TOTAL_INVERSION")]
+    filas[texto] = filas[texto].astype("string")
+    filas.insert(0, "FILA", numeros_fila)
+    filas.insert(0, "FOLIO_INTERNO", folio)
+
+    spots = calendario.registros()
+    spots["FILA"] = numeros_fila[spots["FILA"].to_numpy()]
+    spots["FECHA"] = spots["FECHA"].dt.date
+    spots.insert(0, "FOLIO_INTERNO", folio)
+    return filas, spots
+
+
+def tabla_materiales(folio: str, materiales: list) -> pd.DataFrame:
+    tabla = pd.DataFrame(materiales, columns=list(COLUMNAS_MATERIAL)).rename(columns=COLUMNAS_MATERIAL)
+    tabla = tabla.astype("string")
+    tabla.insert(0, "FOLIO_INTERNO", folio)
+    return tabla
+
+
+def _cargar_temporal(sesion, tabla: pd.DataFrame, nombre: str) -> str:
+    """Carga columnar (Parquet en stage + COPY INTO) a una tabla temporal de la sesión."""
+    sesion.write_pandas(
+        tabla, nombre, auto_create_table=True, table_type="temporary", overwrite=True
+    )
+    return nombre
+
+
+def siguiente_folios(sesion, cantidad: int) -> list:
+    """Varios folios nuevos de SEQ_FOLIO_PAUTA en una sola consulta (cargas en bloque)."""
+    filas = sesion.sql(
+        f"SELECT SEQ_FOLIO_PAUTA.NEXTVAL AS FOLIO FROM TABLE(GENERATOR(ROWCOUNT => {int(cantidad)}))"
+    ).collect()
+    return [formato_folio(numero) for numero in sorted(int(f["FOLIO"]) for f in filas)]
+
+
+def guardar_pautas(sesion, pautas: list, usuario: str, folios: list = None) -> list:
+    """
+    Guarda varias pautas (encabezado, calendario, materiales) de forma atómica: todas o ninguna.
+    Las filas de todas las pautas se cargan primero en bloque a tablas temporales (fuera de la
+    transacción, porque crear el stage/tabla temporal es DDL) y después se copian con
+    INSERT ... SELECT dentro de una sola transacción. En la misma transacción se suman a
+    CONVENIOS los montos de las pautas que consumen convenio. Devuelve los folios en el mismo orden.
+    """
+    for encabezado, _, _ in pautas:
+        desconocidas = set(encabezado) - set(COLUMNAS_PAUTA)
+        if desconocidas:
+            raise ValueError(f"Columnas de encabezado desconocidas: {sorted(desconocidas)}")
+    if not pautas:
+        return []
+
+    if folios is None:
+        folios = [siguiente_folio(sesion)] if len(pautas) == 1 else siguiente_folios(sesion, len(pautas))
+    tablas_filas, tablas_spots, tablas_mat = [], [], []
+    for folio, (_, calendario, materiales) in zip(folios, pautas):
+        filas, spots = tablas_transmision(folio, filas_capturadas(calendario))
+        tablas_filas.append(filas)
+        tablas_spots.append(spots)
+        tablas_mat.append(tabla_materiales(folio, materiales))
+
+    sufijo = uuid.uuid4().hex[:12].upper()
+    cargas = {
+        "PAUTA_TRANSMISIONES": (pd.concat(tablas_filas, ignore_index=True), f"TMP_TRANSMISIONES_{sufijo}"),
+        "PAUTA_SPOTS": (pd.concat(tablas_spots, ignore_index=True), f"TMP_SPOTS_{sufijo}"),
+        "PAUTA_MATERIALES": (pd.concat(tablas_mat, ignore_index=True), f"TMP_MATERIALES_{sufijo}"),
+    }
+
+    # Un solo INSERT multi-fila para los encabezados; las columnas son las de todas las pautas
+    columnas_encabezado = list(dict.fromkeys(c for encabezado, _, _ in pautas for c in encabezado))
+    columnas = ["FOLIO_INTERNO", "CAPTURADO_POR"] + columnas_encabezado
+    valores = []
+    for folio, (encabezado, _, _) in zip(folios, pautas):
+        valores += [folio, usuario] + [encabezado.get(c) for c in columnas_encabezado]
+    fila_valores = f"({', '.join('?' for _ in columnas)})"
+    insertar_pautas = (
+        f"INSERT INTO PAUTAS ({', '.join(columnas)}) "
+        f"VALUES {', '.join(fila_valores for _ in pautas)}"
+    )
+    movimientos = movimientos_convenio([], [encabezado for encabezado, _, _ in pautas])
+
+    cargadas = []
+    en_transaccion = False
+    try:
+        for tabla, temporal in cargas.values():
+            if not tabla.empty:
+                cargadas.append(_cargar_temporal(sesion, tabla, temporal))
+
+        sesion.sql("BEGIN TRANSACTION").collect()
+        en_transaccion = True
+        sesion.sql(insertar_pautas, params=valores).collect()
+        for destino, (tabla, temporal) in cargas.items():
+            if tabla.empty:
+                continue
+            lista = ", ".join(f'"{c}"' for c in tabla.columns)
+            sesion.sql(f"INSERT INTO {destino} ({lista}) SELECT {lista} FROM {temporal}").collect()
+        if not movimientos.empty:
+            sql, parametros = sentencia_saldos(movimientos)
+            sesion.sql(sql, params=parametros).collect()
+        sesion.sql("COMMIT").collect()
+        en_transaccion = False
+    except Exception:
+        if en_transaccion:
+            sesion.sql("ROLLBACK").collect()
+        raise
+    finally:
+        for temporal in cargadas:
+            sesion.sql(f"DROP TABLE IF EXISTS {temporal}").collect()
+    return list(folios)
+
+
+def guardar_pauta(sesion, encabezado: dict, calendario: CalendarioSpots, materiales: list,
+                  usuario: str, folio: str = None) -> str:
+    """Guarda encabezado, transmisiones, spots y materiales de una pauta de forma atómica. Devuelve el folio asignado."""
+    return guardar_pautas(sesion, [(encabezado, calendario, materiales)], usuario,
+                          [folio] if folio else None)[0]
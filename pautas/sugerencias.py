@@ -0,0 +1,170 @@
+import bisect
+import threading
+import unicodedata
+from collections import defaultdict
+
+import numpy as np
+
+from pautas.listado import DATOS_EJEMPLO
+
+# Campos con sugerencias (columna de PAUTAS) y su columna en el listado de ejemplo
+CAMPOS_SUGERENCIA = {
+    "CLIENTE": "CLIENTE",
+    "AGENCIA": "AGENCIA",
+    "CAMPANA": "CAMPAÑA",
+}
+# Sugerencias que se muestran por campo
+MAX_SUGERENCIAS = 5
+# Parecido mínimo (trigramas en común / trigramas de ambos) para sugerir un nombre que no empieza igual
+SIMILITUD_MINIMA = 0.3
+
+# Nombres distintos por campo en una sola consulta; el índice se arma una vez por proceso
+CONSULTA_NOMBRES = "\nUNION ALL\n".join(
+    f"SELECT '{columna}' AS CAMPO, {columna} AS NOMBRE FROM PAUTAS WHERE {columna} <> '' GROUP BY {columna}"
+    for columna in CAMPOS_SUGERENCIA
+)
+
+
+def normalizar(texto) -> str:
+    """Clave de búsqueda: mayúsculas, sin acentos y sin espacios de más."""
+    texto = unicodedata.normalize("NFKD", str(texto or ""))
+    return " ".join("".join(c for c in texto if not unicodedata.combining(c)).upper().split())
+
+
+def trigramas(clave: str) -> set:
+    relleno = f"  {clave} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+class IndiceNombres:
+    """
+    Nombres conocidos de un campo con dos accesos: las claves ordenadas (búsqueda binaria
+    por prefijo) y los trigramas de cada nombre (parecido con errores de captura). Los
+    nombres sólo se agregan; las listas de trigramas se pasan a numpy al consultarlas.
+    """
+
+    def __init__(self, nombres=()):
+        self._nombres = []  # id -> nombre como se capturó
+        self._tamanos = []  # id -> trigramas distintos del nombre
+        self._ids = {}  # clave -> id
+        self._ordenadas = []  # claves ordenadas para el prefijo
+        self._trigramas = defaultdict(list)  # trigrama -> ids
+        self._arreglos = {}  # trigrama -> ids en numpy (se descarta al agregar)
+        self._tamanos_np = None
+        for nombre in nombres:
+            self.agregar(nombre)
+
+    def __len__(self):
+        return len(self._nombres)
+
+    def agregar(self, nombre) -> bool:
+        clave = normalizar(nombre)
+        if not clave or clave in self._ids:
+            return False
+        id_nombre = len(self._nombres)
+        self._nombres.append(" ".join(str(nombre).split()))
+        self._ids[clave] = id_nombre
+        bisect.insort(self._ordenadas, clave)
+        grupos = trigramas(clave)
+        self._tamanos.append(len(grupos))
+        self._tamanos_np = None
+        for trigrama in grupos:
+            self._trigramas[trigrama].append(id_nombre)
+            self._arreglos.pop(trigrama, None)
+        return True
+
+    def contiene(self, texto) -> bool:
+        return normalizar(texto) in self._ids
+
+    def _postings(self, trigrama: str) -> np.ndarray:
+        arreglo = self._arreglos.get(trigrama)
+        if arreglo is None:
+            arreglo = self._arreglos[trigrama] = np.asarray(self._trigramas.get(trigrama, ()), dtype=np.int32)
+        return arreglo
+
+    def buscar(self, texto, limite: int = MAX_SUGERENCIAS) -> list:
+        """Nombres que empiezan con texto (en orden alfabético) y después los más parecidos."""
+        clave = normalizar(texto)
+        if not clave or not self._nombres:
+            return []
+        encontrados = []
+        i = bisect.bisect_left(self._ordenadas, clave)
+        while i < len(self._ordenadas) and len(encontrados) < limite and self._ordenadas[i].startswith(clave):
+            encontrados.append(self._ids[self._ordenadas[i]])
+            i += 1
+
+        if len(encontrados) < limite:
+            grupos = trigramas(clave)
+            postings = [self._postings(t) for t in grupos if t in self._trigramas]
+            if postings:
+                comunes = np.bincount(np.concatenate(postings), minlength=len(self._nombres))
+                if self._tamanos_np is None:
+                    self._tamanos_np = np.asarray(self._tamanos, dtype=np.int32)
+                # comunes / (q + tamaño - comunes) >= S, sin dividir sobre todo el índice
+                candidatos = np.flatnonzero(
+                    comunes * (1 + SIMILITUD_MINIMA) >= SIMILITUD_MINIMA * (len(grupos) + self._tamanos_np)
+                )
+                compartidos = comunes[candidatos]
+                similitud = compartidos / (len(grupos) + self._tamanos_np[candidatos] - compartidos)
+                orden = np.argsort(-similitud, kind="stable")[:limite + len(encontrados)]
+                vistos = set(encontrados)
+                for id_nombre in candidatos[orden].tolist():
+                    if len(encontrados) == limite:
+                        break
+                    if id_nombre not in vistos:
+                        encontrados.append(id_nombre)
+        return [self._nombres[i] for i in encontrados]
+
+
+def consultar_nombres(sesion) -> dict:
+    """Nombres distintos por campo (CAMPOS_SUGERENCIA) capturados en PAUTAS."""
+    nombres = {campo: [] for campo in CAMPOS_SUGERENCIA}
+    for fila in sesion.sql(CONSULTA_NOMBRES).collect():
+        nombres[fila["CAMPO"]].append(fila["NOMBRE"])
+    return nombres
+
+
+def nombres_ejemplo() -> dict:
+    return {campo: list(DATOS_EJEMPLO[columna]) for campo, columna in CAMPOS_SUGERENCIA.items()}
+
+
+class CatalogoNombres:
+    """
+    Un IndiceNombres por campo, compartido por todas las sesiones del proceso. Se arma con
+    una sola consulta la primera vez que se pide y después sólo se le agregan los nombres
+    de las pautas que se guardan desde este proceso.
+    """
+
+    def __init__(self):
+        self._indices = None  # campo -> IndiceNombres
+        self._candado = threading.Lock()
+
+    def _cargados(self, consultar) -> dict:
+        if self._indices is None:
+            nombres = consultar()
+            self._indices = {campo: IndiceNombres(nombres.get(campo, ())) for campo in CAMPOS_SUGERENCIA}
+        return self._indices
+
+    def buscar(self, campo: str, texto, consultar, limite: int = MAX_SUGERENCIAS) -> list:
+        """Sugerencias para texto; llama consultar() -> {campo: [nombres]} sólo la primera vez."""
+        with self._candado:
+            indice = self._cargados(consultar)[campo]
+            if indice.contiene(texto):
+                return []
+            return indice.buscar(texto, limite)
+
+    def agregar(self, encabezados: list):
+        """Agrega los nombres de encabezados recién guardados (si el índice ya está armado)."""
+        with self._candado:
+            if self._indices is None:
+                return
+            for encabezado in encabezados:
+                for campo, indice in self._indices.items():
+                    indice.agregar(encabezado.get(campo))
+
+    def invalidar(self):
+        with self._candado:
+            self._indices = None
+
+
+catalogo_nombres = CatalogoNombres()
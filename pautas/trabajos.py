@@ -0,0 +1,202 @@
+import contextvars
+import itertools
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+logger = logging.getLogger(__name__)
+
+# Hilos de fondo del proceso (el contenedor tiene una sola CPU: el trabajo pesado es I/O o numpy)
+MAX_HILOS = int(os.getenv("TRABAJOS_MAX_HILOS", "2"))
+# Trabajos en cola o en proceso que puede tener un usuario
+MAX_TRABAJOS_USUARIO = 4
+# Trabajos de un mismo usuario que corren a la vez; el resto espera su turno
+MAX_SIMULTANEOS_USUARIO = 1
+
+EN_COLA = "EN COLA"
+EN_PROCESO = "EN PROCESO"
+TERMINADO = "TERMINADO"
+ERROR = "ERROR"
+CANCELADO = "CANCELADO"
+
+
+def contexto_procesos():
+    """Contexto para pools de procesos dentro de la app (lectura de lotes y de PDFs largos)."""
+    # La app tiene hilos vivos (servidor, trabajos de fondo): los procesos no se crean con fork
+    metodos = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in metodos else "spawn")
+
+
+class TrabajoCancelado(Exception):
+    """Se lanza dentro del trabajo cuando el usuario lo canceló."""
+
+
+class LimiteTrabajos(RuntimeError):
+    """El usuario ya tiene el máximo de trabajos pendientes."""
+
+
+class Trabajo:
+    """
+    Manejador de un trabajo de fondo. Se guarda en st.session_state y se consulta en cada
+    rerun con done()/result()/exception(), como un Future.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, usuario: str, descripcion: str, funcion, llave=None):
+        self.id = next(self._ids)
+        self.usuario = usuario
+        self.descripcion = descripcion
+        self.llave = llave
+        self.estado = EN_COLA
+        self.progreso = 0.0
+        self.mensaje = ""
+        self.creado = time.monotonic()
+        self._funcion = funcion
+        # El trabajo corre con el contexto de quien lo lanzó (p. ej. el rerun que se está midiendo)
+        self._contexto = contextvars.copy_context()
+        self._resultado = None
+        self._error = None
+        self._cancelar = threading.Event()
+        self._terminado = threading.Event()
+        self._candado = threading.Lock()
+
+    def reportar(self, progreso: float, mensaje: str = None):
+        """Lo llama el trabajo para informar su avance (0 a 1); es también punto de cancelación."""
+        if self._cancelar.is_set():
+            raise TrabajoCancelado(self.descripcion)
+        self.progreso = min(max(float(progreso), 0.0), 1.0)
+        if mensaje is not None:
+            self.mensaje = mensaje
+
+    def cancelar(self):
+        """Pide la cancelación; si el trabajo aún no empezó ya no se ejecuta."""
+        with self._candado:
+            self._cancelar.set()
+            if self.estado == EN_COLA:
+                self._terminar(CANCELADO)
+
+    @property
+    def cancelado(self) -> bool:
+        return self.estado == CANCELADO
+
+    def done(self) -> bool:
+        return self._terminado.is_set()
+
+    def result(self, timeout: float = None):
+        if not self._terminado.wait(timeout):
+            raise TimeoutError(self.descripcion)
+        if self._error is not None:
+            raise self._error
+        return self._resultado
+
+    def exception(self, timeout: float = None):
+        if not self._terminado.wait(timeout):
+            raise TimeoutError(self.descripcion)
+        return self._error
+
+    def _ejecutar(self):
+        with self._candado:
+            if self._cancelar.is_set():
+                return
+            self.estado = EN_PROCESO
+        try:
+            self._resultado = self._contexto.run(self._funcion, self)
+        except TrabajoCancelado:
+            self._terminar(CANCELADO)
+        except Exception as e:
+            logger.exception("Falló el trabajo %s", self.descripcion)
+            self._error = e
+            self._terminar(ERROR)
+        else:
+            self.progreso = 1.0
+            self._terminar(TERMINADO)
+
+    def _terminar(self, estado: str):
+        self.estado = estado
+        self._terminado.set()
+
+
+class EjecutorTrabajos:
+    """
+    Hilos de fondo compartidos por todas las sesiones del servidor. Las colas son por usuario
+    y se atienden por turnos, así que la importación grande de un usuario no deja sin hilo a
+    los demás.
+    """
+
+    def __init__(self, hilos: int = MAX_HILOS, maximo_usuario: int = MAX_TRABAJOS_USUARIO,
+                 simultaneos_usuario: int = MAX_SIMULTANEOS_USUARIO):
+        self.hilos = hilos
+        self.maximo_usuario = maximo_usuario
+        self.simultaneos_usuario = simultaneos_usuario
+        self._colas = OrderedDict()  # usuario -> deque de trabajos en espera
+        self._corriendo = {}  # usuario -> trabajos en proceso
+        self._condicion = threading.Condition()
+        self._iniciados = []
+
+    def _iniciar_hilos(self):
+        while len(self._iniciados) < self.hilos:
+            hilo = threading.Thread(target=self._atender, name=f"trabajos-{len(self._iniciados)}", daemon=True)
+            hilo.start()
+            self._iniciados.append(hilo)
+
+    def _pendientes(self, usuario: str) -> int:
+        en_cola = sum(1 for t in self._colas.get(usuario, ()) if not t.done())
+        return en_cola + self._corriendo.get(usuario, 0)
+
+    def pendientes(self, usuario: str) -> int:
+        """Trabajos del usuario en cola o en proceso."""
+        with self._condicion:
+            return self._pendientes(usuario)
+
+    def enviar(self, usuario: str, descripcion: str, funcion, llave=None) -> Trabajo:
+        """
+        Encola funcion(trabajo) a nombre del usuario y devuelve su manejador.
+        Lanza LimiteTrabajos si el usuario ya tiene el máximo de trabajos pendientes.
+        """
+        trabajo = Trabajo(usuario, descripcion, funcion, llave)
+        with self._condicion:
+            pendientes = self._pendientes(usuario)
+            if pendientes >= self.maximo_usuario:
+                raise LimiteTrabajos(
+                    f"Ya tienes {pendientes} tareas en curso; espera a que termine alguna."
+                )
+            self._colas.setdefault(usuario, deque()).append(trabajo)
+            self._iniciar_hilos()
+            self._condicion.notify()
+        return trabajo
+
+    def _siguiente(self):
+        """Primer usuario (por turno) con trabajos en espera y cupo para correr otro."""
+        for usuario, cola in self._colas.items():
+            if self._corriendo.get(usuario, 0) < self.simultaneos_usuario:
+                trabajo = cola.popleft()
+                if not cola:
+                    del self._colas[usuario]
+                else:
+                    self._colas.move_to_end(usuario)
+                return trabajo
+        return None
+
+    def _atender(self):
+        while True:
+            with self._condicion:
+                trabajo = self._siguiente()
+                while trabajo is None:
+                    self._condicion.wait()
+                    trabajo = self._siguiente()
+                self._corriendo[trabajo.usuario] = self._corriendo.get(trabajo.usuario, 0) + 1
+            try:
+                trabajo._ejecutar()
+            finally:
+                with self._condicion:
+                    self._corriendo[trabajo.usuario] -= 1
+                    if not self._corriendo[trabajo.usuario]:
+                        del self._corriendo[trabajo.usuario]
+                    self._condicion.notify_all()
+
+
+ejecutor_trabajos = EjecutorTrabajos()
@@ -0,0 +1,129 @@
+import re
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from pautas.calculos import Recalculo, matriz_numerica
+
+# HH:MM (se aceptan segundos, como llegan las horas de Excel); 24:00 sólo tiene sentido como fin
+PATRON_HORA = r"(?:[01]?\d|2[0-3]):[0-5]\d(?::[0-5]\d)?|24:00(?::00)?"
+# Duración del spot en segundos: 20'' (o 20")
+PATRON_DURACION = r"\d{1,3}\s*(?:''|\")"
+# Etiqueta de columna de día del formato ("1/L", "1-AGO/V")
+PATRON_DIA = re.compile(r"^\d{1,2}(-[A-Z]{3})?/[LMJVSD]$")
+
+MENSAJES = {
+    "DIAS": "spots que no son enteros ≥ 0",
+    "TARIFA": "TARIFA vacía o no numérica",
+    "HORA INICIO": "HORA INICIO que no es HH:MM",
+    "HORA FIN": "HORA FIN que no es HH:MM",
+    "HORARIO": "HORA INICIO igual o posterior a HORA FIN",
+    "DURACION": "DURACION que no tiene el formato 20''",
+}
+
+
+class ValidacionGrid(NamedTuple):
+    errores: pd.DataFrame  # máscara booleana por celda, mismo índice que el grid
+    conteos: dict  # regla -> celdas con error
+    dias_fuera: dict  # columna de día fuera del rango -> spots que se perderían
+
+    @property
+    def total(self) -> int:
+        return int(self.errores.to_numpy().sum()) + len(self.dias_fuera)
+
+    @property
+    def valido(self) -> bool:
+        return self.total == 0
+
+    def filas_con_error(self) -> np.ndarray:
+        return self.errores.to_numpy().any(axis=1)
+
+    def mensajes(self) -> list:
+        mensajes = [f"{n} celdas con {MENSAJES[regla]}" for regla, n in self.conteos.items() if n]
+        if self.dias_fuera:
+            mensajes.append(
+                f"Días con spots fuera del rango de la campaña: {', '.join(map(str, self.dias_fuera))}"
+            )
+        return mensajes
+
+
+def _texto(columna: pd.Series) -> pd.Series:
+    # Las horas de Excel llegan como datetime.time: str() las deja como HH:MM:SS
+    return columna.astype("string").str.strip()
+
+
+def _minutos(horas: pd.Series) -> tuple:
+    """Minutos desde la medianoche y máscara de formato válido (sin recorrer fila por fila)."""
+    validas = horas.str.fullmatch(PATRON_HORA).fillna(False).to_numpy(dtype=bool)
+    # Ya validado el formato, horas y minutos están en posiciones fijas de "HH:MM"
+    horas = horas.where(validas, "00:00").str.replace(r"^(\d):", r"0\1:", regex=True)
+    h = horas.str.slice(0, 2).astype("int64").to_numpy()
+    m = horas.str.slice(3, 5).astype("int64").to_numpy()
+    return h * 60 + m, validas
+
+
+def minutos_del_dia(horas: pd.Series) -> tuple:
+    """Minutos desde la medianoche de una columna de horas (texto o datetime.time) y máscara de válidas."""
+    return _minutos(_texto(horas))
+
+
+def dias_fuera_de_rango(df: pd.DataFrame, etiquetas) -> dict:
+    """Columnas con forma de día que no están en el rango de la campaña y traen spots."""
+    etiquetas = set(etiquetas)
+    fuera = [c for c in df.columns if isinstance(c, str) and PATRON_DIA.match(c) and c not in etiquetas]
+    if not fuera:
+        return {}
+    numeros, _ = matriz_numerica(df[fuera])
+    spots = np.trunc(numeros).clip(min=0).sum(axis=0)
+    return {columna: int(n) for columna, n in zip(fuera, spots) if n}
+
+
+def validar_transmisiones(df: pd.DataFrame, columnas_dias: list, etiquetas_rango=None,
+                          recalculo: Recalculo = None) -> ValidacionGrid:
+    """
+    Valida el grid de transmisiones por columnas completas (sin ciclos por celda):
+    spots enteros ≥ 0, TARIFA numérica, HORA INICIO < HORA FIN en HH:MM y DURACION como 20''.
+    Las filas sin PLAZA TRANS (renglones en blanco del editor) no se validan porque no se guardan.
+    Con etiquetas_rango también se reportan columnas de día con spots fuera de la campaña.
+    Si se pasa el Recalculo del mismo grid se reutiliza su matriz de días en vez de convertirla otra vez.
+    Devuelve la máscara de errores por celda (columnas validadas) y el conteo por regla.
+    """
+    columnas_dias = [c for c in columnas_dias if c in df.columns]
+    plaza = _texto(df["PLAZA TRANS"]) if "PLAZA TRANS" in df.columns else pd.Series("", index=df.index)
+    capturadas = (plaza.fillna("") != "").to_numpy()[:, None]
+
+    errores = {}
+    conteos = {}
+
+    if recalculo is not None:
+        numeros, no_numericos = recalculo.dias, recalculo.invalidos[columnas_dias].to_numpy()
+    else:
+        numeros, no_numericos = matriz_numerica(df[columnas_dias])
+    dias = (no_numericos | (numeros < 0) | (numeros != np.trunc(numeros))) & capturadas
+    errores.update(zip(columnas_dias, dias.T))
+    conteos["DIAS"] = int(dias.sum())
+
+    if "TARIFA" in df.columns:
+        tarifa = pd.to_numeric(df["TARIFA"], errors="coerce").to_numpy(dtype=float)
+        errores["TARIFA"] = (np.isnan(tarifa) | (tarifa < 0)) & capturadas[:, 0]
+        conteos["TARIFA"] = int(errores["TARIFA"].sum())
+
+    if "HORA INICIO" in df.columns and "HORA FIN" in df.columns:
+        inicio, inicio_ok = _minutos(_texto(df["HORA INICIO"]))
+        fin, fin_ok = _minutos(_texto(df["HORA FIN"]))
+        inicio_ok &= inicio < 24 * 60
+        orden = inicio_ok & fin_ok & ~(inicio < fin)
+        errores["HORA INICIO"] = (~inicio_ok | orden) & capturadas[:, 0]
+        errores["HORA FIN"] = (~fin_ok | orden) & capturadas[:, 0]
+        conteos["HORA INICIO"] = int((~inicio_ok & capturadas[:, 0]).sum())
+        conteos["HORA FIN"] = int((~fin_ok & capturadas[:, 0]).sum())
+        conteos["HORARIO"] = int((orden & capturadas[:, 0]).sum())
+
+    if "DURACION" in df.columns:
+        duracion = _texto(df["DURACION"]).str.fullmatch(PATRON_DURACION).fillna(False).to_numpy(dtype=bool)
+        errores["DURACION"] = ~duracion & capturadas[:, 0]
+        conteos["DURACION"] = int(errores["DURACION"].sum())
+
+    dias_fuera = dias_fuera_de_rango(df, etiquetas_rango) if etiquetas_rango is not None else {}
+    return ValidacionGrid(pd.DataFrame(errores, index=df.index), conteos, dias_fuera)
@@ -0,0 +1,133 @@
+-- Tablas de la aplicación de Órdenes/Pautas de Transmisión Radio
+-- Ejecutar en la misma base/esquema configurados en .env
+
+USE DATABASE DB_ANALYTICS_DEV;
+USE SCHEMA SCH_DIR_TEC;
+
+-- 1. Folios internos (FOLIO-100, FOLIO-101, ...) sin choques entre vendedores
+CREATE SEQUENCE IF NOT EXISTS SEQ_FOLIO_PAUTA START = 100 INCREMENT = 1;
+
+-- 2. Encabezado de cada pauta (una fila por folio)
+CREATE TABLE IF NOT EXISTS PAUTAS (
+    FOLIO_INTERNO             VARCHAR(20)    NOT NULL PRIMARY KEY,
+    FOLIO_F1                  VARCHAR(30),
+    CLIENTE                   VARCHAR(200)   NOT NULL,
+    AGENCIA                   VARCHAR(200),
+    MARCA                     VARCHAR(200),
+    TIPO_CONVENIO             VARCHAR(50),
+    NOMBRE_CONVENIO           VARCHAR(200),
+    ANUNCIA                   VARCHAR(200),
+    CAMPANA                   VARCHAR(200),
+    INICIO_CAMPANA            DATE,
+    FIN_CAMPANA               DATE,
+    NUMERO_ORDEN              VARCHAR(50),
+    EJECUTIVO                 VARCHAR(200),
+    NOMBRE_EVENTO             VARCHAR(200),
+    FACTURAR_A                VARCHAR(200),
+    ES_CLIENTE_NUEVO          VARCHAR(2),
+    ES_AGREGADO               VARCHAR(2),
+    FIRMA_PAGARE              VARCHAR(2),
+    PLAZA_VENTA               VARCHAR(100),
+    TOTAL_IMPACTOS            NUMBER(12, 0),
+    SUBTOTAL                  NUMBER(14, 2),
+    TIPO_IVA                  VARCHAR(10),
+    IVA                       NUMBER(14, 2),
+    TOTAL                     NUMBER(14, 2),
+    MONEDA                    VARCHAR(3),
+    ESTATUS_CAMPANA           VARCHAR(30),
+    ESTATUS_OTC               VARCHAR(30),
+    OBSERVACIONES_MATERIALES  VARCHAR,
+    INDICACIONES_TALENTOS     VARCHAR,
+    INDICACIONES_COBRANZA     VARCHAR,
+    FECHA_CAPTURA             TIMESTAMP_NTZ  NOT NULL DEFAULT CURRENT_TIMESTAMP(),
+    -- Usuario de la aplicación que capturó la pauta (métricas "MIS ...")
+    CAPTURADO_POR             VARCHAR(100)   NOT NULL,
+    -- Se incrementa con cada cambio guardado; la edición cachea la pauta por (folio, versión)
+    VERSION                   NUMBER(9, 0)   NOT NULL DEFAULT 1
+)
+-- El listado filtra por fecha de captura y pagina por (FECHA_CAPTURA, FOLIO_INTERNO)
+CLUSTER BY (TO_DATE(FECHA_CAPTURA));
+
+-- 3. Filas del grid de transmisiones (descriptores de cada fila)
+CREATE TABLE IF NOT EXISTS PAUTA_TRANSMISIONES (
+    FOLIO_INTERNO    VARCHAR(20)    NOT NULL,
+    FILA             NUMBER(6, 0)   NOT NULL,
+    PLAZA_TRANS      VARCHAR(100),
+    TIPO_MEDIO       VARCHAR(50),
+    MEDIO            VARCHAR(100),
+    PROGRAMA         VARCHAR(200),
+    DURACION         VARCHAR(20),
+    PRODUCTO         VARCHAR(200),
+    VERSION          VARCHAR(200),
+    TALENTO          VARCHAR(200),
+    HORA_INICIO      VARCHAR(5),
+    HORA_FIN         VARCHAR(5),
+    TOTAL_IMPACTOS   NUMBER(12, 0),
+    TARIFA           NUMBER(14, 2),
+    TOTAL_INVERSION  NUMBER(16, 2),
+    PRIMARY KEY (FOLIO_INTERNO, FILA)
+)
+CLUSTER BY (FOLIO_INTERNO);
+
+-- 4. Spots por día (forma dispersa: sólo días con spots)
+CREATE TABLE IF NOT EXISTS PAUTA_SPOTS (
+    FOLIO_INTERNO  VARCHAR(20)    NOT NULL,
+    FILA           NUMBER(6, 0)   NOT NULL,
+    FECHA          DATE           NOT NULL,
+    SPOTS          NUMBER(5, 0)   NOT NULL,
+    PRIMARY KEY (FOLIO_INTERNO, FILA, FECHA)
+)
+CLUSTER BY (FOLIO_INTERNO);
+
+-- 5. Materiales publicitarios de la pauta
+CREATE TABLE IF NOT EXISTS PAUTA_MATERIALES (
+    FOLIO_INTERNO  VARCHAR(20)    NOT NULL,
+    NOMBRE         VARCHAR(200)   NOT NULL,
+    ARCHIVO        VARCHAR(300),
+    VERSION        VARCHAR(200),
+    TIPO           VARCHAR(30),
+    DURACION       VARCHAR(10),
+    -- sha256 del archivo y su ruta en MATERIALES_STAGE (un archivo repetido se guarda una vez)
+    HASH_CONTENIDO VARCHAR(64),
+    RUTA_ETAPA     VARCHAR(300)
+);
+
+-- 6. Archivos de materiales, direccionados por contenido: @MATERIALES_STAGE/<hash[:2]>/<hash>.<ext>
+CREATE STAGE IF NOT EXISTS MATERIALES_STAGE
+    ENCRYPTION = (TYPE = 'SNOWFLAKE_SSE')
+    DIRECTORY = (ENABLE = TRUE);
+
+-- 7. Spots por hora que vende cada medio (inventario para detectar sobreventa al enviar);
+--    los medios que no aparecen usan INVENTARIO_SPOTS_HORA (12 por omisión)
+CREATE TABLE IF NOT EXISTS CAPACIDAD_MEDIOS (
+    MEDIO           VARCHAR(100)   NOT NULL PRIMARY KEY,
+    SPOTS_POR_HORA  NUMBER(6, 2)   NOT NULL
+);
+
+-- 8. Convenios y sus saldos. MONTO_CONSUMIDO y PAUTAS son totales acumulados: cada guardado,
+--    envío o edición de una pauta (que no sea borrador) les suma su diferencia en la misma
+--    transacción, así el listado de convenios no vuelve a sumar las pautas.
+CREATE TABLE IF NOT EXISTS CONVENIOS (
+    NOMBRE_CONVENIO   VARCHAR(200)   NOT NULL PRIMARY KEY,
+    TIPO_CONVENIO     VARCHAR(50),
+    CLIENTE           VARCHAR(200),
+    MONEDA            VARCHAR(3),
+    -- NULL: convenio usado en pautas sin monto contratado registrado
+    MONTO_CONTRATADO  NUMBER(16, 2),
+    MONTO_CONSUMIDO   NUMBER(16, 2)  NOT NULL DEFAULT 0,
+    PAUTAS            NUMBER(9, 0)   NOT NULL DEFAULT 0,
+    ACTUALIZADO       TIMESTAMP_NTZ
+);
+
+-- Reconstrucción de los acumulados desde PAUTAS (sólo para la carga inicial o una corrección):
+-- MERGE INTO CONVENIOS C USING (
+--     SELECT UPPER(TRIM(NOMBRE_CONVENIO)) AS NOMBRE_CONVENIO, ANY_VALUE(TIPO_CONVENIO) AS TIPO_CONVENIO,
+--            ANY_VALUE(CLIENTE) AS CLIENTE, ANY_VALUE(MONEDA) AS MONEDA,
+--            SUM(COALESCE(TOTAL, 0)) AS MONTO, COUNT(*) AS PAUTAS
+--     FROM PAUTAS
+--     WHERE TRIM(COALESCE(NOMBRE_CONVENIO, '')) <> '' AND COALESCE(ESTATUS_OTC, '') <> 'BORRADOR'
+--     GROUP BY 1
+-- ) M ON C.NOMBRE_CONVENIO = M.NOMBRE_CONVENIO
+-- WHEN MATCHED THEN UPDATE SET MONTO_CONSUMIDO = M.MONTO, PAUTAS = M.PAUTAS, ACTUALIZADO = CURRENT_TIMESTAMP()
+-- WHEN NOT MATCHED THEN INSERT (NOMBRE_CONVENIO, TIPO_CONVENIO, CLIENTE, MONEDA, MONTO_CONSUMIDO, PAUTAS, ACTUALIZADO)
+--     VALUES (M.NOMBRE_CONVENIO, M.TIPO_CONVENIO, M.CLIENTE, M.MONEDA, M.MONTO, M.PAUTAS, CURRENT_TIMESTAMP());
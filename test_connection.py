@@ -5,18 +5,12 @@ import os
 import sys
 from snowflake.snowpark import Session
 
+from pautas.conexion import parametros_conexion
+
 def test_connection():
     try:
-        # Load environment variables
-        connection_parameters = {
-            "account": os.getenv("SNOWFLAKE_ACCOUNT"),
-            "user": os.getenv("SNOWFLAKE_USER"),
-            "password": os.getenv("SNOWFLAKE_PASSWORD"),
-            "warehouse": os.getenv("SNOWFLAKE_WAREHOUSE"),
-            "database": os.getenv("SNOWFLAKE_DATABASE"),
-            "schema": os.getenv("SNOWFLAKE_SCHEMA"),
-            "role": os.getenv("SNOWFLAKE_ROLE")
-        }
+        # Load environment variables (same parameters the app's session pool uses)
+        connection_parameters = parametros_conexion()
         
         print("Testing Snowflake connection with:")
         print(f"  Account: {connection_parameters['account']}")
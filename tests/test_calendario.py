@@ -0,0 +1,76 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from pautas.calendario import COLUMNAS_INICIALES, FILA_EJEMPLO, CalendarioSpots, construir_calendario, etiquetas_dias
+
+
+def _calendario(fechas, spots) -> CalendarioSpots:
+    descriptores = pd.DataFrame([FILA_EJEMPLO] * len(spots), columns=COLUMNAS_INICIALES)
+    return CalendarioSpots(descriptores, fechas, np.array(spots))
+
+
+def test_etiquetas_cortas():
+    assert etiquetas_dias(pd.date_range("2025-07-30", "2025-08-02")) == ["30/M", "31/J", "1/V", "2/S"]
+
+
+def test_etiquetas_con_mes_si_se_repite_la_etiqueta():
+    # 1/M (julio) y 1/V (agosto) no chocan: se quedan cortas
+    assert etiquetas_dias(pd.date_range("2025-07-01", "2025-08-01"))[::31] == ["1/M", "1/V"]
+    # 1 de abril y 1 de julio de 2025 son martes: todas llevan el mes
+    etiquetas = etiquetas_dias(pd.date_range("2025-04-01", "2025-07-01"))
+    assert etiquetas[0] == "1-ABR/M"
+    assert etiquetas[-1] == "1-JUL/M"
+    assert len(set(etiquetas)) == len(etiquetas)
+
+
+def test_construir_calendario_fin_antes_de_inicio():
+    rango = construir_calendario(date(2025, 7, 5), date(2025, 7, 1))
+    assert rango.fechas == (date(2025, 7, 5),)
+    assert rango.legibles == ("05/07/2025",)
+
+
+def test_reindexar_conserva_las_fechas():
+    calendario = _calendario(pd.date_range("2025-07-01", "2025-07-03"), [[1, 2, 3], [4, 0, 6]])
+    movido = calendario.reindexar(pd.date_range("2025-06-30", "2025-07-04"))
+    assert movido.spots.tolist() == [[0, 1, 2, 3, 0], [0, 4, 0, 6, 0]]
+    assert movido.spots.dtype == np.uint16
+    # Un recorte descarta los días fuera del rango nuevo
+    recortado = calendario.reindexar(pd.date_range("2025-07-02", "2025-07-05"))
+    assert recortado.spots.tolist() == [[2, 3, 0, 0], [0, 6, 0, 0]]
+    # Ida y vuelta: lo recortado no regresa
+    assert recortado.reindexar(calendario.fechas).spots.tolist() == [[0, 2, 3], [0, 0, 6]]
+
+
+def test_registros_ida_y_vuelta():
+    calendario = _calendario(pd.date_range("2025-07-01", "2025-07-04"), [[0, 5, 0, 0], [1, 0, 0, 2]])
+    registros = calendario.registros()
+    assert registros["FILA"].tolist() == [0, 1, 1]
+    assert registros["SPOTS"].tolist() == [5, 1, 2]
+    reconstruido = CalendarioSpots.desde_registros(calendario.descriptores, calendario.fechas, registros)
+    assert np.array_equal(reconstruido.spots, calendario.spots)
+
+
+def test_desde_registros_ignora_fechas_fuera_del_rango():
+    registros = pd.DataFrame({
+        "FILA": [0, 0, 1],
+        "FECHA": [date(2025, 7, 1), date(2025, 8, 1), date(2025, 7, 2)],
+        "SPOTS": [3, 9, 4],
+    })
+    calendario = CalendarioSpots.desde_registros(
+        pd.DataFrame([FILA_EJEMPLO] * 2, columns=COLUMNAS_INICIALES), pd.date_range("2025-07-01", "2025-07-02"),
+        registros
+    )
+    assert calendario.spots.tolist() == [[3, 0], [0, 4]]
+
+
+def test_desde_grid_ancho():
+    fechas = pd.date_range("2025-07-01", "2025-07-03")
+    etiquetas = etiquetas_dias(fechas)
+    grid = pd.DataFrame([{**FILA_EJEMPLO, "1/M": 2, "2/M": "x", "3/J": 2.7}, {**FILA_EJEMPLO, "3/J": -1}])
+    calendario = CalendarioSpots.desde_grid_ancho(grid, fechas, etiquetas, COLUMNAS_INICIALES)
+    # Texto y vacíos quedan en 0, los decimales se truncan y los negativos se recortan a 0
+    assert calendario.spots.tolist() == [[2, 0, 2], [0, 0, 0]]
+    assert calendario.impactos().tolist() == [4, 0]
+    assert list(calendario.a_grid_ancho(etiquetas).columns) == COLUMNAS_INICIALES + etiquetas
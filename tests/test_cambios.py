@@ -0,0 +1,163 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pautas.calendario import COLUMNAS_INICIALES, FILA_EJEMPLO, CalendarioSpots
+from pautas.cambios import ConflictoVersion, aplicar_cambios, calcular_cambios
+from pautas.edicion import PautaGuardada
+
+FECHAS = pd.date_range("2025-07-01", "2025-07-05")
+MATERIALES = [{"Nombre": "SPOT 20", "Archivo": "spot.mp3", "Versión": "V1", "Tipo": "AUDIO",
+               "Duración": "00:20", "Hash": "abc", "Ruta": "@ETAPA/spot.mp3"}]
+
+
+def _descriptores(programas, filas) -> pd.DataFrame:
+    descriptores = pd.DataFrame([{**FILA_EJEMPLO, "PROGRAMA": p} for p in programas], columns=COLUMNAS_INICIALES)
+    descriptores["FILA"] = filas
+    return descriptores
+
+
+@pytest.fixture
+def pauta() -> PautaGuardada:
+    spots = np.array([[1, 2, 0, 0, 0], [0, 3, 3, 0, 0], [0, 0, 0, 4, 4]])
+    calendario = CalendarioSpots(_descriptores(["MAÑANA", "TARDE", "NOCHE"], [0, 1, 2]), FECHAS, spots)
+    encabezado = {"CLIENTE": "POLLO LOCO", "TOTAL": 1000.0, "MONEDA": "MN", "ESTATUS_OTC": "VENTAS"}
+    return PautaGuardada("FOLIO-010", 3, encabezado, calendario, [dict(m) for m in MATERIALES])
+
+
+def _editado(pauta: PautaGuardada) -> CalendarioSpots:
+    return CalendarioSpots(pauta.calendario.descriptores.copy(), FECHAS, pauta.calendario.spots.copy())
+
+
+def _cambios(pauta, calendario=None, encabezado=None, materiales=None):
+    return calcular_cambios(
+        pauta, dict(pauta.encabezado) if encabezado is None else encabezado,
+        _editado(pauta) if calendario is None else calendario,
+        [dict(m) for m in MATERIALES] if materiales is None else materiales,
+    )
+
+
+def test_sin_cambios(pauta):
+    cambios = _cambios(pauta)
+    assert cambios.vacio
+    assert cambios.materiales is None
+    assert cambios.resumen() == "sin cambios"
+
+
+def test_renglon_nuevo(pauta):
+    editado = _editado(pauta)
+    nuevo = CalendarioSpots(_descriptores(["MADRUGADA"], [None]), FECHAS, np.array([[0, 0, 5, 0, 0]]))
+    calendario = CalendarioSpots(
+        pd.concat([editado.descriptores, nuevo.descriptores]), FECHAS, np.vstack([editado.spots, nuevo.spots])
+    )
+    cambios = _cambios(pauta, calendario)
+    assert cambios.transmisiones["FILA"].tolist() == [3]
+    assert cambios.transmisiones["PROGRAMA"].tolist() == ["MADRUGADA"]
+    assert cambios.filas_borradas == []
+    assert cambios.spots.to_dict("records") == [{"FILA": 3, "FECHA": date(2025, 7, 3), "SPOTS": 5}]
+
+
+def test_renglon_modificado(pauta):
+    calendario = _editado(pauta)
+    calendario.descriptores.loc[1, "PROGRAMA"] = "VESPERTINO"
+    cambios = _cambios(pauta, calendario)
+    assert cambios.transmisiones["FILA"].tolist() == [1]
+    assert cambios.transmisiones["PROGRAMA"].tolist() == ["VESPERTINO"]
+    assert cambios.celdas == 1
+    assert cambios.spots.empty
+
+
+def test_renglon_borrado(pauta):
+    cambios = _cambios(pauta, _editado(pauta).seleccionar([0, 1]))
+    assert cambios.filas_borradas == [2]
+    assert cambios.transmisiones.empty
+    # Los spots del renglón borrado quedan en 0 para que el MERGE los elimine
+    assert cambios.spots.to_dict("records") == [
+        {"FILA": 2, "FECHA": date(2025, 7, 4), "SPOTS": 0},
+        {"FILA": 2, "FECHA": date(2025, 7, 5), "SPOTS": 0},
+    ]
+
+
+def test_renglon_en_blanco_no_se_guarda(pauta):
+    calendario = _editado(pauta)
+    calendario.descriptores.loc[2, "PLAZA TRANS"] = " "
+    cambios = _cambios(pauta, calendario)
+    assert cambios.filas_borradas == [2]
+    assert cambios.transmisiones.empty
+
+
+def test_spot_en_cero_borra_la_celda(pauta):
+    calendario = _editado(pauta)
+    calendario.spots[0, 1] = 0
+    calendario.spots[1, 2] = 7
+    cambios = _cambios(pauta, calendario)
+    assert cambios.transmisiones.empty
+    assert sorted(cambios.spots.to_dict("records"), key=lambda r: r["FILA"]) == [
+        {"FILA": 0, "FECHA": date(2025, 7, 2), "SPOTS": 0},
+        {"FILA": 1, "FECHA": date(2025, 7, 3), "SPOTS": 7},
+    ]
+
+
+def test_solo_encabezado(pauta):
+    encabezado = {**pauta.encabezado, "CLIENTE": "POLLO LOCO SA", "TOTAL": 1000.001, "NO_ES_COLUMNA": "x"}
+    cambios = _cambios(pauta, encabezado=encabezado)
+    # TOTAL se compara a centavos y las llaves que no son columnas de PAUTAS se ignoran
+    assert cambios.encabezado == {"CLIENTE": "POLLO LOCO SA"}
+    assert cambios.transmisiones.empty and cambios.spots.empty and not cambios.filas_borradas
+    assert cambios.materiales is None
+    assert not cambios.vacio
+
+
+def test_materiales(pauta):
+    assert _cambios(pauta, materiales=[dict(m) for m in MATERIALES]).materiales is None
+    otros = [{**MATERIALES[0], "Versión": "V2"}]
+    assert _cambios(pauta, materiales=otros).materiales == otros
+    assert _cambios(pauta, materiales=[]).materiales == []
+
+
+class _Resultado:
+    def __init__(self, filas):
+        self._filas = filas
+
+    def collect(self):
+        return self._filas
+
+
+class SesionFalsa:
+    """Registra las sentencias; el UPDATE de PAUTAS devuelve filas_actualizadas."""
+
+    def __init__(self, filas_actualizadas: int):
+        self.filas_actualizadas = filas_actualizadas
+        self.sentencias = []
+
+    def sql(self, sql, params=None):
+        self.sentencias.append((sql, params))
+        if sql.startswith("UPDATE PAUTAS"):
+            return _Resultado([(self.filas_actualizadas,)])
+        return _Resultado([])
+
+
+def test_aplicar_cambios_sube_la_version(pauta):
+    calendario = _editado(pauta)
+    calendario.spots[0, 1] = 0
+    cambios = _cambios(pauta, calendario, encabezado={**pauta.encabezado, "CLIENTE": "POLLO LOCO SA"})
+    sesion = SesionFalsa(1)
+    assert aplicar_cambios(sesion, pauta.folio, pauta.version, cambios) == 4
+    sql = [s for s, _ in sesion.sentencias]
+    assert sql[0] == "BEGIN TRANSACTION"
+    assert sql[1] == "UPDATE PAUTAS SET VERSION = VERSION + 1, CLIENTE = ? WHERE FOLIO_INTERNO = ? AND VERSION = ?"
+    assert sesion.sentencias[1][1] == ["POLLO LOCO SA", "FOLIO-010", 3]
+    assert sql[2].startswith("MERGE INTO PAUTA_SPOTS")
+    assert sql[-1] == "COMMIT"
+
+
+def test_aplicar_cambios_con_otra_version(pauta):
+    cambios = _cambios(pauta, encabezado={**pauta.encabezado, "CLIENTE": "POLLO LOCO SA"})
+    sesion = SesionFalsa(0)
+    with pytest.raises(ConflictoVersion):
+        aplicar_cambios(sesion, pauta.folio, pauta.version, cambios)
+    sql = [s for s, _ in sesion.sentencias]
+    assert sql[-1] == "ROLLBACK"
+    assert "COMMIT" not in sql
@@ -0,0 +1,123 @@
+import pytest
+
+from pautas import conexion
+from pautas.conexion import PoolSesiones, sesion_expirada
+
+
+class ErrorSnowflake(Exception):
+    def __init__(self, mensaje="error", sql_error_code=None, errno=None):
+        super().__init__(mensaje)
+        self.sql_error_code = sql_error_code
+        self.errno = errno
+
+
+class SesionFalsa:
+    def __init__(self, numero: int, sana: bool = True):
+        self.numero = numero
+        self.sana = sana
+        self.cerrada = False
+
+    def sql(self, sql):
+        if not self.sana:
+            raise ErrorSnowflake("Authentication token has expired.")
+        return self
+
+    def collect(self):
+        return [(1,)]
+
+    def close(self):
+        self.cerrada = True
+
+
+class Creador:
+    def __init__(self):
+        self.creadas = []
+
+    def __call__(self):
+        self.creadas.append(SesionFalsa(len(self.creadas)))
+        return self.creadas[-1]
+
+
+@pytest.mark.parametrize("error, expirada", [
+    (ErrorSnowflake(sql_error_code=390114), True),
+    (ErrorSnowflake(sql_error_code="390112"), True),
+    (ErrorSnowflake(errno=390111), True),
+    (ErrorSnowflake(sql_error_code=2003), False),
+    (ErrorSnowflake(sql_error_code="57P01"), False),
+    (ErrorSnowflake(sql_error_code="", errno="HY000"), False),
+    (ErrorSnowflake("Session no longer exists. New login required."), True),
+    (ValueError("otra cosa"), False),
+])
+def test_sesion_expirada(error, expirada):
+    assert sesion_expirada(error) is expirada
+
+
+def test_reintenta_una_vez_con_sesion_nueva():
+    creador = Creador()
+    pool = PoolSesiones(crear=creador, maximo=2)
+    usadas = []
+
+    def consulta(sesion):
+        usadas.append(sesion.numero)
+        if len(usadas) == 1:
+            raise ErrorSnowflake(errno=390114)
+        return "ok"
+
+    assert pool.ejecutar(consulta) == "ok"
+    assert usadas == [0, 1]
+    # La sesión expirada se cerró y no regresó al pool
+    assert creador.creadas[0].cerrada
+    assert pool.tomar() is creador.creadas[1]
+
+
+def test_no_reintenta_mas_de_una_vez():
+    creador = Creador()
+    pool = PoolSesiones(crear=creador, maximo=2)
+
+    def consulta(sesion):
+        raise ErrorSnowflake(sql_error_code=390114)
+
+    with pytest.raises(ErrorSnowflake):
+        pool.ejecutar(consulta)
+    assert len(creador.creadas) == 2
+    assert all(s.cerrada for s in creador.creadas)
+
+
+def test_codigo_no_numerico_propaga_el_error_original():
+    creador = Creador()
+    pool = PoolSesiones(crear=creador, maximo=1)
+    original = ErrorSnowflake("tabla inexistente", sql_error_code="42S02")
+
+    def consulta(sesion):
+        raise original
+
+    with pytest.raises(ErrorSnowflake) as error:
+        pool.ejecutar(consulta)
+    assert error.value is original
+    # Sin reintento y la sesión sigue en el pool
+    assert len(creador.creadas) == 1 and not creador.creadas[0].cerrada
+    assert pool.tomar() is creador.creadas[0]
+
+
+def test_ejecutar_usa_el_pool_del_proceso(monkeypatch):
+    creador = Creador()
+    monkeypatch.setattr(conexion, "_pool", PoolSesiones(crear=creador, maximo=1))
+    assert conexion.ejecutar(lambda sesion: sesion.numero) == 0
+    assert conexion.ejecutar(lambda sesion: sesion.numero) == 0
+
+
+def test_sesion_inactiva_se_prueba_antes_de_entregarla():
+    creador = Creador()
+    pool = PoolSesiones(crear=creador, maximo=1, prueba_despues_de=0)
+    sesion = pool.tomar()
+    sesion.sana = False
+    pool.devolver(sesion)
+    nueva = pool.tomar()
+    assert nueva is not sesion and sesion.cerrada
+
+
+def test_espera_una_sesion_libre():
+    pool = PoolSesiones(crear=Creador(), maximo=1, espera_maxima=0)
+    pool.tomar()
+    with pytest.raises(TimeoutError):
+        pool.tomar()
@@ -0,0 +1,98 @@
+import io
+import struct
+import wave
+
+import pytest
+
+from componentes.materiales import obtener_duracion_archivo
+from pautas.duracion import duracion_mp3, duracion_mp4, duracion_segundos, duracion_wav
+
+# Trama MPEG1 capa III, 128 kbps, 44100 Hz, estéreo
+TRAMA_MP3 = bytes([0xFF, 0xFB, 0x90, 0x00])
+
+
+def _archivo(contenido: bytes, nombre: str) -> io.BytesIO:
+    archivo = io.BytesIO(contenido)
+    archivo.name = nombre
+    return archivo
+
+
+def _wav(segundos: float, frecuencia: int = 8000) -> bytes:
+    salida = io.BytesIO()
+    with wave.open(salida, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(frecuencia)
+        wav.writeframes(b"\0\0" * int(segundos * frecuencia))
+    return salida.getvalue()
+
+
+def _id3(tamano: int) -> bytes:
+    # Tamaño syncsafe: 7 bits por byte
+    return b"ID3\x04\x00\x00" + bytes((tamano >> s) & 0x7F for s in (21, 14, 7, 0)) + b"\0" * tamano
+
+
+def _atomo(tipo: bytes, contenido: bytes) -> bytes:
+    return struct.pack(">I4s", 8 + len(contenido), tipo) + contenido
+
+
+def _mvhd(escala: int, duracion: int) -> bytes:
+    return _atomo(b"mvhd", b"\0\0\0\0" + struct.pack(">IIII", 0, 0, escala, duracion) + b"\0" * 80)
+
+
+def test_wav():
+    assert duracion_wav(io.BytesIO(_wav(2.5))) == 2.5
+
+
+def test_wav_con_chunk_impar_antes_de_data():
+    original = _wav(1.0)
+    # RIFF + fmt (12 + 24 bytes), un chunk LIST de 3 bytes (con su byte de relleno) y después data
+    contenido = original[:36] + b"LIST" + struct.pack("<I", 3) + b"abc\0" + original[36:]
+    assert duracion_wav(io.BytesIO(contenido)) == 1.0
+
+
+def test_mp3_xing_despues_de_id3():
+    info_lateral = b"\0" * 32
+    xing = b"Xing" + struct.pack(">II", 1, 100)
+    contenido = _id3(300) + TRAMA_MP3 + info_lateral + xing + b"\0" * 400
+    assert duracion_mp3(io.BytesIO(contenido)) == pytest.approx(100 * 1152 / 44100)
+
+
+def test_mp3_cbr_por_tamano():
+    # 16000 bytes a 128 kbps = 1 s; la etiqueta ID3v1 del final no cuenta
+    contenido = TRAMA_MP3 + b"\0" * (16000 - len(TRAMA_MP3)) + b"TAG" + b"\0" * 125
+    assert duracion_mp3(io.BytesIO(contenido)) == pytest.approx(1.0)
+
+
+def test_mp4_con_mvhd_despues_de_mdat():
+    contenido = (
+        _atomo(b"ftyp", b"isom\0\0\0\0") + _atomo(b"mdat", b"\0" * 5000)
+        + _atomo(b"moov", _atomo(b"trak", b"\0" * 20) + _mvhd(1000, 15500))
+    )
+    assert duracion_mp4(io.BytesIO(contenido)) == 15.5
+
+
+def test_mp4_mdat_de_64_bits_y_mvhd_version_1():
+    mdat = struct.pack(">I4sQ", 1, b"mdat", 16 + 100) + b"\0" * 100
+    mvhd = _atomo(b"mvhd", b"\x01\0\0\0" + struct.pack(">QQIQ", 0, 0, 600, 18000) + b"\0" * 80)
+    assert duracion_mp4(io.BytesIO(mdat + _atomo(b"moov", mvhd))) == 30.0
+
+
+@pytest.mark.parametrize("contenido, nombre", [
+    (b"\0" * 2000, "sin_trama.mp3"),
+    (b"RIFX" + b"\0" * 100, "no_es_riff.wav"),
+    (_wav(1.0)[:36], "sin_data.wav"),
+    (_atomo(b"ftyp", b"isom") + _atomo(b"mdat", b"\0" * 50), "sin_moov.mp4"),
+    (struct.pack(">I4s", 4, b"moov"), "atomo_corto.mp4"),
+    (b"%PDF-1.4", "guion.pdf"),
+])
+def test_encabezado_desconocido_es_na(contenido, nombre):
+    archivo = _archivo(contenido, nombre)
+    assert duracion_segundos(archivo) is None
+    assert obtener_duracion_archivo(archivo) == "N/A"
+    assert archivo.tell() == 0
+
+
+def test_duracion_formateada():
+    assert obtener_duracion_archivo(_archivo(_wav(65.4), "spot.WAV")) == "01:05"
+    assert obtener_duracion_archivo(None) == "00:00"
@@ -0,0 +1,69 @@
+import pandas as pd
+
+from pautas.encabezado import extraer_datos_generales, normalizar_etiqueta
+
+
+def _encabezado(*pares) -> pd.DataFrame:
+    """Bloque de encabezado como lo lee pandas: etiqueta y valor en celdas contiguas de cada fila."""
+    return pd.DataFrame([[None, etiqueta, valor] for etiqueta, valor in pares])
+
+
+def test_normalizar_etiqueta():
+    assert normalizar_etiqueta("  Campaña :") == "CAMPANA"
+    assert normalizar_etiqueta("Número   de\norden:") == "NUMERO DE ORDEN"
+    assert normalizar_etiqueta("FIRMA PAGARÉ (SI/NO):") == "FIRMA PAGARE (SI/NO)"
+
+
+def test_alias_directos():
+    datos = extraer_datos_generales(_encabezado(
+        ("Razón Social:", "POLLO LOCO"),
+        ("Nombre Campaña", "VERANO"),
+        ("AGENTE / EJECUTIVO", "JUAN"),
+        ("No. de Orden", 1234.0),
+    ))
+    assert datos == {"CLIENTE": "POLLO LOCO", "CAMPAÑA": "VERANO", "EJECUTIVO / VENDEDOR": "JUAN",
+                     "NUMERO DE ORDEN": "1234"}
+
+
+def test_alias_con_complemento():
+    datos = extraer_datos_generales(_encabezado(
+        ("FIRMA PAGARE (SI/NO)", "si"),
+        ("ES AGREGADO - SI/NO", " No "),
+        ("ES CLIENTE NUEVO(SI/NO)", "TAL VEZ"),
+    ))
+    # Los SI/NO se normalizan y un valor distinto se descarta
+    assert datos == {"FIRMA PAGARE (SI / NO)": "SI", "ES AGREGADO (SI / NO)": "NO"}
+
+
+def test_etiqueta_que_solo_empieza_con_el_alias():
+    # "CLIENTE NUEVO" no es CLIENTE ni "AGENCIA DE MEDIOS" es AGENCIA
+    datos = extraer_datos_generales(_encabezado(("CLIENTE NUEVO", "SI"), ("AGENCIA DE MEDIOS", "OMD")))
+    assert "CLIENTE" not in datos
+    assert "AGENCIA" not in datos
+
+
+def test_primera_aparicion_y_alias_en_orden():
+    datos = extraer_datos_generales(_encabezado(
+        ("RAZON SOCIAL", "SEGUNDO ALIAS"),
+        ("CLIENTE", "PRIMERO"),
+        ("CLIENTE", "REPETIDO"),
+    ))
+    assert datos["CLIENTE"] == "PRIMERO"
+
+
+def test_fechas_con_dia_primero():
+    datos = extraer_datos_generales(_encabezado(
+        ("INICIO DE CAMPAÑA:", "03/07/2025"),
+        ("Fecha Fin", pd.Timestamp("2025-07-31")),
+    ))
+    assert datos == {"INICIO CAMPAÑA": pd.Timestamp("2025-07-03"), "FIN CAMPAÑA": pd.Timestamp("2025-07-31")}
+
+
+def test_fechas_invalidas_se_omiten():
+    datos = extraer_datos_generales(_encabezado(("INICIO CAMPAÑA", "por definir"), ("FIN CAMPAÑA", "")))
+    assert datos == {}
+
+
+def test_alias_propios():
+    datos = extraer_datos_generales(_encabezado(("ANUNCIANTE", "MARCA X")), alias={"ANUNCIA": ["ANUNCIANTE"]})
+    assert datos == {"ANUNCIA": "MARCA X"}
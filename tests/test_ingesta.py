@@ -0,0 +1,32 @@
+import pandas as pd
+
+from pautas.ingesta import CacheLecturas, PautaLeida
+
+
+def _leida(n: int) -> PautaLeida:
+    return PautaLeida(pd.DataFrame(), pd.DataFrame({"N": [n]}), False)
+
+
+def test_cache_lecturas_lee_una_vez_por_hash():
+    cache = CacheLecturas(maximo=2)
+    lecturas = []
+
+    def leer(n):
+        lecturas.append(n)
+        return _leida(n)
+
+    assert cache.consultar("a") is None
+    primera = cache.obtener("a", lambda: leer(1))
+    assert cache.obtener("a", lambda: leer(2)) is primera
+    assert cache.consultar("a") is primera
+    assert lecturas == [1]
+
+
+def test_cache_lecturas_descarta_la_menos_reciente():
+    cache = CacheLecturas(maximo=2)
+    cache.obtener("a", lambda: _leida(1))
+    cache.obtener("b", lambda: _leida(2))
+    cache.consultar("a")
+    cache.obtener("c", lambda: _leida(3))
+    assert cache.consultar("b") is None
+    assert cache.consultar("a") is not None and cache.consultar("c") is not None
@@ -0,0 +1,110 @@
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from pautas.calendario import COLUMNAS_INICIALES, FILA_EJEMPLO, CalendarioSpots
+from pautas.inventario import Inventario, ocupa_inventario, registros_inventario
+
+FECHAS = pd.date_range("2025-07-01", "2025-07-02")
+
+
+def _calendario(*filas) -> CalendarioSpots:
+    """filas: (MEDIO, HORA INICIO, HORA FIN, [spots del 1 y 2 de julio])."""
+    descriptores = pd.DataFrame([
+        {**FILA_EJEMPLO, "MEDIO": medio, "HORA INICIO": inicio, "HORA FIN": fin} for medio, inicio, fin, _ in filas
+    ], columns=COLUMNAS_INICIALES)
+    return CalendarioSpots(descriptores, FECHAS, np.array([spots for *_, spots in filas]))
+
+
+def _vendidos(*bloques) -> pd.DataFrame:
+    """bloques: (MEDIO, minuto inicio, minuto fin, fecha, spots) ya vendidos."""
+    registros = pd.DataFrame(bloques, columns=["MEDIO", "INICIO", "FIN", "FECHA", "SPOTS"])
+    return registros.assign(FECHA=pd.to_datetime(registros["FECHA"]).to_numpy(dtype="datetime64[D]"))
+
+
+@pytest.fixture
+def inventario() -> Inventario:
+    # 10 spots por hora: un bloque de 05:00 a 07:00 admite 20
+    inventario = Inventario(spots_por_hora=10)
+    inventario.cargar(_vendidos(("XERT-AM", 300, 420, "2025-07-01", 15)), {}, date(2025, 7, 1))
+    return inventario
+
+
+def test_justo_en_la_capacidad(inventario):
+    assert inventario.revisar(_calendario(("xert-am ", "05:00", "07:00", [5, 20]))).empty
+
+
+def test_sobre_la_capacidad(inventario):
+    conflictos = inventario.revisar(_calendario(
+        (None, "05:00", "07:00", [99, 0]),  # sin MEDIO no ocupa inventario
+        ("XERT-AM", "05:00", "07:00", [6, 21]),
+    ))
+    assert conflictos.to_dict("records") == [
+        {"FILAS": "2", "MEDIO": "XERT-AM", "HORARIO": "05:00-07:00", "FECHA": date(2025, 7, 1),
+         "SOLICITADOS": 6, "OCUPADOS": 15.0, "CAPACIDAD": 20.0},
+        {"FILAS": "2", "MEDIO": "XERT-AM", "HORARIO": "05:00-07:00", "FECHA": date(2025, 7, 2),
+         "SOLICITADOS": 21, "OCUPADOS": 0.0, "CAPACIDAD": 20.0},
+    ]
+
+
+def test_traslape_parcial_en_proporcion():
+    inventario = Inventario(spots_por_hora=10)
+    # 06:00-08:00 con 20 vendidos: la mitad cae dentro de 05:00-07:00
+    inventario.cargar(_vendidos(("XERT-AM", 360, 480, "2025-07-01", 20)), {}, date(2025, 7, 1))
+    assert inventario.revisar(_calendario(("XERT-AM", "05:00", "07:00", [10, 0]))).empty
+    conflictos = inventario.revisar(_calendario(("XERT-AM", "05:00", "07:00", [11, 0])))
+    assert conflictos[["SOLICITADOS", "OCUPADOS", "CAPACIDAD"]].to_dict("records") == [
+        {"SOLICITADOS": 11, "OCUPADOS": 10.0, "CAPACIDAD": 20.0}
+    ]
+    # Un bloque que sólo toca el borde (07:00-08:00) no comparte minutos
+    assert inventario.revisar(_calendario(("XERT-AM", "04:00", "06:00", [20, 0]))).empty
+
+
+def test_capacidad_por_medio(inventario):
+    inventario.cargar(_vendidos(), {"XERT-AM": 2}, date(2025, 7, 1))
+    assert inventario.capacidad("XERT-AM") == 2
+    assert inventario.capacidad("OTRO") == 10
+    assert inventario.revisar(_calendario(("XERT-AM", "05:00", "07:00", [5, 0])))["CAPACIDAD"].tolist() == [4.0]
+
+
+def test_excluir_la_version_guardada():
+    inventario = Inventario(spots_por_hora=10)
+    guardada = _calendario(("XERT-AM", "05:00", "07:00", [15, 0]))
+    otros = _vendidos(("XERT-AM", 300, 420, "2025-07-01", 5))
+    inventario.cargar(pd.concat([otros, registros_inventario(guardada).drop(columns="FILA")]), {}, date(2025, 7, 1))
+    editada = _calendario(("XERT-AM", "05:00", "07:00", [15, 0]))
+    # Sin excluir, los 15 guardados se contarían dos veces
+    assert inventario.revisar(editada)["OCUPADOS"].tolist() == [20.0]
+    assert inventario.revisar(editada, excluir=guardada).empty
+    conflictos = inventario.revisar(_calendario(("XERT-AM", "05:00", "07:00", [16, 0])), excluir=guardada)
+    assert conflictos["OCUPADOS"].tolist() == [5.0]
+
+
+def test_agregar_y_quitar(inventario):
+    pauta = _calendario(("XERT-AM", "05:00", "07:00", [5, 0]))
+    inventario.agregar(pauta)
+    assert inventario.revisar(_calendario(("XERT-AM", "05:00", "07:00", [1, 0])))["OCUPADOS"].tolist() == [20.0]
+    inventario.quitar(pauta)
+    assert inventario.revisar(_calendario(("XERT-AM", "05:00", "07:00", [5, 0]))).empty
+
+
+def test_sin_cargar_no_se_acumula():
+    inventario = Inventario(spots_por_hora=10)
+    # Sin cargar (o ya expirado) agregar no hace nada: la siguiente carga trae lo guardado
+    inventario.agregar(_calendario(("XERT-AM", "05:00", "07:00", [20, 0])))
+    assert inventario.revisar(_calendario(("XERT-AM", "05:00", "07:00", [20, 0]))).empty
+    consultas = []
+    inventario.asegurar(lambda: consultas.append(1) or (_vendidos(), {}))
+    inventario.asegurar(lambda: consultas.append(1) or (_vendidos(), {}))
+    assert consultas == [1]
+    inventario.invalidar()
+    inventario.agregar(_calendario(("XERT-AM", "05:00", "07:00", [20, 0])))
+    assert inventario.revisar(_calendario(("XERT-AM", "05:00", "07:00", [20, 0]))).empty
+
+
+def test_ocupa_inventario():
+    assert not ocupa_inventario("BORRADOR")
+    assert ocupa_inventario("VENTAS")
+    assert ocupa_inventario(None)
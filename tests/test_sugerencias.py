@@ -0,0 +1,79 @@
+from pautas.sugerencias import (
+    SIMILITUD_MINIMA, CatalogoNombres, IndiceNombres, normalizar, trigramas
+)
+
+NOMBRES = ["Telcel México", "TELEVISA", "Telcel Norte", "Pollo Loco", "POLLOS ASADOS OCHOA", "Coca-Cola FEMSA"]
+
+
+def _similitud(texto: str, nombre: str) -> float:
+    a, b = trigramas(normalizar(texto)), trigramas(normalizar(nombre))
+    return len(a & b) / len(a | b)
+
+
+def test_normalizar():
+    assert normalizar("  telcel   méxico ") == "TELCEL MEXICO"
+    assert normalizar(None) == ""
+
+
+def test_prefijo_sin_acentos_ni_mayusculas():
+    indice = IndiceNombres(NOMBRES)
+    # Primero el que empieza igual; después los parecidos
+    assert indice.buscar("telcel mexico") == ["Telcel México", "Telcel Norte"]
+    assert indice.contiene("TELCEL  MEXICO")
+    # Los que empiezan igual van primero y en orden alfabético
+    assert indice.buscar("tel", limite=3) == ["Telcel México", "Telcel Norte", "TELEVISA"]
+
+
+def test_error_de_captura():
+    assert IndiceNombres(NOMBRES).buscar("telcle mexico")[0] == "Telcel México"
+    assert IndiceNombres(NOMBRES).buscar("polos asados ochoa")[0] == "POLLOS ASADOS OCHOA"
+
+
+def test_umbral_de_parecido():
+    indice = IndiceNombres(NOMBRES)
+    for texto in ("telcle mexico", "pollo", "cocacola", "zzz"):
+        parecidos = [n for n in indice.buscar(texto, limite=len(NOMBRES))
+                     if not normalizar(n).startswith(normalizar(texto))]
+        esperados = {n for n in NOMBRES if _similitud(texto, n) >= SIMILITUD_MINIMA}
+        assert set(parecidos) <= esperados
+        assert esperados <= set(indice.buscar(texto, limite=len(NOMBRES)))
+        # Ordenados del más parecido al menos parecido
+        similitudes = [_similitud(texto, n) for n in parecidos]
+        assert similitudes == sorted(similitudes, reverse=True)
+    assert indice.buscar("zzz") == []
+
+
+def test_agregar():
+    indice = IndiceNombres()
+    assert indice.buscar("pollo") == []
+    assert indice.agregar("  Pollo   Loco ")
+    assert not indice.agregar("POLLO LOCO")
+    assert not indice.agregar(None)
+    assert len(indice) == 1
+    assert indice.buscar("pollo") == ["Pollo Loco"]
+    # Los nombres agregados después de una búsqueda también se encuentran por parecido
+    indice.agregar("Pollo Feliz")
+    assert indice.buscar("polo feliz") == ["Pollo Feliz"]
+
+
+def test_catalogo_consulta_una_vez():
+    consultas = []
+
+    def consultar():
+        consultas.append(1)
+        return {"CLIENTE": NOMBRES}
+
+    catalogo = CatalogoNombres()
+    catalogo.agregar([{"CLIENTE": "ANTES DE CARGAR"}])
+    assert catalogo.buscar("CLIENTE", "telcel", consultar) == ["Telcel México", "Telcel Norte"]
+    # Un nombre conocido no necesita sugerencias
+    assert catalogo.buscar("CLIENTE", "telcel mexico", consultar) == []
+    assert catalogo.buscar("AGENCIA", "telcel", consultar) == []
+    catalogo.agregar([{"CLIENTE": "Telcel Sur", "AGENCIA": "OMD"}])
+    assert catalogo.buscar("CLIENTE", "telcel s", consultar)[0] == "Telcel Sur"
+    assert catalogo.buscar("AGENCIA", "om", consultar) == ["OMD"]
+    assert catalogo.buscar("CLIENTE", "antes de", consultar) == []
+    assert consultas == [1]
+    catalogo.invalidar()
+    catalogo.buscar("CLIENTE", "telcel", consultar)
+    assert consultas == [1, 1]
@@ -0,0 +1,74 @@
+from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from componentes import transmisiones
+from pautas.calendario import COLUMNAS_INICIALES, FILA_EJEMPLO, CalendarioSpots, construir_calendario
+from pautas.validacion import dias_fuera_de_rango
+
+# Archivo con spots del 1 al 10 de julio de 2025 ("1/M" ... "10/J")
+ARCHIVO = pd.DataFrame([{**FILA_EJEMPLO, **{f"{d}/{'MMJVSDLMMJ'[d - 1]}": 1 for d in range(1, 11)}}])
+
+
+@pytest.fixture
+def st(monkeypatch):
+    falso = SimpleNamespace(session_state={}, avisos=[])
+    falso.info = falso.warning = falso.avisos.append
+    monkeypatch.setattr(transmisiones, "st", falso)
+    return falso
+
+
+def _leer(fin: int):
+    """Lo que hace la página de nueva pauta con el archivo para el rango del 1 al fin de julio."""
+    rango = construir_calendario(date(2025, 7, 1), date(2025, 7, fin))
+    nuevo = CalendarioSpots.desde_grid_ancho(ARCHIVO, rango.fechas, list(rango.etiquetas), COLUMNAS_INICIALES)
+    return rango, nuevo, dias_fuera_de_rango(ARCHIVO, rango.etiquetas)
+
+
+def _base(origen, fin: int):
+    rango, nuevo, dias_fuera = _leer(fin)
+    return transmisiones.calendario_base("calendario", origen, rango, nuevo, dias_fuera)
+
+
+def test_mismo_rango_reutiliza_la_base(st):
+    calendario, version = _base("archivo", 10)
+    assert _base("archivo", 10) == (calendario, version)
+
+
+def test_cambio_de_rango_conserva_lo_editado(st):
+    calendario, _ = _base("archivo", 10)
+    calendario.spots[0, 2] = 5
+    st.session_state["calendario"] = calendario
+    ampliado, version = _base("archivo", 12)
+    assert ampliado.spots[0].tolist() == [1, 1, 5, 1, 1, 1, 1, 1, 1, 1, 0, 0]
+    assert version == 1
+
+
+def test_recorte_avisa_los_spots_descartados(st):
+    st.session_state["calendario"], _ = _base("archivo", 10)
+    recortado, _ = _base("archivo", 8)
+    assert int(recortado.spots.sum()) == 8
+    assert st.avisos == ["2 spots quedaron fuera del nuevo rango de la campaña y se descartaron."]
+
+
+def test_spots_fuera_del_rango_se_recuperan_al_ampliarlo(st):
+    # El rango inicial deja fuera del 6 al 10: esos spots no llegan al calendario editado
+    angosto, _ = _base("archivo", 5)
+    st.session_state["calendario"] = angosto
+    assert int(angosto.spots.sum()) == 5
+    # Al ampliar el rango se vuelve a partir del archivo en lugar de reindexar lo editado
+    ampliado, version = _base("archivo", 10)
+    assert ampliado.spots[0].tolist() == [1] * 10
+    assert version == 1
+    assert len(st.avisos) == 1 and st.avisos[0].startswith("Se volvieron a cargar las transmisiones del archivo")
+
+
+def test_otro_origen_parte_del_calendario_nuevo(st):
+    calendario, _ = _base("archivo", 10)
+    calendario.spots[0, 0] = 9
+    st.session_state["calendario"] = calendario
+    otro, version = _base("otro archivo", 10)
+    assert otro.spots[0, 0] == 1
+    assert version == 1
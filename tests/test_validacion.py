@@ -0,0 +1,84 @@
+import pandas as pd
+
+from pautas.calculos import recalcular_totales
+from pautas.calendario import FILA_EJEMPLO
+from pautas.validacion import minutos_del_dia, validar_transmisiones
+
+DIAS = ["1/M", "2/M"]
+
+
+def _grid(*cambios) -> pd.DataFrame:
+    return pd.DataFrame([{**FILA_EJEMPLO, "1/M": 1, "2/M": 0, **c} for c in cambios])
+
+
+def _validar(*cambios, etiquetas_rango=None):
+    return validar_transmisiones(_grid(*cambios), DIAS, etiquetas_rango)
+
+
+def test_grid_valido():
+    validacion = _validar({}, {"HORA INICIO": "23:00", "HORA FIN": "24:00", "DURACION": '30"'})
+    assert validacion.valido
+    assert not any(validacion.conteos.values())
+    assert validacion.mensajes() == []
+
+
+def test_dias_negativos_y_no_enteros():
+    validacion = _validar({"1/M": -1}, {"2/M": 1.5}, {"1/M": "x"}, {"2/M": ""})
+    assert validacion.conteos["DIAS"] == 3
+    assert validacion.errores["1/M"].tolist() == [True, False, True, False]
+    assert validacion.errores["2/M"].tolist() == [False, True, False, False]
+
+
+def test_tarifa_no_numerica():
+    validacion = _validar({"TARIFA": "mil"}, {"TARIFA": None}, {"TARIFA": -5}, {"TARIFA": "1500.50"})
+    assert validacion.conteos["TARIFA"] == 3
+    assert validacion.errores["TARIFA"].tolist() == [True, True, True, False]
+
+
+def test_horas_con_formato_invalido():
+    validacion = _validar({"HORA INICIO": "5am"}, {"HORA FIN": "25:00"}, {"HORA INICIO": "24:00", "HORA FIN": "24:00"})
+    assert validacion.conteos["HORA INICIO"] == 2  # 24:00 sólo vale como fin
+    assert validacion.conteos["HORA FIN"] == 1
+    assert validacion.conteos["HORARIO"] == 0
+
+
+def test_horario_invertido():
+    validacion = _validar({"HORA INICIO": "10:00", "HORA FIN": "05:00"}, {"HORA INICIO": "7:00", "HORA FIN": "07:00"})
+    assert validacion.conteos["HORARIO"] == 2
+    assert validacion.conteos["HORA INICIO"] == validacion.conteos["HORA FIN"] == 0
+    # Ambas horas se marcan en la fila
+    assert validacion.errores["HORA INICIO"].all() and validacion.errores["HORA FIN"].all()
+
+
+def test_minutos_del_dia_acepta_segundos():
+    minutos, validas = minutos_del_dia(pd.Series(["5:30", "05:30:00", "12:60"]))
+    assert validas.tolist() == [True, True, False]
+    assert minutos[:2].tolist() == [330, 330]
+
+
+def test_duracion():
+    validacion = _validar({"DURACION": "20"}, {"DURACION": "20 seg"}, {"DURACION": "20 ''"}, {"DURACION": "1000''"})
+    assert validacion.errores["DURACION"].tolist() == [True, True, False, True]
+    assert validacion.conteos["DURACION"] == 3
+
+
+def test_dias_fuera_del_rango():
+    grid = _grid({"3/J": 4}, {"3/J": 2, "4/V": 0, "NOTAS": 9})
+    validacion = validar_transmisiones(grid, DIAS, DIAS)
+    # 4/V no trae spots y NOTAS no tiene forma de día
+    assert validacion.dias_fuera == {"3/J": 6}
+    assert validacion.total == 1
+    assert not validacion.valido
+
+
+def test_filas_sin_plaza_no_se_validan():
+    validacion = _validar({"PLAZA TRANS": None, "TARIFA": "x", "1/M": -3, "DURACION": ""},
+                          {"PLAZA TRANS": "  ", "HORA INICIO": "xx"})
+    assert validacion.valido
+    assert not validacion.filas_con_error().any()
+
+
+def test_reutiliza_el_recalculo():
+    grid = _grid({"1/M": "x"}, {"2/M": 2.5})
+    recalculo = recalcular_totales(grid, DIAS)
+    assert validar_transmisiones(grid, DIAS, recalculo=recalculo).conteos == validar_transmisiones(grid, DIAS).conteos